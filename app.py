@@ -7,17 +7,47 @@ ca = certifi.where()
 from dotenv import load_dotenv
 load_dotenv("secrets/.env")
 
+# OpenMP/MKL thread counts only take effect when set before torch is imported
+from src.ats.config.builder import JobDescriptionConfig, RuntimeConfig, ScoringConfig
+from src.ats.runtime import * 
+apply_thread_env(RuntimeConfig)
+
 from fastapi import FastAPI, UploadFile, File, Response
 from fastapi.middleware.cors import CORSMiddleware
 from src.ats.pipeline import * 
+from src.ats import logging
+from src.ats.components.scorers import JobCatalog, ScoreCache, ScoringProfile, TierCosts
+from contextlib import asynccontextmanager
 from datetime import datetime 
 from typing import List 
+import asyncio
 import uvicorn
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    apply_torch_threads(RuntimeConfig)
+    default_executor = configure_default_executor(RuntimeConfig)
+    # load models once, every request shares the same instances 
+    inference_pipeline = InferencePipeline()
+    app.state.registry = await inference_pipeline.run()
+    # results of resumes already scored against the same job are reused across requests 
+    app.state.score_cache = ScoreCache(ScoringConfig.CACHE_MAX_ENTRIES, ScoringConfig.CACHE_DIR_PATH) if ScoringConfig.CACHE_ENABLED else None
+    # measured latency of every tier, used by latency budgets 
+    app.state.tier_costs = TierCosts()
+    # open roles resumes are matched against, job embeddings of every tier are loaded into the embedding cache 
+    app.state.catalog = JobCatalog(JobDescriptionConfig.CATALOG_DIR_PATH, app.state.registry) if JobDescriptionConfig.CATALOG_ENABLED else None
+    logging.info(f"InferencePipeline output: {app.state.registry.report()}")
+    yield
+    app.state.registry.close()
+    if default_executor:
+        default_executor.shutdown(wait=False)
+
 app = FastAPI(
     title="Resume Checker [ATS]",
     description="AI powered Resume Checker",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -36,45 +66,122 @@ async def health_check():
         "timestamp": datetime.now().strftime("%H:%M:%S")
     }
 
-# upload resume 
+# load time and resident memory of models, inference queue depth and wait/run times, cache stats 
+@app.get("/metrics", tags=["health"])
+async def metrics():
+    return {
+        **app.state.registry.report(),
+        "score_cache": app.state.score_cache.report() if app.state.score_cache else None,
+        "tier_costs": app.state.tier_costs.report(),
+        "catalog": app.state.catalog.report() if app.state.catalog else None
+    }
+
+# configured and effective thread counts and cpu sets of the process and inference workers 
+@app.get("/diagnostics", tags=["health"])
+async def runtime_diagnostics():
+    return diagnostics(RuntimeConfig)
+
+# upload resume, profile (fast, balanced, thorough) and budget_ms choose the tiers of the cascade 
 @app.post("/upload")
-async def upload(files:List[UploadFile] = File(...)):
+async def upload(files:List[UploadFile] = File(...), profile:str | None = None, budget_ms:float | None = None):
+    try:
+        scoring_profile = ScoringProfile.resolve(ScoringConfig.PROFILES, profile or ScoringConfig.DEFAULT_PROFILE, budget_ms)
+    except ValueError as e:
+        return Response(str(e), 400)
+    # the job description is extracted while resumes are ingested and parsed, raw parsed texts are pre-scored against it when enabled 
+    jd_pipeline = JobDescriptionPipeline()
+    jd_task = asyncio.create_task(jd_pipeline.run())
     try:
         ingestion_pipeline = DataIngestionPipeline()
         info = await ingestion_pipeline.run(files)
-        print("DataIngestionPipeline output")
-        print("--------------------------------------------------------")
-        print(info)
-        print("--------------------------------------------------------")
-        print()
+        logging.info(f"DataIngestionPipeline output: {info}")
         transformation_pipeline = DataTransformationPipeline()
-        resume_data, info = await transformation_pipeline.run(info)
-        print("DataTransformationPipeline output")
-        print("--------------------------------------------------------")
-        print(info)
-        print("--------------------------------------------------------")
-        print(resume_data)
-        print("--------------------------------------------------------")
-        print()
-        jd_pipeline = JobDescriptionPipeline()
-        job_data = await jd_pipeline.run()
-        print("JobDescriptionPipeline output")
-        print("--------------------------------------------------------")
-        print(job_data)
-        print("--------------------------------------------------------")
-        print()
+        resume_data, info = await transformation_pipeline.run(info, jd_task, app.state.registry)
+        logging.info(f"DataTransformationPipeline output: {info}")
+        logging.info(f"DataTransformationPipeline resume data: {resume_data}")
+        job_data = await jd_task
+        logging.info(f"JobDescriptionPipeline output: {job_data}")
         scoring_pipeline = ScoringPipeline()
-        info, scorings = await scoring_pipeline.run(resume_data, job_data, info)
-        print("ScoringPipeline output")
-        print("--------------------------------------------------------")
-        print(info)
-        print("--------------------------------------------------------")
-        print(scorings)
-        print("--------------------------------------------------------")
-        print()
+        info, scorings = await scoring_pipeline.run(resume_data, job_data, info, app.state.registry, app.state.score_cache, scoring_profile, app.state.tier_costs)
+        logging.info(f"ScoringPipeline output: {info}")
+        logging.info(f"ScoringPipeline scorings: {scorings}")
+        return {
+            "info":info,
+            "scorings":scorings,
+            "profile":scoring_profile
+        }
+    except Exception as e:
+        return Response(str(e), 500)
+    finally:
+        if not jd_task.done():
+            jd_task.cancel()
+        cloud_push_pipeline = CloudPushPipeline()
+        await cloud_push_pipeline.run()
+
+# top-k of every scored resume for the job description at url (or JD_URL), reranked by RoBERTa unless rerank=false 
+@app.post("/rank")
+async def rank(url:str | None = None, k:int = 20, rerank:bool = True):
+    if app.state.registry.index is None:
+        return Response("vector index is disabled", 400)
+    if k < 1:
+        return Response(f"'k' must be at least 1, got {k}", 400)
+    try:
+        jd_pipeline = JobDescriptionPipeline()
+        job_data = await jd_pipeline.run(url)
+        ranking_pipeline = RankingPipeline()
+        ranking = await ranking_pipeline.run(job_data, app.state.registry, k, rerank, app.state.tier_costs)
+        logging.info(f"RankingPipeline output: {ranking}")
+        return ranking
+    except Exception as e:
+        return Response(str(e), 500)
+
+# add the job description at url (or JD_URL) to the catalog, a job added again under the same url replaces it 
+@app.post("/catalog")
+async def catalog_add(url:str | None = None):
+    if app.state.catalog is None:
+        return Response("job catalog is disabled", 400)
+    try:
+        jd_pipeline = JobDescriptionPipeline()
+        job_data = await jd_pipeline.run(url)
+        job_id = await app.state.catalog.add(job_data.model_dump(), url or os.getenv("JD_URL"))
+        return {
+            "id": job_id,
+            "job_title": job_data.job_title,
+            "jobs": len(app.state.catalog)
+        }
+    except Exception as e:
+        return Response(str(e), 500)
+
+# jobs of the catalog 
+@app.get("/catalog")
+async def catalog_list():
+    if app.state.catalog is None:
+        return Response("job catalog is disabled", 400)
+    return app.state.catalog.jobs()
+
+# upload resume, returns the top_n catalog jobs of every resume scored by the cascade 
+@app.post("/match")
+async def match(files:List[UploadFile] = File(...), top_n:int | None = None, profile:str | None = None, budget_ms:float | None = None):
+    if app.state.catalog is None:
+        return Response("job catalog is disabled", 400)
+    if top_n is not None and top_n < 1:
+        return Response(f"'top_n' must be at least 1, got {top_n}", 400)
+    try:
+        scoring_profile = ScoringProfile.resolve(ScoringConfig.PROFILES, profile or ScoringConfig.DEFAULT_PROFILE, budget_ms)
+    except ValueError as e:
+        return Response(str(e), 400)
+    try:
+        ingestion_pipeline = DataIngestionPipeline()
+        info = await ingestion_pipeline.run(files)
+        transformation_pipeline = DataTransformationPipeline()
+        resume_data, info = await transformation_pipeline.run(info)
+        matching_pipeline = MatchingPipeline()
+        matches = await matching_pipeline.run(resume_data, info, app.state.registry, app.state.catalog, top_n, scoring_profile, app.state.tier_costs)
+        logging.info(f"MatchingPipeline output: {matches}")
         return {
             "info":info,
-            "scorings":scorings
+            "matches":matches,
+            "profile":scoring_profile
         }
     except Exception as e:
         return Response(str(e), 500)
@@ -4,5 +4,9 @@ from .data_ingestion import *
 from .data_transformation import * 
 from .job_description import * 
 from .scoring import *
+from .ranking import *
+from .matching import *
 from .schema import *
 from .cloud_push import *
+from .inference import *
+from .skills import *
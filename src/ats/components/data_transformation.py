@@ -7,21 +7,25 @@ from ..components.parsers.base import BaseParser
 from ..utils import asave_file, awrite_json
 from ..components.parsers import *
 from ..components.schema import *
+from .inference import ModelRegistry
+from .scorers import MiniLMResumeScorer, ResumeTextView
 from .. import logging
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from pathlib import PurePath, Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Awaitable, Dict, Any
 from copy import deepcopy
 import os, sys, asyncio, aiofiles, json
  
 
 class DataTransformationComponents:
-    def __init__(self ,config: DataTransformation, ing_config: DataIngestion, data: Dict[str, FileInfo] | None = None, llm:BaseChatModel | None = None) -> None:
+    def __init__(self ,config: DataTransformation, ing_config: DataIngestion, data: Dict[str, FileInfo] | None = None, llm:BaseChatModel | None = None, job_data:JobDescription | Awaitable[JobDescription] | None = None, registry:ModelRegistry | None = None) -> None:
         """if data is None, DataIngesion artifacts must be available before initializing, otherwise error will be raised
-        if llm is None, llm = ChatGoogleGenerativeAI, make sure to have required environment variables"""
+        if llm is None, llm = ChatGoogleGenerativeAI, make sure to have required environment variables
+        if job_data and registry are provided and pre-scoring is enabled in config, raw parsed texts are scored against the job description before structuring,
+        job_data may be a task still extracting the job description, it is only awaited once parsing finishes"""
         self.__stop_execution = False
         if not isinstance(config, DataTransformation):
             self.__stop_execution = True
@@ -41,6 +45,8 @@ class DataTransformationComponents:
         self.__config = config
         self.__ing_config = ing_config
         self.__llm = llm
+        self.__job_data = job_data
+        self.__registry = registry
         self.__parsers = {
             ".pdf": PDFParser,
             ".docx": DOCXParser,
@@ -218,6 +224,31 @@ class DataTransformationComponents:
             self.__stop_execution = True
         logging.info("Out __parse")
         
+    async def __prescore(self) -> None:
+        "MiniLM score of the raw parsed text of every resume against the job description, resumes below PRESCORE_SKIP_BELOW skip structuring"
+        if self.__stop_execution or not self.__config.PRESCORE_ENABLED or self.__job_data is None or self.__registry is None:
+            return
+        logging.info("In __prescore")
+        try:
+            job_data = self.__job_data if isinstance(self.__job_data, JobDescription) else await self.__job_data
+            names = [name for name, info in self.__data.items() if info.status and isinstance(self.__parsed_data.get(name), str) and self.__parsed_data[name]]
+            if job_data is None:
+                logging.warning("no job description to pre-score against, every resume is structured")
+            elif names:
+                scorer = MiniLMResumeScorer(encoder=self.__registry.encoder("MINILM"), skills=self.__registry.skills)
+                scores = await scorer.calculate_raw_scores_batch([self.__parsed_data[name] for name in names], job_data.model_dump())
+                for name, score in zip(names, scores):
+                    info = self.__data.get(name)
+                    info.prescore = score
+                    # a threshold of 0 never skips, whatever the sign of the score
+                    info.skipped = self.__config.PRESCORE_SKIP_BELOW > 0 and score < self.__config.PRESCORE_SKIP_BELOW
+                    self.__data[name] = info
+                logging.info(f"{sum(self.__data[name].skipped for name in names)} of {len(names)} resumes pre-scored below {self.__config.PRESCORE_SKIP_BELOW}, skipping their structuring")
+        except Exception as e:
+            # every resume is structured when pre-scoring fails
+            logging.error(str(CustomException(e, sys)))
+        logging.info("Out __prescore")
+
     async def __extract_keyword(self) -> None: 
         "extract structed output from parsed string data"
         if self.__stop_execution:
@@ -242,7 +273,9 @@ class DataTransformationComponents:
             for name in self.__data:
                 parsed_data = self.__parsed_data[name]
                 info = self.__data.get(name)
-                if info.status:
+                if info.status and info.skipped:
+                    logging.info(f"pre-score {info.prescore:.1f} below {self.__config.PRESCORE_SKIP_BELOW}, skipping structuring of \'{name}\'")
+                elif info.status:
                     if parsed_data:
                         prompt_tasks.append(asyncio.create_task(prompt_template.ainvoke({"input_data": parsed_data})))
                         prompt_True_files.append(name)
@@ -292,8 +325,8 @@ class DataTransformationComponents:
                         # add to training data
                         train_data["X"].append(parsed_data)
                         train_data["y"].append(structured_data.model_dump())
-                        # add data to private instance variable
-                        self.__structured_data[name] = structured_data
+                        # text view of the structured resume, built once and read by every scoring tier
+                        self.__structured_data[name] = ResumeTextView.of(structured_data)
                         path = self.__config.STRUCTURED_DATA_DIR_PATH.joinpath(Path(name).stem + Path(name).suffix.replace(".", "_")).with_suffix(".json").absolute()
                         if not path.parent.is_dir():
                             path.parent.mkdir(parents=True, exist_ok=True)
@@ -329,8 +362,8 @@ class DataTransformationComponents:
             self.__stop_execution = True
         logging.info("Out __extract_keyword")
         
-    async def __main(self) -> tuple[Dict[str, ResumeSchema], Dict[str, FileInfo]]:
-        "runs the transformation pipeline and returns structured data and all files information"
+    async def __main(self) -> tuple[Dict[str, ResumeTextView], Dict[str, FileInfo]]:
+        "runs the transformation pipeline and returns the text views of structured resumes and all files information"
         logging.info("In DataTransformation")
         errors = []
         i = 1
@@ -343,6 +376,7 @@ class DataTransformationComponents:
                 logging.error(str(e))
                 print(e)
         await self.__parse()
+        await self.__prescore()
         await self.__extract_keyword()
         # save train data
         timestamp = self.__config.TIME_STAMP.strftime("%d_%m_%Y_%H_%M_%S")
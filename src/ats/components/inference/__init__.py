@@ -0,0 +1,16 @@
+# update __all__
+
+from .backend import *
+from .executor import *
+from .pool import *
+from .sidecar import *
+from .batcher import *
+from .chunking import *
+from .cache import *
+from .store import *
+from .index import *
+from .tfidf import *
+from .manager import *
+from .tuning import *
+from .encoder import *
+from .registry import *
@@ -0,0 +1,79 @@
+from sentence_transformers import SentenceTransformer
+from pathlib import Path
+from ... import logging
+
+
+BACKENDS = ("torch", "onnx")
+QUANTIZATIONS = ("arm64", "avx2", "avx512", "avx512_vnni")
+
+
+def model_id(name:str, backend:str = "torch", quantization:str = "avx512_vnni", overlap_tokens:int | None = None) -> str:
+    """identifies a model inside embedding caches and stores, embeddings of a quantized graph
+    differ slightly from the pytorch ones and pooled windows differ from truncated texts so they are never mixed"""
+    identifier = name if backend == "torch" else f"{name}@{backend}-qint8-{quantization}"
+    return identifier if overlap_tokens is None else f"{identifier}+chunks-{overlap_tokens}"
+
+
+def require_onnx() -> None:
+    "raises when the packages of the 'onnx' extra are missing, exporting and running the quantized graph both need them"
+    try:
+        import onnxruntime, optimum.onnxruntime
+    except ImportError as e:
+        raise ImportError(f"onnx backend requires the \'onnx\' extra (onnxruntime, optimum), install it with \'pip install .[onnx]\' or \'uv sync --extra onnx\', {e}") from e
+
+
+def export_quantized_onnx(name:str, onnx_dir:Path, quantization:str = "avx512_vnni") -> Path:
+    """exports the model to ONNX and quantizes its weights to int8 (dynamic quantization),
+    the export is done once and reused from onnx_dir afterwards
+
+    Args:
+        name (str): hugging face name of the sentence-transformer
+        onnx_dir (Path): directory holding exported models
+        quantization (str, optional): target instruction set of the quantized graph, one of arm64, avx2, avx512, avx512_vnni. Defaults to "avx512_vnni".
+
+    Returns:
+        Path: directory of the exported model, the quantized graph is 'onnx/model_qint8_<quantization>.onnx' inside it
+    """
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"\'quantization\' must be one of {QUANTIZATIONS}, got {quantization}")
+    model_dir = onnx_dir.joinpath(name.replace("/", "__"))
+    if model_dir.joinpath("onnx", f"model_qint8_{quantization}.onnx").is_file():
+        return model_dir
+    require_onnx()
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+    logging.info(f"exporting \'{name}\' to int8 ONNX ({quantization}) at \'{model_dir.as_posix()}\'")
+    model = SentenceTransformer(name, backend="onnx")
+    model.save_pretrained(model_dir.as_posix())
+    export_dynamic_quantized_onnx_model(model, quantization, model_dir.as_posix())
+    return model_dir
+
+
+def load_model(name:str, backend:str = "torch", onnx_dir:Path | None = None, quantization:str = "avx512_vnni") -> SentenceTransformer:
+    """loads a sentence-transformer on the given backend
+
+    Args:
+        name (str): hugging face name of the sentence-transformer
+        backend (str, optional): 'torch' runs the fp32 pytorch model, 'onnx' runs an int8 dynamically quantized ONNX Runtime graph. Defaults to "torch".
+        onnx_dir (Path | None, optional): directory holding exported models, required for 'onnx'. Defaults to None.
+        quantization (str, optional): target instruction set of the quantized graph. Defaults to "avx512_vnni".
+
+    Returns:
+        SentenceTransformer: model exposing the same 'encode' api on either backend
+    """
+    if backend == "torch":
+        # safetensors weights are memory mapped instead of unpickled, reloading an evicted model reads them from the page cache
+        try:
+            return SentenceTransformer(name, model_kwargs={"use_safetensors": True})
+        except (OSError, EnvironmentError):
+            logging.info(f"no safetensors weights for '{name}', loading the pickled checkpoint")
+            return SentenceTransformer(name)
+    if backend == "onnx":
+        if onnx_dir is None:
+            raise ValueError("\'onnx_dir\' is required for the onnx backend")
+        require_onnx()
+        model_dir = export_quantized_onnx(name, onnx_dir, quantization)
+        return SentenceTransformer(model_dir.as_posix(), backend="onnx", model_kwargs={"file_name": f"onnx/model_qint8_{quantization}.onnx"})
+    raise ValueError(f"\'backend\' must be one of {BACKENDS}, got {backend}")
+
+
+__all__ = ["load_model", "export_quantized_onnx", "require_onnx", "model_id", "BACKENDS", "QUANTIZATIONS"]
@@ -0,0 +1,108 @@
+from typing import Awaitable, Callable, Dict, List, Set, Tuple
+from ... import logging
+import asyncio
+import numpy as np
+
+
+class MicroBatcher:
+    """collects encode requests from all in-flight pipelines for a short window, or until max_batch_size
+    texts are pending, runs one forward pass for all of them and scatters the embeddings back to the callers
+
+    usage:
+            batcher = MicroBatcher("MINILM", forward, window_ms=10, max_batch_size=128)
+            embeddings = await batcher.encode(["text", ...])
+    """
+    def __init__(self, name:str, forward:Callable[[List[str]], Awaitable[np.ndarray]], window_ms:float = 10, max_batch_size:int = 128) -> None:
+        """
+        Args:
+            name (str): name of the model, used in logs
+            forward (Callable[[List[str]], Awaitable[np.ndarray]]): coroutine function running one forward pass
+            window_ms (float, optional): how long the first request of a batch waits for others. Defaults to 10.
+            max_batch_size (int, optional): pending texts that trigger an immediate flush. Defaults to 128.
+        """
+        if window_ms < 0:
+            raise ValueError(f"\'window_ms\' can not be negative, got {window_ms}")
+        if max_batch_size < 1:
+            raise ValueError(f"\'max_batch_size\' must be at least 1, got {max_batch_size}")
+        self.name = name
+        self.__forward = forward
+        self.__window = window_ms / 1000
+        self.__max_batch_size = max_batch_size
+        self.__pending:List[Tuple[List[str], asyncio.Future]] = []
+        self.__pending_texts = 0
+        self.__timer:asyncio.TimerHandle | None = None
+        self.__tasks:Set[asyncio.Task] = set()
+        self.__flushes = {"window": 0, "size": 0}
+        self.__requests = 0
+        self.__texts = 0
+        self.__unique_texts = 0
+        self.__largest_batch = 0
+
+    async def encode(self, texts:List[str]) -> np.ndarray:
+        """queues texts for the next batch and waits for their embeddings
+
+        Args:
+            texts (List[str]): texts to encode
+
+        Returns:
+            np.ndarray: embeddings of shape (len(texts), dimension)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__pending.append((texts, future))
+        self.__pending_texts += len(texts)
+        if self.__pending_texts >= self.__max_batch_size:
+            self.__flush("size")
+        elif self.__timer is None:
+            self.__timer = loop.call_later(self.__window, self.__flush, "window")
+        return await future
+
+    def __flush(self, reason:str) -> None:
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        batch, self.__pending, self.__pending_texts = self.__pending, [], 0
+        if not batch:
+            return
+        self.__flushes[reason] += 1
+        task = asyncio.get_running_loop().create_task(self.__run(batch))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __run(self, batch:List[Tuple[List[str], asyncio.Future]]) -> None:
+        # identical texts from concurrent requests (eg: the same job description) are encoded once
+        index:Dict[str, int] = {}
+        positions = [[index.setdefault(text, len(index)) for text in texts] for texts, _ in batch]
+        self.__requests += len(batch)
+        self.__texts += sum(len(texts) for texts, _ in batch)
+        self.__unique_texts += len(index)
+        self.__largest_batch = max(self.__largest_batch, len(index))
+        try:
+            embeddings = await self.__forward(list(index))
+        except Exception as e:
+            logging.error(f"batched forward pass of \'{self.name}\' failed for {len(batch)} requests: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), rows in zip(batch, positions):
+            if not future.done():
+                future.set_result(embeddings[rows])
+
+    def report(self) -> Dict:
+        "returns flush counts and batch sizes"
+        batches = sum(self.__flushes.values())
+        return {
+            "window_ms": self.__window * 1000,
+            "max_batch_size": self.__max_batch_size,
+            "pending_texts": self.__pending_texts,
+            "flushes": dict(self.__flushes),
+            "requests": self.__requests,
+            "texts": self.__texts,
+            "unique_texts": self.__unique_texts,
+            "mean_batch_size": self.__unique_texts / batches if batches else 0.0,
+            "largest_batch": self.__largest_batch
+        }
+
+
+__all__ = ["MicroBatcher"]
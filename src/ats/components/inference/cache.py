@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Tuple
+from ...exception import CustomException
+from ...utils import get_hash
+from ... import logging
+import sys
+import numpy as np
+
+
+class EmbeddingCache:
+    """in-memory LRU cache of embeddings keyed by (model name, text hash), entries evicted from memory
+    are spilled to disk when a spill directory is given and promoted back on their next lookup
+
+    usage:
+            cache = EmbeddingCache(max_entries=4096, spill_dir=Path("artifacts/inference/embedding_cache"))
+            embedding = cache.get("sentence-transformers/all-mpnet-base-v2", text)
+            cache.put("sentence-transformers/all-mpnet-base-v2", text, embedding)
+    """
+    def __init__(self, max_entries:int = 4096, spill_dir:Path | None = None) -> None:
+        if max_entries < 1:
+            raise ValueError(f"\'max_entries\' must be at least 1, got {max_entries}")
+        self.__max_entries = max_entries
+        self.__spill_dir = spill_dir
+        self.__entries:OrderedDict[Tuple[str, str], np.ndarray] = OrderedDict()
+        self.__stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "spills": 0}
+
+    @staticmethod
+    def key(model:str, text:str) -> Tuple[str, str]:
+        return model, get_hash(text)
+
+    def __path(self, key:Tuple[str, str]) -> Path:
+        model, digest = key
+        return self.__spill_dir.joinpath(get_hash(model)[:16], digest[:2], f"{digest}.npy")
+
+    def get(self, model:str, text:str) -> np.ndarray | None:
+        """returns cached embedding of the text for the model or None"""
+        key = self.key(model, text)
+        if key in self.__entries:
+            self.__entries.move_to_end(key)
+            self.__stats["hits"] += 1
+            return self.__entries[key]
+        if self.__spill_dir:
+            path = self.__path(key)
+            if path.is_file():
+                try:
+                    embedding = np.load(path)
+                    self.__stats["disk_hits"] += 1
+                    self.__insert(key, embedding)
+                    return embedding
+                except Exception as e:
+                    logging.warning(f"unable to read spilled embedding \'{path.as_posix()}\', {e}")
+        self.__stats["misses"] += 1
+        return None
+
+    def put(self, model:str, text:str, embedding:np.ndarray) -> None:
+        """stores embedding of the text for the model"""
+        self.__insert(self.key(model, text), np.asarray(embedding, dtype=np.float32))
+
+    def __insert(self, key:Tuple[str, str], embedding:np.ndarray) -> None:
+        self.__entries[key] = embedding
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_entries:
+            evicted_key, evicted = self.__entries.popitem(last=False)
+            self.__stats["evictions"] += 1
+            if self.__spill_dir:
+                self.__spill(evicted_key, evicted)
+
+    def __spill(self, key:Tuple[str, str], embedding:np.ndarray) -> None:
+        path = self.__path(key)
+        if path.is_file():
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.save(path, embedding)
+            self.__stats["spills"] += 1
+        except Exception as e:
+            logging.error(str(CustomException(e, sys)))
+
+    def report(self) -> Dict:
+        "returns hit/miss counters and size"
+        return {
+            "entries": len(self.__entries),
+            "max_entries": self.__max_entries,
+            "spill_dir": self.__spill_dir.as_posix() if self.__spill_dir else None,
+            **self.__stats
+        }
+
+
+__all__ = ["EmbeddingCache"]
@@ -0,0 +1,118 @@
+from sentence_transformers import SentenceTransformer
+from typing import Dict, List, Tuple
+import threading
+import numpy as np
+
+
+class TextChunker:
+    """encodes texts of any length with a fixed-length model, texts are tokenized once, texts longer than the
+    model's max sequence length are split into overlapping token windows whose embeddings are mean pooled
+    (weighted by window length), and windows are grouped into length buckets under a token budget so that
+    padding, and with it compute, stays proportional to the real tokens, buckets hold at most max_batch_size windows
+
+    usage:
+            chunker = TextChunker(model, overlap_tokens=32, max_batch_tokens=8192)
+            embeddings = chunker.encode(["long resume text", ...])  # blocking, run it on the inference executor
+    """
+    def __init__(self, model:SentenceTransformer, overlap_tokens:int = 32, max_batch_tokens:int = 8192, max_batch_size:int | None = None) -> None:
+        # room for the special tokens (eg: [CLS] and [SEP]) added by the model
+        self.window = model.max_seq_length - 2
+        if not 0 <= overlap_tokens < self.window:
+            raise ValueError(f"\'overlap_tokens\' must be in [0, {self.window}), got {overlap_tokens}")
+        if max_batch_tokens < self.window:
+            raise ValueError(f"\'max_batch_tokens\' must be at least the window size {self.window}, got {max_batch_tokens}")
+        self.model = model
+        self.overlap = overlap_tokens
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.__lock = threading.Lock()
+        self.__stats = {"texts": 0, "chunked_texts": 0, "windows": 0, "batches": 0, "tokens": 0, "padded_tokens": 0}
+
+    def split(self, texts:List[str]) -> Tuple[List[str], List[int], List[int]]:
+        """tokenizes every text once and cuts texts longer than the window at token offsets
+
+        Returns:
+            Tuple[List[str], List[int], List[int]]: window texts, token count of every window and index of the text it belongs to
+        """
+        try:
+            encoded = self.model.tokenizer(texts, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+            offsets = encoded["offset_mapping"]
+        except (NotImplementedError, KeyError, TypeError):
+            # slow tokenizers have no offsets, texts are bucketed but not chunked
+            encoded = self.model.tokenizer(texts, add_special_tokens=False, verbose=False)
+            offsets = None
+        windows, lengths, owners = [], [], []
+        step = self.window - self.overlap
+        for i, (text, ids) in enumerate(zip(texts, encoded["input_ids"])):
+            if offsets is None or len(ids) <= self.window:
+                windows.append(text)
+                lengths.append(min(len(ids), self.window))
+                owners.append(i)
+                continue
+            for start in range(0, len(ids) - self.overlap, step):
+                end = min(start + self.window, len(ids))
+                windows.append(text[offsets[i][start][0]:offsets[i][end - 1][1]])
+                lengths.append(end - start)
+                owners.append(i)
+        return windows, lengths, owners
+
+    def buckets(self, lengths:List[int]) -> List[List[int]]:
+        "groups window indices sorted by length so that longest length * batch size stays within max_batch_tokens and batch size within max_batch_size"
+        order = sorted(range(len(lengths)), key=lengths.__getitem__, reverse=True)
+        buckets, current = [], []
+        for index in order:
+            # the first (longest) window of a bucket sets its padded length
+            if current and (lengths[current[0]] * (len(current) + 1) > self.max_batch_tokens or len(current) == self.max_batch_size):
+                buckets.append(current)
+                current = []
+            current.append(index)
+        if current:
+            buckets.append(current)
+        return buckets
+
+    def encode(self, texts:List[str]) -> np.ndarray:
+        """encodes texts without truncation, one forward pass per bucket
+
+        Args:
+            texts (List[str]): texts to encode
+
+        Returns:
+            np.ndarray: float32 embeddings of shape (len(texts), dimension)
+        """
+        windows, lengths, owners = self.split(texts)
+        embeddings = np.empty((len(windows), self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        buckets = self.buckets(lengths)
+        for bucket in buckets:
+            embeddings[bucket] = self.model.encode([windows[i] for i in bucket], batch_size=len(bucket))
+
+        # mean of the windows of every text weighted by their token counts
+        counts = np.bincount(owners, minlength=len(texts))
+        weights = np.maximum(np.asarray(lengths, dtype=np.float32), 1)
+        pooled = np.zeros((len(texts), embeddings.shape[1]), dtype=np.float32)
+        np.add.at(pooled, owners, embeddings * weights[:, None])
+        pooled /= np.bincount(owners, weights=weights, minlength=len(texts))[:, None].astype(np.float32)
+
+        with self.__lock:
+            self.__stats["texts"] += len(texts)
+            self.__stats["chunked_texts"] += int((counts > 1).sum())
+            self.__stats["windows"] += len(windows)
+            self.__stats["batches"] += len(buckets)
+            self.__stats["tokens"] += sum(lengths)
+            self.__stats["padded_tokens"] += sum(lengths[bucket[0]] * len(bucket) for bucket in buckets)
+        return pooled
+
+    def report(self) -> Dict:
+        "returns window and padding stats"
+        with self.__lock:
+            stats = dict(self.__stats)
+        return {
+            "window_tokens": self.window,
+            "overlap_tokens": self.overlap,
+            "max_batch_tokens": self.max_batch_tokens,
+            "max_batch_size": self.max_batch_size,
+            **stats,
+            "padding_ratio": 1 - stats["tokens"] / stats["padded_tokens"] if stats["padded_tokens"] else 0.0
+        }
+
+
+__all__ = ["TextChunker"]
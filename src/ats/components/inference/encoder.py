@@ -0,0 +1,147 @@
+from sentence_transformers import SentenceTransformer
+from typing import List
+from .executor import InferenceExecutor
+from .pool import InferencePool
+from .batcher import MicroBatcher
+from .chunking import TextChunker
+from .cache import EmbeddingCache
+from .store import EmbeddingStore
+import asyncio
+import numpy as np
+
+
+class Encoder:
+    """async access to a sentence-transformer, 'encode' calls run on the inference executor
+    so the event loop stays responsive while a model is busy, with micro-batching enabled
+    concurrent calls are merged into one forward pass, with chunking enabled long texts are encoded
+    as pooled overlapping windows instead of being truncated, with a cache enabled texts that repeat
+    across requests (eg: the job description) are encoded once, with a store enabled resume texts
+    passed along with their section names are persisted on disk and reused across restarts, with a pool
+    enabled forward passes run in forked worker processes instead of the inference executor
+
+    usage:
+            encoder = Encoder("MINILM", model, executor, model_id="sentence-transformers/paraphrase-MiniLM-L6-v2")
+            encoder.enable_batching(window_ms=10, max_batch_size=128)
+            encoder.enable_chunking(overlap_tokens=32, max_batch_tokens=8192)
+            encoder.enable_cache(EmbeddingCache())
+            embeddings = await encoder.encode(["text", ...])
+            job_embeddings = await encoder.encode(["job text", ...], cache=True)
+            encoder.enable_store(EmbeddingStore(Path("artifacts/inference/embedding_store"), encoder.model_id, encoder.dimension))
+            section_embeddings = await encoder.encode(["resume skills", ...], sections=["skills", ...])
+    """
+    def __init__(self, name:str, model:SentenceTransformer, executor:InferenceExecutor | None = None, model_id:str | None = None) -> None:
+        """if executor is None, calls run on the default executor of the running loop,
+        model_id identifies the model inside caches, defaults to name"""
+        self.name = name
+        self.model = model
+        self.executor = executor
+        self.model_id = model_id or name
+        self.batcher:MicroBatcher | None = None
+        self.chunker:TextChunker | None = None
+        self.cache:EmbeddingCache | None = None
+        self.store:EmbeddingStore | None = None
+        self.pool:InferencePool | None = None
+        # texts per forward pass inside one encode call, the library default when None
+        self.batch_size:int | None = None
+
+    def enable_batching(self, window_ms:float, max_batch_size:int) -> MicroBatcher:
+        "merges concurrent encode calls into one forward pass per window"
+        self.batcher = MicroBatcher(self.name, self.__forward, window_ms, max_batch_size)
+        return self.batcher
+
+    def enable_chunking(self, overlap_tokens:int, max_batch_tokens:int) -> TextChunker:
+        "encodes over-length texts as overlapping windows and every forward pass as length buckets"
+        self.chunker = TextChunker(self.model, overlap_tokens, max_batch_tokens, self.batch_size)
+        return self.chunker
+
+    def enable_cache(self, cache:EmbeddingCache) -> EmbeddingCache:
+        "looks up texts encoded with 'cache=True' in the given cache before running the model"
+        self.cache = cache
+        return self.cache
+
+    def enable_store(self, store:EmbeddingStore) -> EmbeddingStore:
+        "reads texts encoded with section names from the given store before running the model and writes new ones to it"
+        self.store = store
+        return self.store
+
+    def set_batch_size(self, batch_size:int) -> None:
+        "texts per forward pass of the model, also caps the windows of a chunked length bucket"
+        if batch_size < 1:
+            raise ValueError(f"'batch_size' must be at least 1, got {batch_size}")
+        self.batch_size = batch_size
+        if self.chunker:
+            self.chunker.max_batch_size = batch_size
+
+    def enable_pool(self, pool:InferencePool) -> InferencePool:
+        "runs forward passes on the worker processes of the given pool, the pool must have been forked with 'forward' of this encoder under its name"
+        self.pool = pool
+        return self.pool
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    async def encode(self, texts:List[str], cache:bool = False, sections:List[str] | None = None) -> np.ndarray:
+        """encodes all texts in a single forward pass
+
+        Args:
+            texts (List[str]): texts to encode
+            cache (bool, optional): look up and store embeddings in the cache, meant for texts repeating across requests. Defaults to False.
+            sections (List[str] | None, optional): section name of every text, look up and persist embeddings in the store. Defaults to None.
+
+        Returns:
+            np.ndarray: float32 embeddings of shape (len(texts), dimension)
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        if cache and self.cache:
+            return await self.__encode_cached(texts)
+        if sections is not None and self.store:
+            return await self.__encode_stored(texts, sections)
+        return await self.__encode(texts)
+
+    async def __encode_stored(self, texts:List[str], sections:List[str]) -> np.ndarray:
+        if len(sections) != len(texts):
+            raise ValueError(f"got {len(sections)} section names for {len(texts)} texts")
+        found = [self.store.get(text, section) for text, section in zip(texts, sections)]
+        missing = [i for i, embedding in enumerate(found) if embedding is None]
+        if missing:
+            embeddings = await self.__encode([texts[i] for i in missing])
+            self.store.put([texts[i] for i in missing], [sections[i] for i in missing], embeddings)
+            for i, embedding in zip(missing, embeddings):
+                found[i] = embedding
+        return np.stack(found)
+
+    async def __encode_cached(self, texts:List[str]) -> np.ndarray:
+        found = {text: self.cache.get(self.model_id, text) for text in dict.fromkeys(texts)}
+        missing = [text for text, embedding in found.items() if embedding is None]
+        if missing:
+            for text, embedding in zip(missing, await self.__encode(missing)):
+                self.cache.put(self.model_id, text, embedding)
+                found[text] = embedding
+        return np.stack([found[text] for text in texts])
+
+    async def __encode(self, texts:List[str]) -> np.ndarray:
+        if self.batcher:
+            return await self.batcher.encode(texts)
+        return await self.__forward(texts)
+
+    def forward(self, texts:List[str]) -> np.ndarray:
+        "one blocking forward pass in the calling thread"
+        if self.chunker:
+            return self.chunker.encode(texts)
+        if self.batch_size:
+            return np.asarray(self.model.encode(texts, batch_size=self.batch_size), dtype=np.float32)
+        return np.asarray(self.model.encode(texts), dtype=np.float32)
+
+    async def __forward(self, texts:List[str]) -> np.ndarray:
+        "runs one forward pass on the pool, or on the executor when no pool worker is alive"
+        if self.pool and self.pool.alive:
+            return await self.pool.run(self.name, texts)
+        if self.executor:
+            return await self.executor.run(self.forward, texts, label=self.name)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.forward, texts)
+
+
+__all__ = ["Encoder"]
@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Any, Callable, Dict, Tuple
+from ... import logging
+import asyncio, threading, time
+import numpy as np
+
+
+class LatencyStats:
+    """running latency statistics, percentiles are computed over the most recent observations"""
+    def __init__(self, window:int = 1024) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.__recent = deque(maxlen=window)
+
+    def observe(self, seconds:float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.__recent.append(seconds)
+
+    def percentile(self, q:float) -> float:
+        "returns q-th percentile of recent observations in seconds"
+        return float(np.percentile(self.__recent, q)) if self.__recent else 0.0
+
+    def report(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": (self.total / self.count) * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "max_ms": self.max * 1000
+        }
+
+
+class InferenceExecutor:
+    """dedicated and bounded thread pool for model inference, keeps blocking 'encode' calls off the event loop
+    and away from the default executor used by parsing and OCR
+
+    usage:
+            executor = InferenceExecutor(workers=1, max_queue=64, initializer=configure_worker, initargs=(RuntimeConfig,))
+            embeddings = await executor.run(model.encode, texts, label="MINILM")
+    """
+    def __init__(self, workers:int = 1, max_queue:int = 64, initializer:Callable | None = None, initargs:Tuple = ()) -> None:
+        "initializer(*initargs) runs once in every worker thread, eg: to pin it to a cpu set"
+        if workers < 1:
+            raise ValueError(f"\'workers\' must be at least 1, got {workers}")
+        if max_queue < 0:
+            raise ValueError(f"\'max_queue\' can not be negative, got {max_queue}")
+        self.__workers = workers
+        self.__max_queue = max_queue
+        self.__pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference", initializer=initializer, initargs=initargs)
+        # callers wait here once workers + max_queue calls are pending
+        self.__slots = asyncio.Semaphore(workers + max_queue)
+        self.__lock = threading.Lock()
+        self.__queued = 0
+        self.__running = 0
+        self.__failed = 0
+        self.__wait = {}
+        self.__run = {}
+
+    @property
+    def queue_depth(self) -> int:
+        "calls submitted but not yet picked up by a worker"
+        return self.__queued
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        return self.__pool
+
+    def __stats(self, stats:Dict[str, LatencyStats], label:str) -> LatencyStats:
+        if label not in stats:
+            stats[label] = LatencyStats()
+        return stats[label]
+
+    async def run(self, func:Callable, *args, label:str = "default", **kwargs) -> Any:
+        """runs func(*args, **kwargs) on an inference worker and waits for the result
+
+        Args:
+            func (Callable): blocking callable, eg: model.encode
+            label (str, optional): name under which wait and run times are recorded. Defaults to "default".
+
+        Returns:
+            Any: return value of func
+        """
+        async with self.__slots:
+            submitted = time.perf_counter()
+            with self.__lock:
+                self.__queued += 1
+
+            def call():
+                started = time.perf_counter()
+                with self.__lock:
+                    self.__queued -= 1
+                    self.__running += 1
+                    self.__stats(self.__wait, label).observe(started - submitted)
+                try:
+                    return func(*args, **kwargs)
+                except Exception:
+                    with self.__lock:
+                        self.__failed += 1
+                    raise
+                finally:
+                    with self.__lock:
+                        self.__running -= 1
+                        self.__stats(self.__run, label).observe(time.perf_counter() - started)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.__pool, call)
+
+    def report(self) -> Dict:
+        "returns queue depth and per-label wait and run times"
+        with self.__lock:
+            return {
+                "workers": self.__workers,
+                "max_queue": self.__max_queue,
+                "queue_depth": self.__queued,
+                "running": self.__running,
+                "failed": self.__failed,
+                "wait": {label: stats.report() for label, stats in self.__wait.items()},
+                "run": {label: stats.report() for label, stats in self.__run.items()}
+            }
+
+    def shutdown(self) -> None:
+        logging.info(f"shutting down {self.__class__.__name__}")
+        self.__pool.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = ["InferenceExecutor", "LatencyStats"]
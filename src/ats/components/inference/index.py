@@ -0,0 +1,239 @@
+from pathlib import Path
+from typing import Dict, List, Tuple
+from ...exception import CustomException
+from ... import logging
+import json, sys
+import numpy as np
+
+
+MODES = ("exact", "ivf")
+
+
+class VectorIndex:
+    """persistent, append-only index of l2 normalized document embeddings for top-k cosine search,
+    'exact' compares the query against every vector with one matrix-vector product over a memory map,
+    'ivf' clusters the vectors with spherical k-means and only compares against the nprobe closest clusters,
+    it falls back to exact search below min_train vectors and re-trains in memory once the index doubled
+
+    a document is identified by the hash of its content and added once, a new document under the name of an indexed one replaces it
+
+    layout of <root_dir>/<model>/:
+            meta.json       model and dimension of the vectors
+            vectors.bin     float32 rows of 'dimension' values, normalized, only ever appended to
+            ids.tsv         one '<id>\\t<row>\\t<name>' line per vector
+            docs/<id>.json  payload of every document, eg: the structured resume
+
+    usage:
+            index = VectorIndex(Path("artifacts/inference/index"), "sentence-transformers/all-mpnet-base-v2", 768)
+            index.add(ids, names, embeddings, payloads)
+            hits = index.search(query_embedding, k=20)      # [(id, name, similarity), ...]
+            resume = index.payload(hits[0][0])
+    """
+    def __init__(self, root_dir:Path, model:str, dimension:int, mode:str = "exact", nlist:int = 0, nprobe:int = 8, min_train:int = 4096) -> None:
+        if mode not in MODES:
+            raise ValueError(f"\'mode\' must be one of {MODES}, got {mode}")
+        self.model = model
+        self.dimension = dimension
+        self.mode = mode
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train = min_train
+        self.dir = root_dir.joinpath(model.replace("/", "__"))
+        self.__vectors_path = self.dir.joinpath("vectors.bin")
+        self.__ids_path = self.dir.joinpath("ids.tsv")
+        self.__row_bytes = self.dimension * np.dtype(np.float32).itemsize
+        self.__rows = 0
+        # id -> row, name -> id of its latest document and row -> (id, name) of active rows
+        self.__index:Dict[str, int] = {}
+        self.__names:Dict[str, str] = {}
+        self.__active:Dict[int, Tuple[str, str]] = {}
+        self.__view:np.memmap | None = None
+        # ivf state: centroids, cluster of every trained row and the number of rows trained on
+        self.__centroids:np.ndarray | None = None
+        self.__lists:List[np.ndarray] = []
+        self.__trained_rows = 0
+        self.__stats = {"searches": 0, "adds": 0, "trainings": 0}
+        self.__open()
+
+    def __open(self) -> None:
+        self.dir.joinpath("docs").mkdir(parents=True, exist_ok=True)
+        meta = {"model": self.model, "dimension": self.dimension}
+        meta_path = self.dir.joinpath("meta.json")
+        if meta_path.is_file() and json.loads(meta_path.read_text()) != meta:
+            logging.warning(f"vector index \'{self.dir.as_posix()}\' was written with different settings, starting empty")
+            self.__vectors_path.unlink(missing_ok=True)
+            self.__ids_path.unlink(missing_ok=True)
+        meta_path.write_text(json.dumps(meta))
+
+        # a write interrupted mid row leaves a partial row at the end, drop it
+        self.__vectors_path.touch()
+        size = self.__vectors_path.stat().st_size
+        self.__rows = size // self.__row_bytes
+        if size != self.__rows * self.__row_bytes:
+            with open(self.__vectors_path, "r+b") as file:
+                file.truncate(self.__rows * self.__row_bytes)
+
+        if self.__ids_path.is_file():
+            with open(self.__ids_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) == 3 and parts[1].isdigit() and int(parts[1]) < self.__rows:
+                        self.__activate(parts[0], int(parts[1]), parts[2])
+        logging.info(f"opened vector index \'{self.dir.as_posix()}\' with {len(self.__active)} documents")
+
+    def __activate(self, doc_id:str, row:int, name:str) -> None:
+        previous = self.__names.get(name)
+        if previous is not None and previous in self.__index:
+            self.__active.pop(self.__index.pop(previous), None)
+        self.__index[doc_id] = row
+        self.__names[name] = doc_id
+        self.__active[row] = (doc_id, name)
+
+    def __vectors(self) -> np.ndarray:
+        # re-map after appends, the map only covers rows present when it was created
+        if self.__view is None or self.__view.shape[0] != self.__rows:
+            self.__view = np.memmap(self.__vectors_path, dtype=np.float32, mode="r", shape=(self.__rows, self.dimension)) if self.__rows else np.empty((0, self.dimension), dtype=np.float32)
+        return self.__view
+
+    def __len__(self) -> int:
+        return len(self.__active)
+
+    def __contains__(self, doc_id:str) -> bool:
+        return doc_id in self.__index
+
+    def documents(self) -> List[Tuple[str, str]]:
+        "(id, name) of every active document in the order they were added"
+        return [self.__active[row] for row in sorted(self.__active)]
+
+    def add(self, ids:List[str], names:List[str], embeddings:np.ndarray, payloads:List[Dict]) -> int:
+        """adds documents not indexed yet, vectors are written before the ids so an interrupted write never leaves an id without its vector
+
+        Returns:
+            int: number of documents added
+        """
+        new = {}
+        for i, doc_id in enumerate(ids):
+            if doc_id not in self.__index and doc_id not in new:
+                new[doc_id] = i
+        if not new:
+            return 0
+        rows = np.asarray(embeddings, dtype=np.float32)[list(new.values())]
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        rows = rows / np.where(norms == 0, 1, norms)
+        try:
+            for doc_id, i in new.items():
+                path = self.dir.joinpath("docs", f"{doc_id}.json")
+                if not path.is_file():
+                    path.write_text(json.dumps(payloads[i], ensure_ascii=False, default=str), encoding="utf-8")
+            with open(self.__vectors_path, "ab") as file:
+                file.write(rows.tobytes())
+            with open(self.__ids_path, "a", encoding="utf-8") as file:
+                file.writelines(f"{doc_id}\t{self.__rows + n}\t{names[i]}\n" for n, (doc_id, i) in enumerate(new.items()))
+        except Exception as e:
+            logging.error(str(CustomException(e, sys)))
+            # roll back rows that were written without their ids
+            with open(self.__vectors_path, "r+b") as file:
+                file.truncate(self.__rows * self.__row_bytes)
+            return 0
+        for n, (doc_id, i) in enumerate(new.items()):
+            self.__activate(doc_id, self.__rows + n, names[i])
+        self.__rows += len(new)
+        self.__stats["adds"] += len(new)
+        return len(new)
+
+    def payload(self, doc_id:str) -> Dict:
+        "returns the payload stored with the document"
+        return json.loads(self.dir.joinpath("docs", f"{doc_id}.json").read_text(encoding="utf-8"))
+
+    def __train(self, rows:np.ndarray, iterations:int = 10) -> None:
+        "spherical k-means over the active rows, every row is assigned to the centroid with the highest cosine similarity"
+        vectors = np.asarray(self.__vectors()[rows])
+        nlist = min(self.nlist or max(int(np.sqrt(len(rows))), 1), len(rows))
+        rng = np.random.default_rng(0)
+        centroids = vectors[rng.choice(len(rows), nlist, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            counts = np.bincount(assignment, minlength=nlist)
+            # empty clusters are re-seeded with a random row
+            empty = counts == 0
+            sums[empty] = vectors[rng.choice(len(rows), int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.where(norms == 0, 1, norms)
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        self.__centroids = centroids
+        self.__lists = [rows[assignment == c] for c in range(nlist)]
+        self.__trained_rows = self.__rows
+        self.__stats["trainings"] += 1
+        logging.info(f"trained ivf index \'{self.dir.as_posix()}\' with {nlist} lists on {len(rows)} vectors")
+
+    def __candidates(self, query:np.ndarray, active:np.ndarray) -> np.ndarray:
+        "rows of the clusters closest to the query and rows added since training"
+        if self.__centroids is None or self.__rows >= 2 * self.__trained_rows:
+            self.__train(active)
+        probe = np.argsort(-(self.__centroids @ query))[:self.nprobe]
+        rows = np.concatenate([self.__lists[c] for c in probe] + [np.arange(self.__trained_rows, self.__rows)])
+        # rows replaced since training are no longer active
+        return rows[np.isin(rows, active)]
+
+    def search(self, query:np.ndarray, k:int = 10) -> List[Tuple[str, str, float]]:
+        """returns up to k documents most similar to the query
+
+        Args:
+            query (np.ndarray): embedding of the query, eg: a job description
+            k (int, optional): number of documents. Defaults to 10.
+
+        Returns:
+            List[Tuple[str, str, float]]: (id, name, cosine similarity) by decreasing similarity
+        """
+        return self.search_batch(np.atleast_2d(query), k)[0]
+
+    def search_batch(self, queries:np.ndarray, k:int = 10) -> List[List[Tuple[str, str, float]]]:
+        """returns up to k documents most similar to every query, in exact mode all queries are compared
+        against all documents with one matrix product
+
+        Args:
+            queries (np.ndarray): embeddings of the queries, one row per query
+            k (int, optional): number of documents per query. Defaults to 10.
+
+        Returns:
+            List[List[Tuple[str, str, float]]]: (id, name, cosine similarity) by decreasing similarity of every query
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        self.__stats["searches"] += len(queries)
+        if not self.__active:
+            return [[] for _ in queries]
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+        active = np.fromiter(self.__active, dtype=np.int64)
+        active.sort()
+        if self.mode == "exact" or len(active) < self.min_train:
+            similarities = self.__vectors()[active] @ queries.T
+            return [self.__top(active, similarities[:, n], k) for n in range(len(queries))]
+        results = []
+        for query in queries:
+            rows = self.__candidates(query, active)
+            results.append(self.__top(rows, self.__vectors()[rows] @ query, k))
+        return results
+
+    def __top(self, rows:np.ndarray, similarities:np.ndarray, k:int) -> List[Tuple[str, str, float]]:
+        k = min(k, len(rows))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [(*self.__active[int(rows[i])], float(similarities[i])) for i in top]
+
+    def report(self) -> Dict:
+        "returns size, mode and counters"
+        return {
+            "dir": self.dir.as_posix(),
+            "mode": self.mode,
+            "documents": len(self.__active),
+            "rows": self.__rows,
+            "bytes": self.__rows * self.__row_bytes,
+            "lists": len(self.__lists) if self.__centroids is not None else 0,
+            **self.__stats
+        }
+
+
+__all__ = ["VectorIndex", "MODES"]
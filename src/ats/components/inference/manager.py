@@ -0,0 +1,221 @@
+from sentence_transformers import SentenceTransformer
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+from ...utils import get_rss
+from ... import logging
+import gc, itertools, json, threading, time
+
+
+def footprint(model:SentenceTransformer) -> int | None:
+    "bytes of the parameters and buffers of a pytorch model, None for models without them (eg: onnx)"
+    try:
+        return sum(tensor.numel() * tensor.element_size() for tensor in itertools.chain(model.parameters(), model.buffers()))
+    except (AttributeError, TypeError):
+        return None
+
+
+@dataclass
+class _Entry:
+    model_id:str
+    model:SentenceTransformer | None = None
+    bytes:int = 0
+    last_used:float = 0.0
+    busy:int = 0
+    uses:int = 0
+    loads:int = 0
+    evictions:int = 0
+    load_seconds:float = 0.0
+    loading:threading.Lock = field(default_factory=threading.Lock)
+
+
+class ManagedModel:
+    """stand-in for the model of one tier held by a ModelManager, the model is loaded on the first attribute access
+    and reloaded after an eviction, dimension and max sequence length are answered without loading it once known
+    """
+    def __init__(self, manager:"ModelManager", key:str) -> None:
+        self.__manager = manager
+        self.__key = key
+
+    def __getattr__(self, name:str):
+        if name.startswith("_ManagedModel__"):
+            raise AttributeError(name)
+        return getattr(self.__manager.acquire(self.__key), name)
+
+    @property
+    def max_seq_length(self) -> int:
+        return self.__manager.meta(self.__key)["max_seq_length"]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.__manager.meta(self.__key)["dimension"]
+
+    def encode(self, *args, **kwargs):
+        "the model is not evicted while it encodes"
+        with self.__manager.use(self.__key) as model:
+            return model.encode(*args, **kwargs)
+
+
+class ModelManager:
+    """loads the model of every tier lazily on first use and keeps the resident models within a memory budget,
+    when loading a model would exceed the budget the least recently used idle models are evicted first
+
+    size, dimension and max sequence length of every model are persisted in meta_path, so the budget is enforced
+    before a known model is loaded and encoders are set up at startup without loading any model
+
+    usage:
+            manager = ModelManager(lambda key: load_model(names[key]), budget_bytes=2 * 2**30, meta_path=Path("artifacts/inference/models.json"))
+            model = manager.register("ROBERTA", "sentence-transformers/all-roberta-large-v1")
+            embeddings = model.encode(["text", ...])        # loads the model, evicting others if needed
+    """
+    def __init__(self, loader:Callable[[str], SentenceTransformer], budget_bytes:int = 0, meta_path:Path | None = None) -> None:
+        """
+        Args:
+            loader (Callable[[str], SentenceTransformer]): blocking load of the model registered under a key
+            budget_bytes (int, optional): memory of all resident models, 0 for no limit. Defaults to 0.
+            meta_path (Path | None, optional): json file with size, dimension and max sequence length of known models. Defaults to None.
+        """
+        if budget_bytes < 0:
+            raise ValueError(f"\'budget_bytes\' must be positive or 0, got {budget_bytes}")
+        self.__loader = loader
+        self.budget_bytes = budget_bytes
+        self.__meta_path = meta_path
+        self.__meta:Dict[str, Dict] = {}
+        if meta_path and meta_path.is_file():
+            with open(meta_path, encoding="utf-8") as file:
+                self.__meta = json.load(file)
+        self.__entries:Dict[str, _Entry] = {}
+        self.__lock = threading.Lock()
+        self.__stats = {"loads": 0, "reloads": 0, "evictions": 0, "over_budget": 0}
+
+    def register(self, key:str, model_id:str) -> ManagedModel:
+        "registers a model without loading it, model_id identifies it in the persisted metadata"
+        self.__entries[key] = _Entry(model_id)
+        return ManagedModel(self, key)
+
+    def __resident(self) -> int:
+        return sum(entry.bytes for entry in self.__entries.values() if entry.model is not None)
+
+    def __make_room(self, key:str, incoming:int) -> None:
+        "evicts least recently used idle models until incoming bytes fit the budget, called under the lock"
+        if not self.budget_bytes:
+            return
+        while self.__resident() + incoming > self.budget_bytes:
+            idle = [(other, entry) for other, entry in self.__entries.items() if other != key and entry.model is not None and not entry.busy]
+            if not idle:
+                self.__stats["over_budget"] += 1
+                logging.warning(f"model memory {(self.__resident() + incoming) / 2**20:.0f}MiB exceeds the budget of {self.budget_bytes / 2**20:.0f}MiB, no idle model left to evict for \'{key}\'")
+                return
+            other, entry = min(idle, key=lambda item: item[1].last_used)
+            entry.model = None
+            entry.evictions += 1
+            self.__stats["evictions"] += 1
+            gc.collect()
+            logging.info(f"evicted \'{other}\' ({entry.bytes / 2**20:.0f}MiB, idle {time.monotonic() - entry.last_used:.1f}s) to load \'{key}\'")
+
+    def __acquire(self, key:str, hold:bool) -> SentenceTransformer:
+        entry = self.__entries[key]
+        with self.__lock:
+            entry.last_used = time.monotonic()
+            if entry.model is not None:
+                entry.busy += hold
+                return entry.model
+        # one load per model at a time, other models keep serving while it loads
+        with entry.loading:
+            with self.__lock:
+                if entry.model is not None:
+                    entry.busy += hold
+                    return entry.model
+                self.__make_room(key, self.__meta.get(entry.model_id, {}).get("bytes", 0))
+            rss = get_rss()
+            start = time.perf_counter()
+            model = self.__loader(key)
+            seconds = time.perf_counter() - start
+            size = footprint(model) or max(get_rss() - rss, 0)
+            with self.__lock:
+                entry.model = model
+                entry.bytes = size
+                entry.load_seconds = seconds
+                entry.loads += 1
+                entry.busy += hold
+                entry.last_used = time.monotonic()
+                self.__stats["loads"] += 1
+                self.__stats["reloads"] += entry.loads > 1
+                # the estimate may be missing or too small, the budget is checked again with the real size
+                self.__make_room(key, 0)
+                self.__remember(entry)
+            logging.info(f"{'reloaded' if entry.loads > 1 else 'loaded'} \'{key}\' in {seconds:.2f}s, {size / 2**20:.0f}MiB, {self.__resident() / 2**20:.0f}MiB resident")
+            return model
+
+    def __remember(self, entry:_Entry) -> None:
+        meta = {
+            "bytes": entry.bytes,
+            "dimension": entry.model.get_sentence_embedding_dimension(),
+            "max_seq_length": getattr(entry.model, "max_seq_length", None)
+        }
+        if self.__meta.get(entry.model_id) == meta:
+            return
+        self.__meta[entry.model_id] = meta
+        if self.__meta_path:
+            self.__meta_path.parent.mkdir(parents=True, exist_ok=True)
+            self.__meta_path.write_text(json.dumps(self.__meta, indent=4), encoding="utf-8")
+
+    def acquire(self, key:str) -> SentenceTransformer:
+        "returns the model registered under key, loading it if it is not resident"
+        return self.__acquire(key, hold=False)
+
+    @contextmanager
+    def use(self, key:str) -> Iterator[SentenceTransformer]:
+        "the model is never evicted inside the block"
+        model = self.__acquire(key, hold=True)
+        try:
+            yield model
+        finally:
+            with self.__lock:
+                self.__entries[key].busy -= 1
+                self.__entries[key].uses += 1
+
+    def meta(self, key:str) -> Dict:
+        "returns size, dimension and max sequence length of the model, loading it once if it was never seen"
+        model_id = self.__entries[key].model_id
+        if model_id not in self.__meta:
+            self.acquire(key)
+        return self.__meta[model_id]
+
+    def evict(self, key:str) -> bool:
+        "evicts the model if it is resident and idle"
+        with self.__lock:
+            entry = self.__entries[key]
+            if entry.model is None or entry.busy:
+                return False
+            entry.model = None
+            entry.evictions += 1
+            self.__stats["evictions"] += 1
+        gc.collect()
+        logging.info(f"evicted \'{key}\' ({entry.bytes / 2**20:.0f}MiB)")
+        return True
+
+    def report(self) -> Dict:
+        "returns budget, resident bytes, load and eviction counters and the state of every model"
+        now = time.monotonic()
+        with self.__lock:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "resident_bytes": self.__resident(),
+                **self.__stats,
+                "models": {
+                    key: {
+                        "resident": entry.model is not None,
+                        "bytes": entry.bytes,
+                        "busy": entry.busy,
+                        "uses": entry.uses,
+                        "loads": entry.loads,
+                        "evictions": entry.evictions,
+                        "load_seconds": entry.load_seconds,
+                        "idle_seconds": now - entry.last_used if entry.last_used else None
+                    } for key, entry in self.__entries.items()
+                }
+            }
+
+
+__all__ = ["ModelManager", "ManagedModel"]
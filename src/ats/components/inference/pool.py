@@ -0,0 +1,213 @@
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Callable, Dict, List, Tuple
+from .executor import LatencyStats
+from ... import logging
+import asyncio, multiprocessing, os, threading, time
+import numpy as np
+import psutil
+
+
+def _serve(conn:Connection, functions:Dict[str, Callable[[List[str]], np.ndarray]], buffer:shared_memory.SharedMemory, initializer:Callable | None, initargs:Tuple) -> None:
+    """loop of a forked worker, runs forward passes of the inherited models until the pipe closes or None is received,
+    embeddings are written into the shared buffer of the worker and only their shape is sent back,
+    results larger than the buffer are sent through the pipe"""
+    if initializer:
+        initializer(*initargs)
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if message is None:
+            break
+        label, texts = message
+        try:
+            embeddings = np.ascontiguousarray(functions[label](texts), dtype=np.float32)
+            if embeddings.nbytes <= buffer.size:
+                np.ndarray(embeddings.shape, dtype=np.float32, buffer=buffer.buf)[...] = embeddings
+                conn.send(("shm", embeddings.shape))
+            else:
+                conn.send(("pipe", embeddings))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+    conn.close()
+    os._exit(0)
+
+
+class _Worker:
+    "parent side of one forked worker, a worker serves one forward pass at a time"
+    def __init__(self, process:multiprocessing.Process, conn:Connection, buffer:shared_memory.SharedMemory) -> None:
+        self.process = process
+        self.conn = conn
+        self.buffer = buffer
+        self.alive = True
+        self.requests = 0
+        self.failed = 0
+        self.pipe_fallbacks = 0
+
+    def call(self, label:str, texts:List[str]) -> np.ndarray:
+        "blocking round trip, runs on a dispatch thread"
+        try:
+            self.conn.send((label, texts))
+            kind, payload = self.conn.recv()
+        except (EOFError, OSError, BrokenPipeError) as e:
+            self.alive = False
+            raise RuntimeError(f"inference worker {self.process.pid} exited with code {self.process.exitcode}") from e
+        self.requests += 1
+        if kind == "shm":
+            # copied out before the worker is released, the next call overwrites the buffer
+            return np.ndarray(payload, dtype=np.float32, buffer=self.buffer.buf).copy()
+        if kind == "pipe":
+            self.pipe_fallbacks += 1
+            return payload
+        self.failed += 1
+        raise RuntimeError(payload)
+
+
+class InferencePool:
+    """pre-forked worker processes running forward passes outside the GIL of the api process,
+    workers are forked once the models are loaded so their weights are shared copy-on-write,
+    texts are sent through a pipe and embeddings come back through a shared memory buffer per worker
+
+    fork before any forward pass ran in the parent, OpenMP thread pools do not survive a fork
+
+    usage:
+            pool = InferencePool({"MINILM": model.encode}, workers=2, buffer_bytes=64 * 2**20)
+            embeddings = await pool.run("MINILM", ["text", ...])
+            pool.shutdown()
+    """
+    def __init__(self, functions:Dict[str, Callable[[List[str]], np.ndarray]], workers:int = 2, buffer_bytes:int = 64 * 2**20, initializer:Callable | None = None, initargs:Tuple = ()) -> None:
+        """
+        Args:
+            functions (Dict[str, Callable[[List[str]], np.ndarray]]): blocking forward pass of every model, inherited by the workers
+            workers (int, optional): worker processes. Defaults to 2.
+            buffer_bytes (int, optional): shared memory of every worker for returned embeddings. Defaults to 64MiB.
+            initializer (Callable | None, optional): initializer(*initargs) runs once in every worker, eg: to pin it to a cpu set. Defaults to None.
+        """
+        if workers < 1:
+            raise ValueError(f"\'workers\' must be at least 1, got {workers}")
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("inference pool needs the \'fork\' start method, not available on this platform")
+        context = multiprocessing.get_context("fork")
+        self.__workers:List[_Worker] = []
+        for _ in range(workers):
+            buffer = shared_memory.SharedMemory(create=True, size=buffer_bytes)
+            parent, child = context.Pipe()
+            process = context.Process(target=_serve, args=(child, functions, buffer, initializer, initargs), daemon=True)
+            process.start()
+            child.close()
+            self.__workers.append(_Worker(process, parent, buffer))
+        # one dispatch thread per worker waits on its pipe, the event loop never blocks
+        self.__threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pool-dispatch")
+        self.__idle:asyncio.Queue | None = None
+        self.__lock = threading.Lock()
+        self.__wait:Dict[str, LatencyStats] = {}
+        self.__run:Dict[str, LatencyStats] = {}
+        logging.info(f"forked {workers} inference workers {[worker.process.pid for worker in self.__workers]}, {buffer_bytes / 2**20:.0f}MiB shared buffer each")
+
+    @property
+    def alive(self) -> int:
+        "number of live workers"
+        return sum(worker.alive and worker.process.is_alive() for worker in self.__workers)
+
+    def __stats(self, stats:Dict[str, LatencyStats], label:str) -> LatencyStats:
+        if label not in stats:
+            stats[label] = LatencyStats()
+        return stats[label]
+
+    async def run(self, label:str, texts:List[str]) -> np.ndarray:
+        """runs the forward pass of the model 'label' on the next idle worker
+
+        Raises:
+            RuntimeError: if no worker is alive or the worker failed
+
+        Returns:
+            np.ndarray: embeddings of shape (len(texts), dimension)
+        """
+        if self.__idle is None:
+            # created lazily, the queue belongs to the loop serving requests
+            self.__idle = asyncio.Queue()
+            for worker in self.__workers:
+                self.__idle.put_nowait(worker)
+        if not self.alive:
+            raise RuntimeError("no inference worker is alive")
+        submitted = time.perf_counter()
+        worker = await self.__idle.get()
+        if not worker.alive:
+            # dead workers are only queued again once none is alive, to wake up waiting callers
+            self.__idle.put_nowait(worker)
+            raise RuntimeError("no inference worker is alive")
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.__threads, worker.call, label, texts)
+        # the worker is released once its round trip is over, not when the caller stops waiting,
+        # a cancelled caller leaves the dispatch thread talking to the worker until it answers
+        future.add_done_callback(lambda future: self.__release(worker, label, submitted, started, future))
+        return await asyncio.shield(future)
+
+    def __release(self, worker:_Worker, label:str, submitted:float, started:float, future:asyncio.Future) -> None:
+        "done callback of a dispatch, queues the worker again"
+        if not future.cancelled():
+            # retrieved so the exception of a call nobody awaits anymore is not reported as unhandled
+            future.exception()
+        with self.__lock:
+            self.__stats(self.__wait, label).observe(started - submitted)
+            self.__stats(self.__run, label).observe(time.perf_counter() - started)
+        if worker.alive:
+            self.__idle.put_nowait(worker)
+        else:
+            logging.error(f"inference worker {worker.process.pid} exited with code {worker.process.exitcode}, {self.alive} workers left")
+            if not self.alive:
+                for dead in self.__workers:
+                    self.__idle.put_nowait(dead)
+
+    def report(self) -> Dict:
+        """returns per worker requests and memory, rss counts shared weights, uss is the memory private to the worker,
+        pss splits shared pages between the processes sharing them"""
+        workers = []
+        for worker in self.__workers:
+            stats = {
+                "pid": worker.process.pid,
+                "alive": worker.alive and worker.process.is_alive(),
+                "requests": worker.requests,
+                "failed": worker.failed,
+                "pipe_fallbacks": worker.pipe_fallbacks
+            }
+            try:
+                memory = psutil.Process(worker.process.pid).memory_full_info()
+                stats.update({"rss_bytes": memory.rss, "uss_bytes": memory.uss, "pss_bytes": getattr(memory, "pss", None)})
+            except (psutil.Error, OSError):
+                pass
+            workers.append(stats)
+        with self.__lock:
+            return {
+                "workers": len(self.__workers),
+                "alive": self.alive,
+                "buffer_bytes": self.__workers[0].buffer.size if self.__workers else 0,
+                "busy": 0 if self.__idle is None else max(self.alive - self.__idle.qsize(), 0),
+                "processes": workers,
+                "wait": {label: stats.report() for label, stats in self.__wait.items()},
+                "run": {label: stats.report() for label, stats in self.__run.items()}
+            }
+
+    def shutdown(self) -> None:
+        "stops the workers and releases their shared buffers"
+        logging.info(f"shutting down {self.__class__.__name__}")
+        for worker in self.__workers:
+            try:
+                worker.conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+        for worker in self.__workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
+            worker.buffer.close()
+            worker.buffer.unlink()
+        self.__threads.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = ["InferencePool"]
@@ -0,0 +1,281 @@
+from sentence_transformers import SentenceTransformer
+from .backend import load_model, model_id
+from dataclasses import dataclass, field
+from typing import Dict
+from .executor import InferenceExecutor
+from .pool import InferencePool
+from .sidecar import RemoteEncoder, SidecarClient
+from .manager import ModelManager
+from .tuning import BatchTuner
+from .encoder import Encoder
+from .cache import EmbeddingCache
+from .store import EmbeddingStore
+from .tfidf import TfidfModel
+from .index import VectorIndex
+from ..skills import SkillTaxonomy
+from ...entity import Inference, Runtime
+from ...runtime import configure_worker
+from ...exception import CustomException
+from ...utils import get_rss
+from ... import logging
+import asyncio, time, sys
+
+
+@dataclass
+class ModelInfo:
+    name:str = field(default="")
+    backend:str = field(default="torch")
+    load_seconds:float = field(default=0.0)
+    rss_bytes:int = field(default=0)
+
+
+class ModelRegistry:
+    """process-wide owner of the sentence-transformer models used by the scorers,
+    every model is loaded once and shared by all requests, inference runs on a dedicated executor
+
+    usage:
+            registry = await ModelRegistry(InferenceConfig, RuntimeConfig)
+            model = registry.get("MINILM")
+            encoder = registry.encoder("MINILM")
+    """
+    def __init__(self, config:Inference, runtime:Runtime | None = None) -> None:
+        "if runtime is given, inference workers are pinned and their threads set from it"
+        if not isinstance(config, Inference):
+            raise TypeError(f"\'config\' must be an instance of \'{Inference}\'")
+        if runtime is not None and not isinstance(runtime, Runtime):
+            raise TypeError(f"\'runtime\' must be an instance of \'{Runtime}\'")
+        if config.POOL_ENABLED and config.MANAGER_ENABLED:
+            raise ValueError("\'POOL_ENABLED\' and \'MANAGER_ENABLED\' can not both be set, pool workers would each load their own copy of the managed models")
+        self.__config = config
+        self.__models:Dict[str, SentenceTransformer] = {}
+        self.__encoders:Dict[str, Encoder | RemoteEncoder] = {}
+        self.__info:Dict[str, ModelInfo] = {}
+        self.__runtime = runtime
+        self.__pool:InferencePool | None = None
+        self.__sidecar:SidecarClient | None = None
+        # with a manager models are loaded on first use and evicted to stay within the memory budget
+        self.__manager = ModelManager(self.__load_model, config.MANAGER_BUDGET_MB * 2**20, config.MANAGER_META_FILE_PATH) if config.MANAGER_ENABLED else None
+        self.__tuner = BatchTuner(config.TUNING_FILE_PATH, config.TUNING_CANDIDATES, config.TUNING_TOLERANCE, config.TUNING_MIN_SECONDS) if config.TUNING_ENABLED else None
+        self.__executor = InferenceExecutor(
+            config.EXECUTOR_WORKERS,
+            config.EXECUTOR_MAX_QUEUE,
+            initializer=configure_worker if runtime else None,
+            initargs=(runtime,) if runtime else ()
+        )
+        self.__cache = EmbeddingCache(config.CACHE_MAX_ENTRIES, config.CACHE_DIR_PATH if config.CACHE_SPILL else None) if config.CACHE_ENABLED else None
+        # shared corpus tf-idf of the RoBERTa tier, scorers fall back to an in-memory one when disabled
+        self.tfidf = TfidfModel(config.TFIDF_DIR_PATH, config.TFIDF_N_FEATURES) if config.TFIDF_ENABLED else None
+        # skill taxonomy of all scorers, compiled once at startup
+        self.skills = SkillTaxonomy.default()
+        # top-k index over resume embeddings of INDEX_MODEL, opened once its model is loaded
+        self.index:VectorIndex | None = None
+
+    def __await__(self):
+        return self.__main().__await__()
+
+    @property
+    def config(self) -> Inference:
+        return self.__config
+
+    @property
+    def executor(self) -> InferenceExecutor:
+        return self.__executor
+
+    @property
+    def pool(self) -> InferencePool | None:
+        return self.__pool
+
+    @property
+    def sidecar(self) -> SidecarClient | None:
+        return self.__sidecar
+
+    @property
+    def manager(self) -> ModelManager | None:
+        return self.__manager
+
+    def __load_model(self, key:str) -> SentenceTransformer:
+        return load_model(self.__config.MODELS[key], self.__config.BACKENDS.get(key, "torch"), self.__config.ONNX_DIR_PATH, self.__config.ONNX_QUANTIZATION)
+
+    def __load(self, key:str, name:str) -> None:
+        "loads a single model and records its load time and resident memory, with a manager the model is only registered"
+        try:
+            backend = self.__config.BACKENDS.get(key, "torch")
+            overlap = self.__config.CHUNKING_OVERLAP_TOKENS if self.__config.CHUNKING_ENABLED else None
+            identifier = model_id(name, backend, self.__config.ONNX_QUANTIZATION, overlap)
+            if self.__manager:
+                model = self.__manager.register(key, identifier)
+                info = ModelInfo(name=name, backend=backend)
+            else:
+                rss = get_rss()
+                start = time.perf_counter()
+                model = self.__load_model(key)
+                info = ModelInfo(
+                    name=name,
+                    backend=backend,
+                    load_seconds=time.perf_counter() - start,
+                    rss_bytes=max(get_rss() - rss, 0)
+                )
+            self.__models[key] = model
+            self.__encoders[key] = Encoder(key, model, self.__executor, model_id=identifier)
+            if self.__config.CHUNKING_ENABLED:
+                self.__encoders[key].enable_chunking(self.__config.CHUNKING_OVERLAP_TOKENS, self.__config.CHUNKING_MAX_BATCH_TOKENS)
+            if self.__cache:
+                self.__encoders[key].enable_cache(self.__cache)
+            if self.__config.STORE_ENABLED:
+                self.__encoders[key].enable_store(EmbeddingStore(self.__config.STORE_DIR_PATH, identifier, model.get_sentence_embedding_dimension(), self.__config.STORE_DTYPE))
+            if self.__config.BATCHING_ENABLED:
+                self.__encoders[key].enable_batching(self.__config.BATCHING_WINDOW_MS, self.__config.BATCHING_MAX_BATCH_SIZE)
+            self.__info[key] = info
+            if self.__manager:
+                logging.info(f"registered \'{name}\' ({backend}) as \'{key}\', loaded on first use")
+            else:
+                logging.info(f"loaded \'{name}\' ({backend}) as \'{key}\' in {info.load_seconds:.2f}s, rss +{info.rss_bytes / 2**20:.1f}MiB")
+        except Exception as e:
+            e = CustomException(e, sys)
+            logging.error(e)
+            raise e
+
+    def get(self, key:str) -> SentenceTransformer:
+        """returns the loaded model for the given key
+
+        Args:
+            key (str): key of the model inside config, eg: MINILM, MPNET, ROBERTA
+
+        Raises:
+            KeyError: if model is not loaded
+
+        Returns:
+            SentenceTransformer: shared model instance
+        """
+        if key not in self.__models:
+            raise KeyError(f"model \'{key}\' is not loaded, available models: {list(self.__models)}")
+        return self.__models[key]
+
+    def encoder(self, key:str) -> Encoder | RemoteEncoder:
+        """returns the encoder running the given model on the inference executor
+
+        Args:
+            key (str): key of the model inside config, eg: MINILM, MPNET, ROBERTA
+
+        Raises:
+            KeyError: if model is not loaded
+
+        Returns:
+            Encoder | RemoteEncoder: shared encoder instance, a client of the model server in sidecar mode
+        """
+        if key not in self.__encoders:
+            raise KeyError(f"model '{key}' is not loaded, available models: {list(self.__encoders)}")
+        return self.__encoders[key]
+
+    def report(self) -> Dict:
+        "returns load time and resident memory of every loaded model, inference executor, worker pool, sidecar client, model manager, tuned batch sizes, micro-batching, chunking, cache, store, tf-idf, skill taxonomy and vector index stats"
+        return {
+            "rss_bytes": get_rss(),
+            "models": {key: dict(vars(info)) for key, info in self.__info.items()},
+            "executor": self.__executor.report(),
+            "pool": self.__pool.report() if self.__pool else None,
+            "sidecar": self.__sidecar.report() if self.__sidecar else None,
+            "manager": self.__manager.report() if self.__manager else None,
+            "batch_sizes": {key: encoder.batch_size for key, encoder in self.__encoders.items()},
+            "batching": {key: encoder.batcher.report() for key, encoder in self.__encoders.items() if encoder.batcher},
+            "chunking": {key: encoder.chunker.report() for key, encoder in self.__encoders.items() if encoder.chunker},
+            "cache": self.__cache.report() if self.__cache else None,
+            "store": {key: encoder.store.report() for key, encoder in self.__encoders.items() if encoder.store},
+            "tfidf": self.tfidf.report() if self.tfidf else None,
+            "skills": self.skills.report(),
+            "index": self.index.report() if self.index else None
+        }
+
+    def close(self) -> None:
+        "releases the inference executor, worker pool and sidecar connections and flushes the tf-idf model"
+        self.__executor.shutdown()
+        if self.__pool:
+            self.__pool.shutdown()
+        if self.__sidecar:
+            self.__sidecar.close()
+        if self.tfidf:
+            self.tfidf.flush()
+
+    async def tune(self, measure:bool = True, force:bool = False) -> Dict[str, Dict]:
+        """applies the tuned batch size of every model, models never tuned under the current model and thread config
+        are measured when measure is True, force measures every model again
+
+        Returns:
+            Dict[str, Dict]: tuning result of every model with a batch size
+        """
+        results = {}
+        if self.__tuner is None or self.__sidecar:
+            return results
+        for key, encoder in self.__encoders.items():
+            # looked up and measured on an inference worker, the thread whose settings the batch size is tuned for
+            result = None if force else await self.__executor.run(self.__tuner.lookup, encoder.model_id, label="tuning")
+            if result is None and measure:
+                result = await self.__executor.run(self.__tuner.tune, encoder.model, encoder.model_id, label="tuning")
+            if result is None:
+                logging.info(f"batch size of \'{key}\' is not tuned for this host and thread config, run \'python -m src.ats.tools.tune_batch\'")
+                continue
+            encoder.set_batch_size(result["batch_size"])
+            results[key] = result
+        return results
+
+    async def __connect(self) -> None:
+        "uses the models of the model server instead of loading them, waits up to SIDECAR_TIMEOUT_S for the server to come up"
+        client = SidecarClient(self.__config.SIDECAR_SOCKET_PATH, self.__config.SIDECAR_CONNECTIONS, self.__config.SIDECAR_TIMEOUT_S)
+        deadline = time.monotonic() + self.__config.SIDECAR_TIMEOUT_S
+        while True:
+            try:
+                models = await client.info()
+                break
+            except (ConnectionError, FileNotFoundError) as e:
+                if time.monotonic() > deadline:
+                    e = CustomException(e, sys)
+                    logging.error(e)
+                    raise e
+                logging.info(f"waiting for model server at '{self.__config.SIDECAR_SOCKET_PATH.as_posix()}'")
+                await asyncio.sleep(1)
+        for key in self.__config.MODELS:
+            if key not in models:
+                raise KeyError(f"model '{key}' is not served by the model server, served models: {list(models)}")
+            self.__encoders[key] = RemoteEncoder(key, client, models[key]["model_id"], models[key]["dimension"])
+            self.__info[key] = ModelInfo(name=models[key]["model_id"], backend="sidecar")
+        self.__sidecar = client
+        logging.info(f"using models {list(models)} of the model server at '{self.__config.SIDECAR_SOCKET_PATH.as_posix()}'")
+
+    async def __main(self) -> "ModelRegistry":
+        logging.info("In ModelRegistry")
+        loop = asyncio.get_running_loop()
+        if self.__config.SIDECAR_ENABLED and self.__sidecar is None:
+            await self.__connect()
+        # models are loaded one after another so that resident memory can be attributed to each one
+        for key, name in self.__config.MODELS.items():
+            if key not in self.__encoders:
+                await loop.run_in_executor(None, self.__load, key, name)
+        # measuring runs forward passes, not before forking the pool, nor loading every model of the manager
+        await self.tune(measure=self.__config.TUNING_ON_STARTUP and not self.__config.POOL_ENABLED and self.__manager is None)
+        # forked on the loop thread once every model is loaded and before any forward pass ran
+        if self.__config.POOL_ENABLED and self.__pool is None and self.__sidecar is None:
+            self.__pool = InferencePool(
+                {key: encoder.forward for key, encoder in self.__encoders.items()},
+                self.__config.POOL_WORKERS,
+                self.__config.POOL_BUFFER_MB * 2**20,
+                initializer=configure_worker if self.__runtime else None,
+                initargs=(self.__runtime,) if self.__runtime else ()
+            )
+            for encoder in self.__encoders.values():
+                encoder.enable_pool(self.__pool)
+        if self.__config.INDEX_ENABLED and self.index is None:
+            encoder = self.encoder(self.__config.INDEX_MODEL)
+            self.index = await loop.run_in_executor(None, lambda: VectorIndex(
+                self.__config.INDEX_DIR_PATH,
+                encoder.model_id,
+                encoder.dimension,
+                self.__config.INDEX_MODE,
+                self.__config.INDEX_NLIST,
+                self.__config.INDEX_NPROBE,
+                self.__config.INDEX_MIN_TRAIN
+            ))
+        logging.info("Out ModelRegistry")
+        return self
+
+
+__all__ = ["ModelRegistry", "ModelInfo"]
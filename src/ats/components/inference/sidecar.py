@@ -0,0 +1,290 @@
+from pathlib import Path
+from typing import Dict, List, Tuple
+from .executor import LatencyStats
+from ...exception import CustomException
+from ... import logging
+import asyncio, json, os, struct, sys, time
+import numpy as np
+
+
+# frames are a little endian u32 length followed by the body
+#   request body:   u8 op, for ENCODE: u8 flags, u8 key length, key, u32 texts, (u32 length, utf-8 text) * texts,
+#                   with FLAG_SECTIONS (u16 length, utf-8 section name) * texts
+#   response body:  u8 status, for ENCODE: u32 rows, u32 dimension, float32 rows * dimension,
+#                   for INFO: utf-8 json, for ERROR: utf-8 message
+OP_INFO = 1
+OP_ENCODE = 2
+FLAG_CACHE = 1
+FLAG_SECTIONS = 2
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+LENGTH = struct.Struct("<I")
+MATRIX = struct.Struct("<II")
+
+
+async def read_frame(reader:asyncio.StreamReader) -> bytes:
+    (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    return await reader.readexactly(length)
+
+
+def write_frame(writer:asyncio.StreamWriter, *parts:bytes) -> None:
+    writer.write(LENGTH.pack(sum(len(part) for part in parts)))
+    writer.writelines(parts)
+
+
+def pack_encode(key:str, texts:List[str], cache:bool = False, sections:List[str] | None = None) -> bytes:
+    "request body of an encode call"
+    flags = (FLAG_CACHE if cache else 0) | (FLAG_SECTIONS if sections is not None else 0)
+    key = key.encode()
+    parts = [struct.pack("<BBB", OP_ENCODE, flags, len(key)), key, LENGTH.pack(len(texts))]
+    for text in texts:
+        text = text.encode()
+        parts += [LENGTH.pack(len(text)), text]
+    for section in sections or []:
+        section = section.encode()
+        parts += [struct.pack("<H", len(section)), section]
+    return b"".join(parts)
+
+
+def unpack_encode(body:bytes) -> Tuple[str, List[str], bool, List[str] | None]:
+    "returns key, texts, cache flag and section names of an encode request body"
+    _, flags, key_length = struct.unpack_from("<BBB", body)
+    offset = 3
+    key = body[offset:offset + key_length].decode()
+    offset += key_length
+    (count,) = LENGTH.unpack_from(body, offset)
+    offset += LENGTH.size
+    texts = []
+    for _ in range(count):
+        (length,) = LENGTH.unpack_from(body, offset)
+        offset += LENGTH.size
+        texts.append(body[offset:offset + length].decode())
+        offset += length
+    sections = None
+    if flags & FLAG_SECTIONS:
+        sections = []
+        for _ in range(count):
+            (length,) = struct.unpack_from("<H", body, offset)
+            offset += 2
+            sections.append(body[offset:offset + length].decode())
+            offset += length
+    return key, texts, bool(flags & FLAG_CACHE), sections
+
+
+class ModelServer:
+    """serves the encoders of a model registry over a unix domain socket, so several api worker processes
+    share one copy of the models, caches and stores, concurrent requests of all clients are merged
+    by the micro-batcher of every encoder
+
+    usage:
+            registry = await ModelRegistry(InferenceConfig, RuntimeConfig)
+            server = ModelServer(registry, Path("artifacts/inference/models.sock"))
+            await server.serve_forever()
+    """
+    def __init__(self, registry, socket_path:Path) -> None:
+        "registry is a loaded ModelRegistry, it must not be a sidecar client itself"
+        self.__registry = registry
+        self.socket_path = Path(socket_path)
+        self.__server:asyncio.AbstractServer | None = None
+        self.__clients = 0
+        self.__stats = {"requests": 0, "errors": 0, "texts": 0, "bytes_in": 0, "bytes_out": 0}
+        self.__latency:Dict[str, LatencyStats] = {}
+
+    def info(self) -> Dict:
+        "model id and dimension of every encoder"
+        return {
+            key: {"model_id": self.__registry.encoder(key).model_id, "dimension": self.__registry.encoder(key).dimension}
+            for key in self.__registry.config.MODELS
+        }
+
+    async def __handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        self.__clients += 1
+        try:
+            while True:
+                try:
+                    body = await read_frame(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                start = time.perf_counter()
+                self.__stats["requests"] += 1
+                self.__stats["bytes_in"] += len(body)
+                try:
+                    if body[0] == OP_INFO:
+                        parts = [bytes([STATUS_OK]), json.dumps(self.info()).encode()]
+                        label = "info"
+                    elif body[0] == OP_ENCODE:
+                        key, texts, cache, sections = unpack_encode(body)
+                        embeddings = await self.__registry.encoder(key).encode(texts, cache=cache, sections=sections)
+                        embeddings = np.ascontiguousarray(embeddings, dtype="<f4").reshape(len(texts), -1)
+                        parts = [bytes([STATUS_OK]), MATRIX.pack(*embeddings.shape), embeddings.tobytes()]
+                        self.__stats["texts"] += len(texts)
+                        label = key
+                    else:
+                        raise ValueError(f"unknown op {body[0]}")
+                except Exception as e:
+                    self.__stats["errors"] += 1
+                    logging.error(str(CustomException(e, sys)))
+                    parts = [bytes([STATUS_ERROR]), str(e).encode()]
+                    label = "error"
+                write_frame(writer, *parts)
+                await writer.drain()
+                self.__stats["bytes_out"] += sum(len(part) for part in parts)
+                self.__latency.setdefault(label, LatencyStats()).observe(time.perf_counter() - start)
+        finally:
+            self.__clients -= 1
+            writer.close()
+
+    async def start(self) -> None:
+        "listens on the socket, a stale socket file of a previous run is replaced"
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        self.__server = await asyncio.start_unix_server(self.__handle, path=self.socket_path.as_posix())
+        os.chmod(self.socket_path, 0o600)
+        logging.info(f"model server listening on \'{self.socket_path.as_posix()}\' for {list(self.info())}")
+
+    async def serve_forever(self) -> None:
+        if self.__server is None:
+            await self.start()
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    def report(self) -> Dict:
+        "returns connected clients, request counters and per model latency"
+        return {
+            "socket": self.socket_path.as_posix(),
+            "clients": self.__clients,
+            **self.__stats,
+            "latency": {label: stats.report() for label, stats in self.__latency.items()}
+        }
+
+    def close(self) -> None:
+        if self.__server:
+            self.__server.close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class SidecarClient:
+    """client of a ModelServer, keeps up to 'connections' open connections and sends one request per connection at a time
+
+    usage:
+            client = SidecarClient(Path("artifacts/inference/models.sock"))
+            models = await client.info()
+            embeddings = await client.encode("MINILM", ["text", ...])
+    """
+    def __init__(self, socket_path:Path, connections:int = 4, timeout:float = 60) -> None:
+        if connections < 1:
+            raise ValueError(f"\'connections\' must be at least 1, got {connections}")
+        self.socket_path = Path(socket_path)
+        self.__connections = connections
+        self.__timeout = timeout
+        # a request holds a slot for its whole round trip, a slot freed by a failed or cancelled request lets a waiter reconnect
+        self.__slots:asyncio.Semaphore | None = None
+        self.__idle:List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.__open = 0
+        self.__stats = {"requests": 0, "errors": 0, "reconnects": 0, "bytes_out": 0, "bytes_in": 0}
+        self.__latency:Dict[str, LatencyStats] = {}
+
+    async def __request(self, body:bytes, label:str) -> bytes:
+        start = time.perf_counter()
+        self.__stats["requests"] += 1
+        if self.__slots is None:
+            self.__slots = asyncio.Semaphore(self.__connections)
+        async with self.__slots:
+            if self.__idle:
+                reader, writer = self.__idle.pop()
+            else:
+                reader, writer = await asyncio.open_unix_connection(self.socket_path.as_posix())
+                self.__open += 1
+            answered = False
+            try:
+                write_frame(writer, body)
+                await writer.drain()
+                response = await asyncio.wait_for(read_frame(reader), self.__timeout)
+                answered = True
+            except (asyncio.IncompleteReadError, ConnectionError, asyncio.TimeoutError) as e:
+                self.__stats["errors"] += 1
+                raise ConnectionError(f"model server at \'{self.socket_path.as_posix()}\' did not answer, {type(e).__name__}: {e}") from e
+            finally:
+                if answered:
+                    self.__idle.append((reader, writer))
+                else:
+                    # failed or cancelled mid request, the connection may hold a partial frame, the next request opens a new one
+                    self.__open -= 1
+                    self.__stats["reconnects"] += 1
+                    writer.close()
+        self.__stats["bytes_out"] += len(body)
+        self.__stats["bytes_in"] += len(response)
+        self.__latency.setdefault(label, LatencyStats()).observe(time.perf_counter() - start)
+        if response[0] != STATUS_OK:
+            self.__stats["errors"] += 1
+            raise RuntimeError(f"model server error, {response[1:].decode()}")
+        return response[1:]
+
+    async def info(self) -> Dict[str, Dict]:
+        "model id and dimension of every model served"
+        return json.loads(await self.__request(bytes([OP_INFO]), "info"))
+
+    async def encode(self, key:str, texts:List[str], cache:bool = False, sections:List[str] | None = None) -> np.ndarray:
+        """encodes texts with the model 'key' of the server, cache and sections are looked up in the caches and stores of the server
+
+        Returns:
+            np.ndarray: embeddings of shape (len(texts), dimension)
+        """
+        response = await self.__request(pack_encode(key, texts, cache, sections), key)
+        rows, dimension = MATRIX.unpack_from(response)
+        return np.frombuffer(response, dtype="<f4", count=rows * dimension, offset=MATRIX.size).reshape(rows, dimension).astype(np.float32)
+
+    def report(self) -> Dict:
+        "returns open connections, request counters and per model round trip latency"
+        return {
+            "socket": self.socket_path.as_posix(),
+            "connections": self.__open,
+            **self.__stats,
+            "latency": {label: stats.report() for label, stats in self.__latency.items()}
+        }
+
+    def close(self) -> None:
+        while self.__idle:
+            _, writer = self.__idle.pop()
+            writer.close()
+            self.__open -= 1
+
+
+class RemoteEncoder:
+    """encoder of a model served by a ModelServer, same interface as Encoder for the scorers,
+    chunking, batching, caching and stores run on the server
+
+    usage:
+            encoder = RemoteEncoder("MINILM", client, model_id, dimension)
+            embeddings = await encoder.encode(["text", ...])
+    """
+    def __init__(self, name:str, client:SidecarClient, model_id:str, dimension:int) -> None:
+        self.name = name
+        self.client = client
+        self.model_id = model_id
+        self.__dimension = dimension
+        # no local model, the attributes scorers and reports look at are kept empty
+        self.model = None
+        self.executor = None
+        self.batcher = None
+        self.chunker = None
+        self.cache = None
+        self.store = None
+        self.pool = None
+        self.batch_size = None
+
+    @property
+    def dimension(self) -> int:
+        return self.__dimension
+
+    async def encode(self, texts:List[str], cache:bool = False, sections:List[str] | None = None) -> np.ndarray:
+        "encodes all texts in a single request to the server"
+        if sections is not None and len(sections) != len(texts):
+            raise ValueError(f"got {len(sections)} section names for {len(texts)} texts")
+        if not texts:
+            return np.empty((0, self.__dimension), dtype=np.float32)
+        return await self.client.encode(self.name, texts, cache, sections)
+
+
+__all__ = ["ModelServer", "SidecarClient", "RemoteEncoder"]
@@ -0,0 +1,120 @@
+from pathlib import Path
+from typing import Dict, List, Tuple
+from ...exception import CustomException
+from ...utils import get_hash
+from ... import logging
+import json, sys
+import numpy as np
+
+
+class EmbeddingStore:
+    """persistent, append-only embedding store of one model keyed by (text hash, section name),
+    vectors live in a flat binary file read through a memory map so a warm restart only loads the index
+
+    layout of <root_dir>/<model>/:
+            meta.json       model, dimension and dtype of the vectors
+            vectors.bin     rows of 'dimension' values of 'dtype', only ever appended to
+            index.tsv       one '<text hash>\\t<section>\\t<row>' line per stored vector
+
+    usage:
+            store = EmbeddingStore(Path("artifacts/inference/embedding_store"), "sentence-transformers/all-mpnet-base-v2", 768)
+            embedding = store.get(text, "skills")
+            store.put([text, ...], ["skills", ...], embeddings)
+    """
+    def __init__(self, root_dir:Path, model:str, dimension:int, dtype:str = "float32") -> None:
+        if dtype not in ("float16", "float32"):
+            raise ValueError(f"\'dtype\' must be one of float16 or float32, got {dtype}")
+        self.model = model
+        self.dimension = dimension
+        self.dtype = np.dtype(dtype)
+        self.dir = root_dir.joinpath(model.replace("/", "__"))
+        self.__vectors_path = self.dir.joinpath("vectors.bin")
+        self.__index_path = self.dir.joinpath("index.tsv")
+        self.__row_bytes = self.dimension * self.dtype.itemsize
+        self.__index:Dict[Tuple[str, str], int] = {}
+        self.__rows = 0
+        self.__view:np.memmap | None = None
+        self.__stats = {"hits": 0, "misses": 0, "writes": 0}
+        self.__open()
+
+    def __open(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        meta = {"model": self.model, "dimension": self.dimension, "dtype": self.dtype.name}
+        meta_path = self.dir.joinpath("meta.json")
+        if meta_path.is_file() and json.loads(meta_path.read_text()) != meta:
+            logging.warning(f"embedding store \'{self.dir.as_posix()}\' was written with different settings, starting empty")
+            self.__vectors_path.unlink(missing_ok=True)
+            self.__index_path.unlink(missing_ok=True)
+        meta_path.write_text(json.dumps(meta))
+
+        # a write interrupted mid row leaves a partial row at the end, drop it
+        self.__vectors_path.touch()
+        size = self.__vectors_path.stat().st_size
+        self.__rows = size // self.__row_bytes
+        if size != self.__rows * self.__row_bytes:
+            with open(self.__vectors_path, "r+b") as file:
+                file.truncate(self.__rows * self.__row_bytes)
+
+        if self.__index_path.is_file():
+            with open(self.__index_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) == 3 and parts[2].isdigit() and int(parts[2]) < self.__rows:
+                        self.__index[(parts[0], parts[1])] = int(parts[2])
+        logging.info(f"opened embedding store \'{self.dir.as_posix()}\' with {len(self.__index)} entries")
+
+    def __vectors(self) -> np.memmap:
+        # re-map after appends, the map only covers rows present when it was created
+        if self.__view is None or self.__view.shape[0] != self.__rows:
+            self.__view = np.memmap(self.__vectors_path, dtype=self.dtype, mode="r", shape=(self.__rows, self.dimension))
+        return self.__view
+
+    def get(self, text:str, section:str) -> np.ndarray | None:
+        """returns stored float32 embedding of the text under the section or None"""
+        row = self.__index.get((get_hash(text), section))
+        if row is None:
+            self.__stats["misses"] += 1
+            return None
+        self.__stats["hits"] += 1
+        return np.array(self.__vectors()[row], dtype=np.float32)
+
+    def put(self, texts:List[str], sections:List[str], embeddings:np.ndarray) -> None:
+        """appends embeddings of texts not stored yet, vectors are written before the index
+        so an interrupted write never leaves an index entry without its vector"""
+        keys, rows = {}, []
+        for text, section, embedding in zip(texts, sections, embeddings):
+            key = (get_hash(text), section)
+            if key in self.__index or key in keys:
+                continue
+            keys[key] = len(rows)
+            rows.append(embedding)
+        if not keys:
+            return
+        try:
+            with open(self.__vectors_path, "ab") as file:
+                file.write(np.asarray(rows, dtype=self.dtype).tobytes())
+            with open(self.__index_path, "a", encoding="utf-8") as file:
+                file.writelines(f"{digest}\t{section}\t{self.__rows + i}\n" for (digest, section), i in keys.items())
+        except Exception as e:
+            logging.error(str(CustomException(e, sys)))
+            # roll back rows that were written without their index entries
+            with open(self.__vectors_path, "r+b") as file:
+                file.truncate(self.__rows * self.__row_bytes)
+            return
+        for key, i in keys.items():
+            self.__index[key] = self.__rows + i
+        self.__rows += len(keys)
+        self.__stats["writes"] += len(keys)
+
+    def report(self) -> Dict:
+        "returns size and hit/miss counters"
+        return {
+            "dir": self.dir.as_posix(),
+            "dtype": self.dtype.name,
+            "entries": len(self.__index),
+            "bytes": self.__rows * self.__row_bytes,
+            **self.__stats
+        }
+
+
+__all__ = ["EmbeddingStore"]
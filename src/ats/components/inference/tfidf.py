@@ -0,0 +1,132 @@
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from scipy.sparse import csr_matrix
+from pathlib import Path
+from typing import Dict, List, Set
+from ...exception import CustomException
+from ...utils import get_hash
+from ... import logging
+import json, sys, threading
+import numpy as np
+
+
+class TfidfModel:
+    """TF-IDF of 1-3 grams over a hashed vocabulary, document frequencies are counted incrementally over every
+    distinct resume and job description text seen, so the IDF reflects the corpus instead of a single resume/job pair
+    and nothing is refitted per request, the vocabulary needs no fitting as terms are hashed into n_features columns
+
+    weights follow sklearn's TfidfVectorizer: raw term counts times smooth idf, ln((1 + documents) / (1 + df)) + 1, l2 normalized rows
+
+    layout of <root_dir>/<version>/, version is a hash of the vectorizer settings:
+            meta.json       vectorizer settings
+            df.bin          int32 document frequency of every hashed column, updated in place through a memory map
+            docs.txt        one hash per counted document
+
+    documents are only counted by update, similarity reads the corpus as it is so a score does not depend on
+    the texts being scored, update and transform hold a lock as executor threads share the model
+
+    usage:
+            tfidf = TfidfModel(Path("artifacts/inference/tfidf"))
+            similarities = tfidf.similarity(resume_texts, job_text)
+            tfidf.update([*resume_texts, job_text])         # scored texts join the corpus afterwards
+    """
+    def __init__(self, root_dir:Path | None = None, n_features:int = 2**20, ngram_range:tuple = (1, 3)) -> None:
+        "if root_dir is None, document frequencies are kept in memory only"
+        self.n_features = n_features
+        self.__vectorizer = HashingVectorizer(n_features=n_features, ngram_range=ngram_range, stop_words="english", alternate_sign=False, norm=None)
+        self.__settings = {"n_features": n_features, "ngram_range": list(ngram_range), "stop_words": "english", "weighting": "smooth-idf-l2"}
+        self.version = get_hash(json.dumps(self.__settings, sort_keys=True))[:16]
+        self.dir = root_dir.joinpath(self.version) if root_dir else None
+        self.__docs:Set[str] = set()
+        self.__df:np.ndarray = np.zeros(n_features, dtype=np.int32)
+        self.__stats = {"updates": 0, "transforms": 0}
+        self.__lock = threading.Lock()
+        if self.dir:
+            self.__open()
+
+    def __open(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.dir.joinpath("meta.json").write_text(json.dumps(self.__settings))
+        df_path = self.dir.joinpath("df.bin")
+        size = self.n_features * np.dtype(np.int32).itemsize
+        if not df_path.is_file() or df_path.stat().st_size != size:
+            with open(df_path, "wb") as file:
+                file.truncate(size)
+        self.__df = np.memmap(df_path, dtype=np.int32, mode="r+", shape=(self.n_features,))
+        docs_path = self.dir.joinpath("docs.txt")
+        if docs_path.is_file():
+            with open(docs_path, "r", encoding="utf-8") as file:
+                self.__docs = {line.strip() for line in file if line.strip()}
+        logging.info(f"opened tf-idf model \'{self.dir.as_posix()}\' with {len(self.__docs)} documents")
+
+    @property
+    def documents(self) -> int:
+        return len(self.__docs)
+
+    @property
+    def generation(self) -> int:
+        """corpus snapshot the idf belongs to, advances every time the number of documents doubles,
+        part of the scorer version so cached results are recomputed once the idf has drifted"""
+        return (len(self.__docs) + 1).bit_length()
+
+    def update(self, texts:List[str]) -> int:
+        """counts document frequencies of the texts not counted before
+
+        Returns:
+            int: number of new documents
+        """
+        with self.__lock:
+            new = {}
+            for text in texts:
+                digest = get_hash(text)
+                if digest not in self.__docs and digest not in new:
+                    new[digest] = text
+            if not new:
+                return 0
+            matrix = self.__vectorizer.transform(list(new.values()))
+            # columns are unique within a row, so every index is one document containing the term
+            np.add.at(self.__df, matrix.indices, 1)
+            self.__docs.update(new)
+            if self.dir:
+                try:
+                    # frequencies reach the disk before their documents are recorded as counted
+                    self.flush()
+                    with open(self.dir.joinpath("docs.txt"), "a", encoding="utf-8") as file:
+                        file.writelines(f"{digest}\n" for digest in new)
+                except Exception as e:
+                    logging.error(str(CustomException(e, sys)))
+            self.__stats["updates"] += len(new)
+            return len(new)
+
+    def transform(self, texts:List[str]) -> csr_matrix:
+        "returns l2 normalized tf-idf rows of the texts as one sparse matrix"
+        matrix = self.__vectorizer.transform(texts).astype(np.float64)
+        with self.__lock:
+            matrix.data *= np.log((1 + len(self.__docs)) / (1 + self.__df[matrix.indices])) + 1
+            self.__stats["transforms"] += len(texts)
+        return normalize(matrix)
+
+    def similarity(self, texts:List[str], query:str) -> np.ndarray:
+        """cosine similarity of every text against the query with one sparse matrix product,
+        weighted by the idf of the corpus counted so far"""
+        matrix = self.transform([*texts, query])
+        return np.asarray((matrix[:-1] @ matrix[-1].T).todense()).ravel()
+
+    def flush(self) -> None:
+        "writes pending document frequency changes to disk"
+        if isinstance(self.__df, np.memmap):
+            self.__df.flush()
+
+    def report(self) -> Dict:
+        "returns corpus size and counters"
+        return {
+            "dir": self.dir.as_posix() if self.dir else None,
+            "version": self.version,
+            "generation": self.generation,
+            "n_features": self.n_features,
+            "documents": len(self.__docs),
+            **self.__stats
+        }
+
+
+__all__ = ["TfidfModel"]
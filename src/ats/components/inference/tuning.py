@@ -0,0 +1,143 @@
+from sentence_transformers import SentenceTransformer
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+from ...utils import get_hash
+from ... import logging
+import json, os, platform, random, threading, time
+
+
+# vocabulary of the synthetic texts, resume like words so tokenizers split them as they split resumes
+WORDS = (
+    "python", "developer", "experience", "years", "managed", "team", "cloud", "data", "pipelines", "built",
+    "machine", "learning", "models", "production", "services", "api", "design", "kubernetes", "analytics", "sql",
+    "led", "migration", "improved", "latency", "customers", "engineering", "bachelor", "degree", "university", "skills"
+)
+
+
+def cpu_model() -> str:
+    "model name of the cpu, empty when it can not be read"
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def host_profile() -> Dict:
+    """cpu and effective thread settings of the calling thread, a batch size is only reused under the same profile,
+    call it from the thread running the forward passes (torch intra-op threads are set per inference worker)"""
+    try:
+        import torch
+        threads = torch.get_num_threads()
+    except ImportError:
+        threads = None
+    return {
+        "machine": platform.machine(),
+        "cpu": cpu_model(),
+        "cpus": os.cpu_count(),
+        "affinity": len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None,
+        "torch_threads": threads,
+        "omp_threads": os.environ.get("OMP_NUM_THREADS"),
+        "mkl_threads": os.environ.get("MKL_NUM_THREADS")
+    }
+
+
+def sample_texts(count:int, words:int, seed:int = 0) -> List[str]:
+    "deterministic texts of the given number of words"
+    generator = random.Random(seed)
+    return [" ".join(generator.choices(WORDS, k=words)) for _ in range(count)]
+
+
+class BatchTuner:
+    """measures encode throughput of a model for every candidate batch size on the current host and picks the knee,
+    the smallest batch size within tolerance of the best throughput, larger batches only add latency and memory
+
+    results are persisted in path keyed by model id and host profile (cpu, cpu set and thread counts),
+    a new model or thread config is tuned again, a known one is never measured twice
+
+    usage:
+            tuner = BatchTuner(Path("artifacts/inference/batch_sizes.json"), [1, 2, 4, 8, 16, 32, 64])
+            result = tuner.lookup(model_id) or tuner.tune(model, model_id)   # on the inference worker thread
+            encoder.set_batch_size(result["batch_size"])
+    """
+    def __init__(self, path:Path, candidates:List[int], tolerance:float = 0.05, min_seconds:float = 0.5) -> None:
+        """
+        Args:
+            path (Path): json file holding the tuned batch sizes
+            candidates (List[int]): batch sizes to measure, in increasing order
+            tolerance (float, optional): share of the best throughput the chosen batch size may give up. Defaults to 0.05.
+            min_seconds (float, optional): minimum time every candidate is measured for. Defaults to 0.5.
+        """
+        if not candidates or any(size < 1 for size in candidates):
+            raise ValueError(f"\'candidates\' must be positive batch sizes, got {candidates}")
+        if not 0 <= tolerance < 1:
+            raise ValueError(f"\'tolerance\' must be in [0, 1), got {tolerance}")
+        self.path = path
+        self.candidates = sorted(set(candidates))
+        self.tolerance = tolerance
+        self.min_seconds = min_seconds
+        self.__lock = threading.Lock()
+        self.__results:Dict[str, Dict] = {}
+        if path.is_file():
+            with open(path, encoding="utf-8") as file:
+                self.__results = json.load(file)
+
+    @staticmethod
+    def key(model_id:str, profile:Dict) -> str:
+        return get_hash(json.dumps({"model_id": model_id, **profile}, sort_keys=True))[:16]
+
+    def lookup(self, model_id:str) -> Dict | None:
+        "returns the persisted result of the model under the profile of the calling thread, None if it was never tuned"
+        with self.__lock:
+            return self.__results.get(self.key(model_id, host_profile()))
+
+    def __throughput(self, model:SentenceTransformer, texts:List[str], batch_size:int) -> float:
+        "texts per second, batches are repeated until min_seconds elapsed"
+        model.encode(texts[:batch_size], batch_size=batch_size)
+        encoded, start = 0, time.perf_counter()
+        while True:
+            model.encode(texts[:batch_size], batch_size=batch_size)
+            encoded += batch_size
+            elapsed = time.perf_counter() - start
+            if elapsed >= self.min_seconds:
+                return encoded / elapsed
+
+    def tune(self, model:SentenceTransformer, model_id:str) -> Dict:
+        """measures every candidate batch size, blocking, run it on the thread that runs the forward passes of the model
+
+        Returns:
+            Dict: chosen batch size, throughput of every measured candidate and the host profile
+        """
+        profile = host_profile()
+        # half the max sequence length, about the length of a resume section or job description window
+        texts = sample_texts(max(self.candidates), max(getattr(model, "max_seq_length", 256) // 2, 8))
+        throughput:Dict[int, float] = {}
+        best, stalled = 0.0, 0
+        for size in self.candidates:
+            throughput[size] = self.__throughput(model, texts, size)
+            stalled = 0 if throughput[size] > best * (1 + self.tolerance) else stalled + 1
+            best = max(best, throughput[size])
+            # past the knee, two larger batch sizes in a row did not raise throughput beyond the tolerance
+            if stalled == 2:
+                break
+        batch_size = min(size for size, value in throughput.items() if value >= (1 - self.tolerance) * best)
+        result = {
+            "model_id": model_id,
+            "batch_size": batch_size,
+            "throughput": {str(size): value for size, value in throughput.items()},
+            "profile": profile,
+            "timestamp": datetime.now().isoformat(timespec="seconds")
+        }
+        with self.__lock:
+            self.__results[self.key(model_id, profile)] = result
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.__results, indent=4), encoding="utf-8")
+        logging.info(f"tuned batch size of \'{model_id}\' to {batch_size}, texts/s {({size: round(value, 1) for size, value in throughput.items()})}")
+        return result
+
+
+__all__ = ["BatchTuner", "host_profile"]
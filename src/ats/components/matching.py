@@ -0,0 +1,95 @@
+from .. import logging
+from ..entity import Scoring
+from ..components.schema import *
+from .inference import ModelRegistry
+from .scorers import JobCatalog, ResumeScorer, ResumeTextView, ScoringProfile, TierCosts
+from ..exception import CustomException
+from ..utils import awrite_json
+from typing import Dict, List
+import asyncio, sys, time
+
+
+class MatchingComponents:
+    def __init__(self, config:Scoring, resume_data:Dict[str, ResumeTextView], info:Dict[str, FileInfo], registry:ModelRegistry, catalog:JobCatalog, top_n:int = 5, profile:ScoringProfile | None = None, costs:TierCosts | None = None) -> None:
+        """matches every resume against all jobs of the catalog with one matrix product and runs the cascade
+        only for the top_n closest jobs of every resume
+        if profile is None, the default profile of config is used
+        if costs is None, tier latencies are measured for this execution only"""
+        if top_n < 1:
+            raise ValueError(f"\'top_n\' must be at least 1, got {top_n}")
+        self.__config = config
+        self.__resume_data = resume_data
+        self.__info = info
+        self.__registry = registry
+        self.__catalog = catalog
+        self.__top_n = top_n
+        self.__profile = profile or ScoringProfile.resolve(config.PROFILES, config.DEFAULT_PROFILE)
+        self.__costs = costs
+
+    def __await__(self):
+        return self.__main().__await__()
+
+    async def __match(self) -> Dict[str, List[Dict]]:
+        names, resumes = [], []
+        for name, info in self.__info.items():
+            if info.status and name in self.__resume_data:
+                resumes.append(self.__resume_data[name])
+                names.append(name)
+        start = time.perf_counter()
+        hits = await self.__catalog.search(resumes, self.__top_n)
+        logging.info(f"{len(resumes)} resumes searched against {len(self.__catalog)} catalog jobs in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        # resumes grouped by job, the cascade runs once per job for all resumes matched to it
+        matched:Dict[str, List[int]] = {}
+        for i, resume_hits in enumerate(hits):
+            for job_id, _, _ in resume_hits:
+                matched.setdefault(job_id, []).append(i)
+        scorer = ResumeScorer(self.__registry, self.__config.THRESHOLDS, self.__costs)
+        jobs = {job_id: self.__catalog.job(job_id) for job_id in matched}
+        results = await asyncio.gather(*(scorer.score_batch([resumes[i] for i in rows], jobs[job_id], self.__profile) for job_id, rows in matched.items()), return_exceptions=True)
+        scores = {}
+        for (job_id, rows), result in zip(matched.items(), results):
+            for n, i in enumerate(rows):
+                scores[(i, job_id)] = result if isinstance(result, Exception) else result[n]
+
+        matches = {}
+        for i, (name, resume_hits) in enumerate(zip(names, hits)):
+            candidates = []
+            for job_id, job_name, similarity in resume_hits:
+                score = scores[(i, job_id)]
+                candidates.append({
+                    "job_id": job_id,
+                    "name": job_name,
+                    "job_title": jobs[job_id].get("job_title"),
+                    "company_name": jobs[job_id].get("company_name"),
+                    "similarity": similarity * 100,
+                    "score": None if isinstance(score, Exception) else score,
+                    "error": str(score) if isinstance(score, Exception) else None
+                })
+            # best cascade score first, failed jobs keep their similarity order at the end
+            candidates.sort(key=lambda candidate: -candidate["score"]["overall_score"] if candidate["score"] else float("inf"))
+            matches[name] = candidates
+        return matches
+
+    async def __main(self) -> Dict[str, List[Dict]]:
+        """returns the best matching catalog jobs of every resume with their cascade results, key = file name
+        """
+        logging.info("In Matching")
+        try:
+            matches = await self.__match()
+        except Exception as e:
+            e = CustomException(e, sys)
+            logging.error(e)
+            raise e
+        try:
+            timestamp = self.__config.TIME_STAMP.strftime("%d_%m_%Y_%H_%M_%S")
+            path = self.__config.SCORES_ROOT_DIR_PATH.joinpath("matches", f"{timestamp}.json")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            await awrite_json(path, matches)
+            logging.info(f"matches saved at \'{path.as_posix()}\'")
+        except Exception as e:
+            logging.error(f"error occured while persisting matches to disk, error: {CustomException(e, sys)}")
+        logging.info("Out Matching")
+        return matches
+
+__all__ = ["MatchingComponents"]
@@ -77,6 +77,7 @@ class JobDescriptionParser:
                         - Key responsibilities
                         - Salary range (if mentioned)
                         - Posted date (if available)
+                        - Must-have skills, one skill per item (only skills stated as mandatory)
 
                         Return as structured JSON."""
                     }],
@@ -0,0 +1,95 @@
+from .. import logging
+from ..entity import Scoring
+from ..components.schema import *
+from .inference import ModelRegistry
+from .scorers import ResumeRetriever, RoBERTaHybridScorer, TierCosts
+from ..exception import CustomException
+from ..utils import awrite_json
+from typing import Dict, List
+import sys, time
+
+
+class RankingComponents:
+    def __init__(self, config:Scoring, job_data:JobDescription, registry:ModelRegistry, k:int = 20, rerank:bool = True, costs:TierCosts | None = None) -> None:
+        """searches the vector index of the registry for the k resumes closest to the job description,
+        only those k are scored by the RoBERTa tier for the final ranking when rerank is True
+        if costs is given, the measured RoBERTa latency is recorded in it"""
+        if k < 1:
+            raise ValueError(f"\'k\' must be at least 1, got {k}")
+        self.__config = config
+        self.__jd = job_data
+        self.__registry = registry
+        self.__k = k
+        self.__rerank = rerank
+        self.__costs = costs
+
+    def __await__(self):
+        return self.__main().__await__()
+
+    async def __rank(self) -> Dict:
+        job_data = self.__jd.model_dump()
+        retriever = ResumeRetriever(self.__registry)
+        start = time.perf_counter()
+        hits = await retriever.search(job_data, self.__k)
+        search_ms = (time.perf_counter() - start) * 1000
+
+        candidates: List[Dict] = []
+        resumes = []
+        for doc_id, name, similarity in hits:
+            candidate = {"name": name, "similarity": similarity * 100, "score": None, "error": None}
+            try:
+                resumes.append(retriever.index.payload(doc_id))
+            except Exception as e:
+                candidate["error"] = str(CustomException(e, sys))
+                resumes.append(None)
+            candidates.append(candidate)
+
+        rerank_ms = 0.0
+        rows = [i for i, resume in enumerate(resumes) if resume is not None]
+        if self.__rerank and rows:
+            scorer = RoBERTaHybridScorer(encoder=self.__registry.encoder("ROBERTA"), tfidf=self.__registry.tfidf, skills=self.__registry.skills)
+            start = time.perf_counter()
+            results = await scorer.calculate_hybrid_score_batch([resumes[i] for i in rows], job_data)
+            rerank_ms = (time.perf_counter() - start) * 1000
+            if self.__costs:
+                self.__costs.observe("ROBERTA", len(rows), rerank_ms / 1000)
+            for i, result in zip(rows, results):
+                if isinstance(result, Exception):
+                    candidates[i]["error"] = str(result)
+                else:
+                    candidates[i]["score"] = result
+            # reranked candidates by their RoBERTa score, candidates without one keep their retrieval order at the end
+            candidates.sort(key=lambda candidate: -candidate["score"]["overall_score"] if candidate["score"] else float("inf"))
+
+        logging.info(f"ranked {len(candidates)} of {len(retriever.index)} indexed resumes in {search_ms:.1f}ms search, {rerank_ms:.1f}ms rerank")
+        return {
+            "job_title": job_data.get("job_title"),
+            "k": self.__k,
+            "indexed": len(retriever.index),
+            "search_ms": search_ms,
+            "rerank_ms": rerank_ms,
+            "candidates": candidates
+        }
+
+    async def __main(self) -> Dict:
+        """returns ranked candidates, search and rerank time, the ranking is also persisted under the scores directory
+        """
+        logging.info("In Ranking")
+        try:
+            ranking = await self.__rank()
+        except Exception as e:
+            e = CustomException(e, sys)
+            logging.error(e)
+            raise e
+        try:
+            timestamp = self.__config.TIME_STAMP.strftime("%d_%m_%Y_%H_%M_%S")
+            path = self.__config.SCORES_ROOT_DIR_PATH.joinpath("rankings", f"{timestamp}.json")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            await awrite_json(path, ranking)
+            logging.info(f"ranking saved at \'{path.as_posix()}\'")
+        except Exception as e:
+            logging.error(f"error occured while persisting ranking to disk, error: {CustomException(e, sys)}")
+        logging.info("Out Ranking")
+        return ranking
+
+__all__ = ["RankingComponents"]
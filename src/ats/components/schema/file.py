@@ -12,6 +12,10 @@ class FileInfo:
     size:int = field(default=0)
     base64_size:int = field(default=0)
     status:bool = field(default=True)
+    cached:bool = field(default=False)
+    # MiniLM score of the raw parsed text against the job description and whether structuring was skipped for it
+    prescore:float | None = field(default=None)
+    skipped:bool = field(default=False)
     error:List[str] = field(default_factory=list)
 
     def __post_init__(self):
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional 
+from typing import List, Optional 
 
 
 class JobDescription(BaseModel):
@@ -13,6 +13,7 @@ class JobDescription(BaseModel):
     responsibilities: str = Field(description="Key responsibilities")
     salary_range: Optional[str] = Field(description="Salary information if available")
     posted_date: Optional[str] = Field(description="When the job was posted")
+    must_have_skills: Optional[List[str]] = Field(None, description="Skills the posting states as mandatory, one skill per item, empty when none is stated as mandatory")
 
 
 __all__ = ["JobDescription", ]
\ No newline at end of file
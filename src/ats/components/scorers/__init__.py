@@ -1,27 +1,134 @@
+from .base import *
+from .view import *
+from .batch import *
+from .prefilter import *
 from .mpnet import *
 from .minilm import *
 from .roberta import *
-from typing import Dict
+from .cache import *
+from .profile import *
+from .retrieval import *
+from .catalog import *
+from ..inference import ModelRegistry
+from ..skills import SkillTaxonomy
+from ... import logging
+from ...exception import CustomException
+from ...utils import get_hash
+from typing import Dict, List
+import sys, time
+
+# bump when scoring logic changes, cached results of older versions are no longer used
+SCORER_VERSION = "6"
 
 class ResumeScorer:
-    def __init__(self):
-        self.fast_scorer = MiniLMResumeScorer()      # First-pass filtering
-        self.quality_scorer = MPNetResumeScorer()    # Detailed analysis
-        self.enterprise_scorer = RoBERTaHybridScorer()  # Final ranking
+    def __init__(self, registry: ModelRegistry | None = None, thresholds: Dict[str, float] | None = None, costs: TierCosts | None = None):
+        """thresholds: score of the previous tier a resume must exceed to enter MPNET and ROBERTA
+        costs: measured tier latencies used by latency budgets, shared across requests when provided"""
+        # encoders are taken from the registry when provided, otherwise every scorer loads its own model
+        encoders = {key: registry.encoder(key) for key in TIERS} if registry else {}
+        skills = registry.skills if registry else None
+        self.fast_scorer = MiniLMResumeScorer(encoder=encoders.get("MINILM"), skills=skills)      # First-pass filtering
+        self.quality_scorer = MPNetResumeScorer(encoder=encoders.get("MPNET"), skills=skills)    # Detailed analysis
+        self.enterprise_scorer = RoBERTaHybridScorer(encoder=encoders.get("ROBERTA"), tfidf=registry.tfidf if registry else None, skills=skills)  # Final ranking
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.costs = costs or TierCosts()
+        self.__tiers = {
+            "MINILM": self.fast_scorer.calculate_section_scores_batch,      # < 100ms
+            "MPNET": self.quality_scorer.get_detailed_score_batch,          # < 300ms
+            "ROBERTA": self.enterprise_scorer.calculate_hybrid_score_batch  # < 800ms
+        }
+
+    @staticmethod
+    def version(registry: ModelRegistry | None = None, thresholds: Dict[str, float] | None = None) -> str:
+        """version of scoring logic, of the model behind every tier, of the tf-idf settings and corpus generation, of the skill taxonomy and of the tier thresholds, part of result cache keys"""
+        models = [registry.encoder(key).model_id for key in TIERS] if registry else ["default"]
+        models.append(f"skills-{(registry.skills if registry else SkillTaxonomy.default()).version}")
+        if registry and registry.tfidf:
+            models.append(f"tfidf-{registry.tfidf.version}-{registry.tfidf.generation}")
+        thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        return get_hash("|".join([SCORER_VERSION, *models, *(f"{key}>{thresholds[key]}" for key in TIERS[1:])]))[:16]
+    
+    async def score_batch(self, resumes: List[Dict | ResumeTextView], job_data: Dict, profile: ScoringProfile | None = None) -> List[Dict | Exception]:
+        """runs the cascade over all resumes at once, every tier does one batched forward pass
+        for the resumes that survived the previous tier, failed resumes get their exception as result
+
+        resumes missing a must-have skill of the job are rejected before any tier runs, their result lists the missing skills.
+        tiers outside the profile never run, when the estimated cost of a tier for its survivors exceeds what is left
+        of the latency budget the tier only runs for the best scoring survivors that fit, MINILM always runs for all.
+        every result lists the tiers that ran in 'tiers_run' and the tiers it qualified for but were skipped in 'tiers_skipped'"""
+        profile = profile or ScoringProfile()
+        start = time.perf_counter()
+        results: List[Dict | Exception] = [None] * len(resumes)
+        tiers_run = [[] for _ in resumes]
+        tiers_skipped = [[] for _ in resumes]
+        # texts of every tier are built once per resume, a resume whose texts can not be built fails every tier
+        views: List[ResumeTextView | None] = [None] * len(resumes)
+        for i, resume in enumerate(resumes):
+            try:
+                views[i] = ResumeTextView.of(resume)
+            except Exception as e:
+                results[i] = e
+        survivors = [i for i, view in enumerate(views) if view is not None]
+        # bitset check of the declared skills against the must-have skills of the job, no model runs for rejected resumes
+        prefilter = MustHaveFilter(self.fast_scorer.skills, job_data.get('must_have_skills'))
+        if prefilter and survivors:
+            try:
+                passed, missing = prefilter.check([views[i] for i in survivors])
+                for row, i in enumerate(survivors):
+                    if not passed[row]:
+                        results[i] = prefilter.rejection(missing[row])
+                logging.info(f"{len(survivors) - int(passed.sum())} of {len(survivors)} resumes rejected by must-have skills {prefilter.names()}")
+                survivors = [i for row, i in enumerate(survivors) if passed[row]]
+            except Exception as e:
+                # resumes are scored unfiltered rather than rejected on a failed check
+                logging.error(str(CustomException(e, sys)))
+        for n, tier in enumerate(TIERS):
+            if n:
+                # Worth detailed analysis / Potential candidate
+                survivors = [i for i in survivors if isinstance(results[i], dict) and results[i]['overall_score'] > self.thresholds[tier]]
+            if not survivors:
+                break
+            skipped = []
+            if n and tier not in profile.tiers:
+                survivors, skipped = [], survivors
+            elif n and profile.budget_ms:
+                remaining = profile.budget_ms - (time.perf_counter() - start) * 1000
+                if self.costs.estimate(tier, len(survivors)) > remaining:
+                    survivors = sorted(survivors, key=lambda i: results[i]['overall_score'], reverse=True)
+                    fit = self.costs.capacity(tier, remaining)
+                    survivors, skipped = sorted(survivors[:fit]), survivors[fit:]
+            if skipped:
+                logging.info(f"tier \'{tier}\' skipped for {len(skipped)} resumes by profile \'{profile.name}\'")
+                for i in skipped:
+                    tiers_skipped[i].append(tier)
+            if not survivors:
+                break
+            tier_start = time.perf_counter()
+            tier_results = await self.__tiers[tier]([views[i] for i in survivors], job_data)
+            self.costs.observe(tier, len(survivors), time.perf_counter() - tier_start)
+            for i, result in zip(survivors, tier_results):
+                results[i] = result
+                tiers_run[i].append(tier)
+        for i, result in enumerate(results):
+            if isinstance(result, dict):
+                result["tiers_run"] = tiers_run[i]
+                result["tiers_skipped"] = tiers_skipped[i]
+        return results
     
-    async def score(self, resume_data: Dict, job_data: Dict) -> Dict:
-        # Tier 1: Fast filtering (< 100ms)
-        fast_result = await self.fast_scorer.calculate_section_scores(resume_data, job_data)
-        if fast_result['overall_score'] > 30:  # Worth detailed analysis
-            # Tier 2: Quality semantic matching (< 300ms)  
-            quality_result = await self.quality_scorer.get_detailed_score(resume_data, job_data)
-            if quality_result['overall_score'] > 50:  # Potential candidate
-                # Tier 3: Comprehensive hybrid scoring (< 800ms)
-                enterprise_result = await self.enterprise_scorer.calculate_hybrid_score(resume_data, job_data)
-                return enterprise_result
-            else:
-                return quality_result
-        else:
-            return fast_result
+    async def score(self, resume_data: Dict | ResumeTextView, job_data: Dict, profile: ScoringProfile | None = None) -> Dict:
+        result = (await self.score_batch([resume_data], job_data, profile))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def update_corpus(self, resumes: List[Dict | ResumeTextView], job_data: Dict) -> int:
+        """counts the RoBERTa texts of the resumes and the job description into the tf-idf corpus,
+        called once they are scored so no score weighs a text against its own document frequencies
+
+        Returns:
+            int: number of new documents
+        """
+        texts = [ResumeTextView.of(resume).comprehensive for resume in resumes]
+        return self.enterprise_scorer.tfidf.update([*texts, *self.enterprise_scorer.job_texts(job_data)])
 
-__all__ = ["ResumeScorer"]
\ No newline at end of file
+__all__ = ["ResumeScorer", "ResumeRetriever", "ResumeTextView", "ResumeBatch", "JobCatalog", "ScoreCache", "ScoringProfile", "TierCosts", "TIERS", "SCORER_VERSION"]
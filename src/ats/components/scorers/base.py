@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Set
+from ..inference import Encoder, RemoteEncoder
+from ..skills import SkillTaxonomy
+import numpy as np
+
+
+class BaseScorer(ABC):
+    """Base class for all sentence-transformer scorers"""
+
+    def __init__(self, encoder: Encoder | RemoteEncoder, skills: SkillTaxonomy | None = None) -> None:
+        # with a RemoteEncoder the scorer is a client of the model server and holds no model
+        self.encoder = encoder
+        self.model = encoder.model
+        # shared skill taxonomy, the one shipped with the package when not provided
+        self.skills = skills or SkillTaxonomy.default()
+
+    def extract_skills(self, text: str) -> Set[str]:
+        """Canonical ids of the skills mentioned in the text, found in one pass over it"""
+        return self.skills.extract(text)
+
+    @abstractmethod
+    def job_texts(self, job_data: Dict) -> List[str]:
+        """Job description texts the scorer encodes with 'encode_job', precomputed by the job catalog"""
+        pass
+
+    async def encode(self, texts: List[str], sections: List[str] | None = None) -> np.ndarray:
+        """Encode all texts in a single forward pass without blocking the event loop,
+        texts named by 'sections' are read from and written to the persistent embedding store"""
+        return await self.encoder.encode(texts, sections=sections)
+
+    async def encode_job(self, texts: List[str]) -> np.ndarray:
+        """Encode job description texts, served from the embedding cache when the same job was seen before"""
+        return await self.encoder.encode(texts, cache=True)
+
+    @staticmethod
+    def normalize(embeddings: np.ndarray) -> np.ndarray:
+        """L2-normalize embeddings row-wise so cosine similarity becomes a dot product"""
+        norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+        return embeddings / np.where(norms == 0, 1, norms)
+
+    @classmethod
+    def pairwise(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every row of 'a' against every row of 'b'"""
+        return cls.normalize(a) @ cls.normalize(b).T
+
+    @classmethod
+    def rowwise(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Cosine similarity of row i of 'a' against row i of 'b' (b may be a single row)"""
+        return np.sum(cls.normalize(a) * cls.normalize(np.atleast_2d(b)), axis=1)
+
+
+__all__ = ["BaseScorer", ]
@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping
+from .view import ResumeTextView
+from ..skills import SkillTaxonomy, popcount
+import numpy as np
+
+
+# years of experience scoring 100 for a required experience level, bounds included
+EXPERIENCE_RANGES = {
+    "entry": (-np.inf, 2),
+    "junior": (1, 3),
+    "mid": (3, 6),
+    "senior": (5, np.inf)
+}
+
+# years of experience partial scores are centred on, 10 points are lost per year away from it
+BASELINE_YEARS = 5
+
+
+def experience_years(resume_data: Mapping) -> float:
+    """total years of experience of the resume, nan when missing or 0 (scored as no experience)"""
+    years = resume_data.get('professional_summary', {}).get('total_experience_years')
+    if not years:
+        return np.nan
+    if not isinstance(years, (int, float)):
+        raise TypeError(f"\'total_experience_years\' must be a number, got {type(years).__name__}")
+    return float(years)
+
+
+@dataclass(slots=True, eq=False)
+class ResumeBatch:
+    """columnar view of a batch of resumes, one row per resume, the rule based scores of every resume
+    are computed with a few array operations instead of one python loop per resume
+
+    rows whose data can not be read keep their exception in 'errors' and score 0 in every column
+
+    usage:
+            batch = ResumeBatch.of(views, skills)
+            batch.columns["semantic"] = semantic_scores
+            batch.columns["keyword"] = batch.keyword_scores(skills.bitset(job_skills))
+            batch.columns["experience"] = batch.experience_scores("senior")
+            overall = batch.weighted({"semantic": 0.5, "keyword": 0.3, "experience": 0.2})
+    """
+    # total years of experience, nan when missing
+    experience: np.ndarray
+    # skills mentioned in the comprehensive text, one uint64 bitset row per resume
+    skills: np.ndarray
+    # similarity and score columns, name -> float64 array of one value per resume
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+    # row -> exception of rows that can not be scored
+    errors: Dict[int, Exception] = field(default_factory=dict)
+
+    @classmethod
+    def of(cls, views: List[ResumeTextView], skills: SkillTaxonomy) -> "ResumeBatch":
+        "builds the columns of the resumes, skills are extracted from the comprehensive text of every view"
+        experience = np.full(len(views), np.nan)
+        bits = np.zeros((len(views), skills.words), dtype=np.uint64)
+        errors = {}
+        for row, view in enumerate(views):
+            try:
+                experience[row] = experience_years(view.data)
+                bits[row] = skills.bitset(skills.extract(view.comprehensive))
+            except Exception as e:
+                experience[row] = np.nan
+                errors[row] = e
+        return cls(experience=experience, skills=bits, errors=errors)
+
+    def __len__(self) -> int:
+        return len(self.experience)
+
+    def experience_scores(self, job_level: str) -> np.ndarray:
+        """experience level matching of every resume, 100 inside the range of the job level,
+        partial scores around BASELINE_YEARS otherwise and 0 without experience"""
+        has = ~np.isnan(self.experience)
+        if not has.any():
+            return np.zeros(len(self))
+        low, high = EXPERIENCE_RANGES.get(job_level.lower(), (np.inf, -np.inf))
+        years = np.where(has, self.experience, BASELINE_YEARS)
+        inside = (years >= low) & (years <= high)
+        partial = np.maximum(0, 100 - np.abs(years - BASELINE_YEARS) * 10)
+        return np.where(has, np.where(inside, 100.0, partial), 0.0)
+
+    def keyword_scores(self, job_skills: np.ndarray) -> np.ndarray:
+        "share of the job skills found in every resume in percent, AND of the bitsets and popcount, 0 for a job without skills"
+        required = int(popcount(job_skills))
+        if not required:
+            return np.zeros(len(self))
+        return popcount(self.skills & job_skills) / required * 100
+
+    def weighted(self, weights: Mapping[str, float]) -> np.ndarray:
+        "weighted sum of the named columns, added in the order of weights"
+        total = np.zeros(len(self))
+        for name, weight in weights.items():
+            total = total + np.asarray(self.columns[name], dtype=np.float64) * weight
+        return total
+
+
+__all__ = ["ResumeBatch"]
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Tuple
+from ...exception import CustomException
+from ...utils import awrite_json, get_hash
+from ... import logging
+import aiofiles, json, sys
+
+
+class ScoreCache:
+    """two tier cache of cascade results keyed by (resume hash, job description hash, scorer version),
+    recent results are kept in an in-memory LRU and every result is persisted as json under cache_dir
+
+    layout of cache_dir: <scorer version>/<job description hash>/<resume hash>.json
+
+    usage:
+            cache = ScoreCache(max_entries=1024, cache_dir=Path("artifacts/scores/cache"))
+            key = cache.key(resume_data, job_data, ResumeScorer.version(registry))
+            result = await cache.get(key)
+            await cache.put(key, result)
+    """
+    def __init__(self, max_entries:int = 1024, cache_dir:Path | None = None) -> None:
+        if max_entries < 1:
+            raise ValueError(f"\'max_entries\' must be at least 1, got {max_entries}")
+        self.__max_entries = max_entries
+        self.__cache_dir = cache_dir
+        self.__entries:OrderedDict[Tuple[str, str, str], Dict] = OrderedDict()
+        self.__stats = {"hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+    @staticmethod
+    def canonical_hash(data:Dict) -> str:
+        "hash of the data independent of key order"
+        return get_hash(json.dumps(data, sort_keys=True, ensure_ascii=False, default=str))
+
+    @classmethod
+    def key(cls, resume_data:Dict | str, job_data:Dict | str, version:str) -> Tuple[str, str, str]:
+        "resume and job description are hashed, a string is taken as their precomputed canonical hash"
+        resume_hash = resume_data if isinstance(resume_data, str) else cls.canonical_hash(resume_data)
+        job_hash = job_data if isinstance(job_data, str) else cls.canonical_hash(job_data)
+        return resume_hash, job_hash, version
+
+    def __path(self, key:Tuple[str, str, str]) -> Path:
+        resume_hash, job_hash, version = key
+        return self.__cache_dir.joinpath(version, job_hash, f"{resume_hash}.json")
+
+    def __insert(self, key:Tuple[str, str, str], result:Dict) -> None:
+        self.__entries[key] = result
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_entries:
+            self.__entries.popitem(last=False)
+
+    async def get(self, key:Tuple[str, str, str]) -> Dict | None:
+        """returns cached result or None"""
+        if key in self.__entries:
+            self.__entries.move_to_end(key)
+            self.__stats["hits"] += 1
+            return self.__entries[key]
+        if self.__cache_dir:
+            path = self.__path(key)
+            if path.is_file():
+                try:
+                    async with aiofiles.open(path, "r", encoding="utf-8") as file:
+                        result = json.loads(await file.read())
+                    self.__stats["disk_hits"] += 1
+                    self.__insert(key, result)
+                    return result
+                except Exception as e:
+                    logging.warning(f"unable to read cached score \'{path.as_posix()}\', {e}")
+        self.__stats["misses"] += 1
+        return None
+
+    async def put(self, key:Tuple[str, str, str], result:Dict) -> None:
+        """stores result in memory and on disk"""
+        self.__insert(key, result)
+        if self.__cache_dir:
+            path = self.__path(key)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                await awrite_json(path, result)
+                self.__stats["writes"] += 1
+            except Exception as e:
+                logging.error(str(CustomException(e, sys)))
+
+    def report(self) -> Dict:
+        "returns hit/miss counters and size"
+        return {
+            "entries": len(self.__entries),
+            "max_entries": self.__max_entries,
+            "cache_dir": self.__cache_dir.as_posix() if self.__cache_dir else None,
+            **self.__stats
+        }
+
+
+__all__ = ["ScoreCache"]
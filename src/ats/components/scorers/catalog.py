@@ -0,0 +1,120 @@
+from pathlib import Path
+from typing import Dict, List, Tuple
+from .base import BaseScorer
+from .mpnet import MPNetResumeScorer
+from .minilm import MiniLMResumeScorer
+from .roberta import RoBERTaHybridScorer
+from .cache import ScoreCache
+from .retrieval import ResumeRetriever
+from .view import ResumeTextView
+from ..inference import ModelRegistry, VectorIndex
+from ...exception import CustomException
+from ... import logging
+import sys
+import numpy as np
+
+
+class JobCatalog:
+    """open roles stored with the embeddings every tier needs, a resume is matched against the whole catalog
+    with one matrix product of its embedding against the embeddings of all jobs
+
+    the job texts of every tier are encoded once when the job is added and persisted, at startup they are loaded
+    into the embedding cache of their encoder so the cascade never encodes a catalog job again
+
+    layout of root_dir:
+            index/<model>/                  vector index of job embeddings under INDEX_MODEL, the job description is the payload
+            embeddings/<model>/<job id>.npy embeddings of the job texts of the scorer of every tier, one row per text
+
+    usage:
+            catalog = JobCatalog(Path("artifacts/job/catalog"), registry)
+            job_id = await catalog.add(job_data, "https://careers.example.com/123")
+            matches = await catalog.search([resume_data], top_n=5)      # [[(job id, name, similarity), ...]]
+            job_data = catalog.job(matches[0][0][0])
+    """
+    def __init__(self, root_dir:Path, registry:ModelRegistry) -> None:
+        self.dir = root_dir
+        self.__retriever = ResumeRetriever(registry)
+        encoder = registry.encoder(registry.config.INDEX_MODEL)
+        # hundreds of roles, exact search is a single small matrix product
+        self.index = VectorIndex(root_dir.joinpath("index"), encoder.model_id, encoder.dimension)
+        self.__scorers:Dict[str, BaseScorer] = {
+            "MINILM": MiniLMResumeScorer(encoder=registry.encoder("MINILM"), skills=registry.skills),
+            "MPNET": MPNetResumeScorer(encoder=registry.encoder("MPNET"), skills=registry.skills),
+            "ROBERTA": RoBERTaHybridScorer(encoder=registry.encoder("ROBERTA"), tfidf=registry.tfidf, skills=registry.skills)
+        }
+        self.__warm()
+
+    def __path(self, tier:str, job_id:str) -> Path:
+        # the model id of the tier names the directory, embeddings of another model or backend are never reused
+        return self.dir.joinpath("embeddings", self.__scorers[tier].encoder.model_id.replace("/", "__"), f"{job_id}.npy")
+
+    def __warm(self) -> None:
+        "loads precomputed job embeddings of every tier into the embedding cache"
+        loaded = 0
+        for job_id, _ in self.index.documents():
+            try:
+                job_data = self.job(job_id)
+                for tier, scorer in self.__scorers.items():
+                    path = self.__path(tier, job_id)
+                    if scorer.encoder.cache is None or not path.is_file():
+                        continue
+                    for text, embedding in zip(scorer.job_texts(job_data), np.load(path)):
+                        scorer.encoder.cache.put(scorer.encoder.model_id, text, embedding)
+                    loaded += 1
+            except Exception as e:
+                logging.warning(f"unable to load embeddings of catalog job \'{job_id}\', {CustomException(e, sys)}")
+        logging.info(f"opened job catalog \'{self.dir.as_posix()}\' with {len(self.index)} jobs, {loaded} tier embeddings loaded")
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def job(self, job_id:str) -> Dict:
+        "returns the stored job description"
+        return self.index.payload(job_id)
+
+    def jobs(self) -> List[Dict]:
+        "id, name, title and company of every job in the catalog"
+        jobs = []
+        for job_id, name in self.index.documents():
+            job_data = self.job(job_id)
+            jobs.append({"id": job_id, "name": name, "job_title": job_data.get("job_title"), "company_name": job_data.get("company_name")})
+        return jobs
+
+    async def add(self, job_data:Dict, name:str | None = None) -> str:
+        """encodes the job texts of every tier and adds the job, a job added under the name of a catalog job replaces it
+
+        Args:
+            job_data (Dict): job description
+            name (str | None, optional): name of the job, eg: its url, the job id when None. Defaults to None.
+
+        Returns:
+            str: job id, hash of the job description
+        """
+        job_id = ScoreCache.canonical_hash(job_data)
+        for tier, scorer in self.__scorers.items():
+            path = self.__path(tier, job_id)
+            if not path.is_file():
+                embeddings = await scorer.encode_job(scorer.job_texts(job_data))
+                path.parent.mkdir(parents=True, exist_ok=True)
+                np.save(path, embeddings)
+        embedding = await self.__retriever.embed_job(job_data)
+        self.index.add([job_id], [name or job_id], embedding[None], [job_data])
+        logging.info(f"job \'{job_data.get('job_title')}\' added to catalog as \'{job_id}\', {len(self.index)} jobs")
+        return job_id
+
+    async def search(self, resumes:List[Dict | ResumeTextView], top_n:int = 5) -> List[List[Tuple[str, str, float]]]:
+        """returns the top_n catalog jobs closest to every resume, all resumes are compared against all jobs with one matrix product
+
+        Returns:
+            List[List[Tuple[str, str, float]]]: (job id, name, cosine similarity) by decreasing similarity of every resume
+        """
+        if not resumes:
+            return []
+        return self.index.search_batch(await self.__retriever.embed_resumes(resumes), top_n)
+
+    def report(self) -> Dict:
+        "returns catalog size and index counters"
+        return {"jobs": len(self.index), "index": self.index.report()}
+
+
+__all__ = ["JobCatalog"]
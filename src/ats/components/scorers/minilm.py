@@ -1,52 +1,23 @@
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from typing import Dict, List
+from .base import BaseScorer
+from .view import ResumeTextView, resume_sections
+from ..skills import SkillTaxonomy
+from ..inference import Encoder, RemoteEncoder
 from ... import logging
 from ...exception import CustomException
+import asyncio
 import sys 
 
-class MiniLMResumeScorer:
-    def __init__(self):
-        # Fast and efficient model - 384 dimensions
-        self.model = SentenceTransformer('sentence-transformers/paraphrase-MiniLM-L6-v2')
-        self.batch_size = 32  # Optimized for speed
+class MiniLMResumeScorer(BaseScorer):
+    def __init__(self, model: SentenceTransformer | None = None, encoder: Encoder | RemoteEncoder | None = None, skills: SkillTaxonomy | None = None):
+        # Fast and efficient model - 384 dimensions, shared encoder or model is used when provided
+        super().__init__(encoder or Encoder("MINILM", model or SentenceTransformer('sentence-transformers/paraphrase-MiniLM-L6-v2')), skills)
     
     def create_resume_sections(self, resume_data: Dict) -> List[str]:
         """Create focused sections for better matching"""
-        try:
-            sections = []
-
-            # Core skills section
-            if resume_data.get('skills'):
-                if resume_data.get('skills', {}).get('technical'):
-                    sections.append(f"Technical expertise: {', '.join(resume_data['skills']['technical'])}")
-                    logging.info("skills extracted")
-                else:
-                    logging.info(f"skills = \'{resume_data.get("skills")}\'")
-
-            # Professional experience section
-            if resume_data.get('work_experience'):
-                exp_summary = []
-                for exp in resume_data['work_experience']:
-                    if exp.get('title'):
-                        exp_summary.append(f"{exp['title']}")
-                    if exp.get('technologies_used'):
-                        exp_summary.append(f"using {', '.join(exp['technologies_used'])}")
-                if exp_summary:
-                    sections.append(f"Experience: {' '.join(exp_summary)}")
-                    logging.info("work experience")
-
-            # Professional summary
-            if resume_data.get('professional_summary', {}).get('summary'):
-                sections.append(f"Profile: {resume_data['professional_summary']['summary']}")
-                logging.info("professional summary extracted")
-
-            return sections
-        except Exception as e:
-            e = CustomException(e, sys)
-            logging.error(e)
-            raise e
+        return resume_sections(resume_data)
     
     def create_job_sections(self, job_data: Dict) -> List[str]:
         """Create job requirement sections"""
@@ -63,49 +34,116 @@ class MiniLMResumeScorer:
             logging.error(e)
             raise e
     
-    async def calculate_section_scores(self, resume_data: Dict, job_data: Dict) -> Dict:
-        """Advanced section-wise scoring for better accuracy"""
+    def job_texts(self, job_data: Dict) -> List[str]:
+        return self.create_job_sections(job_data)
+
+    def score_sections(self, similarity_matrix: np.ndarray) -> Dict:
+        """Section-wise scores from a resume-sections x job-sections similarity matrix"""
+        n_resume, n_job = similarity_matrix.shape
+        
+        # Advanced scoring logic
+        section_scores = {}
+        
+        # Skills to requirements matching
+        if n_resume > 0 and n_job > 1:
+            section_scores['skills_to_requirements'] = float(similarity_matrix[0, 1] * 100)
+        
+        # Experience to responsibilities matching  
+        if n_resume > 1 and n_job > 2:
+            section_scores['experience_to_responsibilities'] = float(similarity_matrix[1, 2] * 100)
+        
+        # Overall best match
+        overall_score = float(np.mean(np.max(similarity_matrix, axis=1)) * 100)
+        return {
+            'overall_score': overall_score,
+            'section_scores': section_scores,
+            'confidence': 'High' if overall_score > 70 else 'Medium' if overall_score > 45 else 'Low',
+            'model_used': 'paraphrase-MiniLM-L6-v2',
+            'processing_speed': 'Fast'
+        }
+    
+    async def calculate_section_scores_batch(self, resumes: List[Dict | ResumeTextView], job_data: Dict) -> List[Dict | Exception]:
+        """Section-wise scoring of every resume in one forward pass and one similarity matrix,
+        a resume whose sections cannot be built gets its exception in place of a result"""
         logging.info("In MiniLM")
         try:
-            resume_sections = self.create_resume_sections(resume_data)
-            job_sections = self.create_job_sections(job_data)
-            
-            if not resume_sections or not job_sections:
-                return {'overall_score': 0.0, 'section_scores': {}}
-            
-            # Generate embeddings for all sections
-            resume_embeddings = self.model.encode(resume_sections)
-            job_embeddings = self.model.encode(job_sections)
-            
-            # Calculate cross-similarity matrix
-            similarity_matrix = cosine_similarity(resume_embeddings, job_embeddings)
+            job_sections = self.job_texts(job_data)
             
-            # Advanced scoring logic
-            section_scores = {}
+            # collect sections of all resumes, spans[i] = (start, end) rows of resume i
+            results: List[Dict | Exception | None] = [None] * len(resumes)
+            texts, spans = [], {}
+            for i, resume_data in enumerate(resumes):
+                try:
+                    sections = ResumeTextView.of(resume_data).sections
+                except Exception as e:
+                    results[i] = e
+                    continue
+                if not sections or not job_sections:
+                    results[i] = {'overall_score': 0.0, 'section_scores': {}}
+                    continue
+                spans[i] = (len(texts), len(texts) + len(sections))
+                texts.extend(sections)
             
-            # Skills to requirements matching
-            if len(resume_sections) > 0 and len(job_sections) > 1:
-                section_scores['skills_to_requirements'] = float(similarity_matrix[0, 1] * 100)
-            
-            # Experience to responsibilities matching  
-            if len(resume_sections) > 1 and len(job_sections) > 2:
-                section_scores['experience_to_responsibilities'] = float(similarity_matrix[1, 2] * 100)
-            
-            # Overall best match
-            overall_score = float(np.mean(np.max(similarity_matrix, axis=1)) * 100)
+            if spans:
+                # Generate embeddings for all resume sections at once, job sections come from the cache when seen before
+                resume_embeddings, job_embeddings = await asyncio.gather(self.encode(texts, ["sections"] * len(texts)), self.encode_job(job_sections))
+                
+                # Calculate cross-similarity matrix for every section of every resume
+                similarity_matrix = self.pairwise(resume_embeddings, job_embeddings)
+                
+                for i, (start, end) in spans.items():
+                    results[i] = self.score_sections(similarity_matrix[start:end])
             logging.info("Out MiniLM")
-            return {
-                'overall_score': overall_score,
-                'section_scores': section_scores,
-                'confidence': 'High' if overall_score > 70 else 'Medium' if overall_score > 45 else 'Low',
-                'model_used': 'paraphrase-MiniLM-L6-v2',
-                'processing_speed': 'Fast'
-            }
+            return results
+        except Exception as e:
+            if not isinstance(e, CustomException):
+                e = CustomException(e, sys)
+            logging.error(e)
+            raise e
+    
+    async def calculate_raw_scores_batch(self, texts: List[str], job_data: Dict, window_words: int = 96) -> List[float]:
+        """Pre-score of raw parsed resume texts before they are structured, every text is cut into windows of
+        window_words words (about the max sequence length of MiniLM) scored like resume sections, all in one forward pass"""
+        try:
+            job_sections = self.job_texts(job_data)
+            windows, spans = [], []
+            for text in texts:
+                words = text.split()
+                start = len(windows)
+                windows.extend(" ".join(words[n:n + window_words]) for n in range(0, len(words), window_words))
+                spans.append((start, len(windows)))
+            if not windows:
+                return [0.0] * len(texts)
+            resume_embeddings, job_embeddings = await asyncio.gather(self.encode(windows), self.encode_job(job_sections))
+            similarity_matrix = self.pairwise(resume_embeddings, job_embeddings)
+            # mean over windows of the best matching job section, as the overall score of resume sections
+            return [float(np.mean(np.max(similarity_matrix[start:end], axis=1)) * 100) if end > start else 0.0 for start, end in spans]
         except Exception as e:
             if not isinstance(e, CustomException):
                 e = CustomException(e, sys)
             logging.error(e)
             raise e
+
+    @staticmethod
+    def skipped_result(prescore: float) -> Dict:
+        """Result of a resume whose raw text pre-score was too low to structure it"""
+        return {
+            'overall_score': prescore,
+            'section_scores': {},
+            'confidence': 'Low',
+            'match_quality': 'Rejected',
+            'model_used': 'paraphrase-MiniLM-L6-v2-raw-text',
+            'recommendation': f"Raw text pre-score {prescore:.1f} is too low for this position, resume was not structured",
+            'tiers_run': [],
+            'tiers_skipped': []
+        }
+
+    async def calculate_section_scores(self, resume_data: Dict | ResumeTextView, job_data: Dict) -> Dict:
+        """Advanced section-wise scoring for better accuracy"""
+        result = (await self.calculate_section_scores_batch([resume_data], job_data))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
     
     # async def batch_score_multiple(self, resume_list: List[Dict], job_data: Dict) -> List[Tuple[int, float]]:
     #     """Score multiple resumes against one job - optimized for speed"""
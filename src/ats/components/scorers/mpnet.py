@@ -1,63 +1,22 @@
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import Dict
+from typing import Dict, List
+from .base import BaseScorer
+from .view import ResumeTextView, resume_text, section_texts
+from ..skills import SkillTaxonomy
+from ..inference import Encoder, RemoteEncoder
 from ... import logging
 from ...exception import CustomException
+import asyncio
 import sys
 
-class MPNetResumeScorer:
-    def __init__(self):
-        # Load the best quality pre-trained model
-        self.model = SentenceTransformer('sentence-transformers/all-mpnet-base-v2')
+class MPNetResumeScorer(BaseScorer):
+    def __init__(self, model: SentenceTransformer | None = None, encoder: Encoder | RemoteEncoder | None = None, skills: SkillTaxonomy | None = None):
+        # Load the best quality pre-trained model, shared encoder or model is used when provided
+        super().__init__(encoder or Encoder("MPNET", model or SentenceTransformer('sentence-transformers/all-mpnet-base-v2')), skills)
         
     def extract_resume_text(self, resume_data: Dict) -> str:
         """Extract meaningful text from resume schema"""
-        try:
-            text_parts = []
-
-            # Personal info
-            if resume_data.get('personal_info'):
-                if resume_data['personal_info'].get('name'):
-                    text_parts.append(f"Name: {resume_data['personal_info']['name']}")
-
-            # Professional summary
-            if resume_data.get('professional_summary'):
-                prof_summary = resume_data['professional_summary']
-                if prof_summary.get('headline'):
-                    text_parts.append(f"Professional Title: {prof_summary['headline']}")
-                if prof_summary.get('summary'):
-                    text_parts.append(f"Summary: {prof_summary['summary']}")
-                if prof_summary.get('total_experience_years'):
-                    text_parts.append(f"Experience: {prof_summary['total_experience_years']} years")
-
-            # Work experience
-            if resume_data.get('work_experience'):
-                for exp in resume_data['work_experience']:
-                    if exp.get('title') and exp.get('company'):
-                        text_parts.append(f"Position: {exp['title']} at {exp['company']}")
-                    if exp.get('responsibilities'):
-                        text_parts.extend([f"Responsibility: {resp}" for resp in exp['responsibilities']])
-                    if exp.get('technologies_used'):
-                        text_parts.append(f"Technologies: {', '.join(exp['technologies_used'])}")
-
-            # Skills
-            if resume_data.get('skills'):
-                if resume_data['skills'].get('technical'):
-                    text_parts.append(f"Technical Skills: {', '.join(resume_data['skills']['technical'])}")
-                if resume_data['skills'].get('certifications'):
-                    text_parts.append(f"Certifications: {', '.join(resume_data['skills']['certifications'])}")
-
-            # Education
-            if resume_data.get('education'):
-                for edu in resume_data['education']:
-                    if edu.get('degree') and edu.get('institution'):
-                        text_parts.append(f"Education: {edu['degree']} from {edu['institution']}")
-
-            return " | ".join(text_parts)
-        except Exception as e:
-            e = CustomException(e, sys)
-            logging.error(e)
-            raise e
+        return resume_text(resume_data)
     
     def extract_job_text(self, job_data: Dict) -> str:
         """Extract meaningful text from job description schema"""
@@ -77,18 +36,83 @@ class MPNetResumeScorer:
             logging.error(e)
             raise e
     
-    async def calculate_similarity_score(self, resume_data: Dict, job_data: Dict) -> float:
+    def job_texts(self, job_data: Dict) -> List[str]:
+        """Whole job, its requirements and its responsibilities"""
+        return [
+            self.extract_job_text(job_data),
+            f"Requirements: {job_data['requirements']}",
+            job_data['responsibilities']
+        ]
+    
+    def create_section_texts(self, resume_data: Dict) -> Dict[str, str]:
+        """Create texts for section-wise scoring, keys: skills, experience"""
+        return section_texts(resume_data)
+    
+    async def get_detailed_score_batch(self, resumes: List[Dict | ResumeTextView], job_data: Dict) -> List[Dict | Exception]:
+        """Detailed scoring of every resume in one forward pass, similarities are computed as
+        one matrix op per section, a resume whose text cannot be built gets its exception in place of a result"""
+        logging.info("In MPNet")
+        try:
+            job_texts = self.job_texts(job_data)
+
+            results: List[Dict | Exception | None] = [None] * len(resumes)
+            texts, names, rows = [], [], {}
+            for i, resume_data in enumerate(resumes):
+                try:
+                    view = ResumeTextView.of(resume_data)
+                except Exception as e:
+                    results[i] = e
+                    continue
+                rows[i] = {'overall': len(texts)}
+                texts.append(view.text)
+                names.append('overall')
+                for name, text in view.section_texts:
+                    rows[i][name] = len(texts)
+                    texts.append(text)
+                    names.append(name)
+
+            if rows:
+                # Generate embeddings for every resume text at once, job texts come from the cache when seen before
+                resume_embeddings, job_embeddings = await asyncio.gather(self.encode(texts, names), self.encode_job(job_texts))
+
+                # similarity of every resume text against the whole job, its requirements and responsibilities
+                similarity_matrix = self.pairwise(resume_embeddings, job_embeddings) * 100
+
+                for i, row in rows.items():
+                    overall_score = float(similarity_matrix[row['overall'], 0])
+
+                    # Section-wise scoring
+                    sections_score = {}
+                    if 'skills' in row:
+                        sections_score['skills_match'] = float(similarity_matrix[row['skills'], 1])
+                    if 'experience' in row:
+                        sections_score['experience_match'] = float(similarity_matrix[row['experience'], 2])
+
+                    results[i] = {
+                        'overall_score': overall_score,
+                        'sections_breakdown': sections_score,
+                        'match_level': 'High' if overall_score > 75 else 'Medium' if overall_score > 50 else 'Low',
+                        'model_used': 'all-mpnet-base-v2'
+                    }
+            logging.info("Out MPNet")
+            return results
+        except Exception as e:
+            if not isinstance(e, CustomException):
+                e = CustomException(e, sys)
+            logging.error(e)
+            raise e
+
+    async def calculate_similarity_score(self, resume_data: Dict | ResumeTextView, job_data: Dict) -> float:
         """Calculate semantic similarity score between resume and job"""
         try:
-            resume_text = self.extract_resume_text(resume_data)
+            text = ResumeTextView.of(resume_data).text
             job_text = self.extract_job_text(job_data)
             
             # Generate embeddings
-            resume_embedding = self.model.encode([resume_text])
-            job_embedding = self.model.encode([job_text])
+            embeddings = await self.encode([text, job_text])
             
             # Calculate cosine similarity
-            similarity = cosine_similarity(resume_embedding, job_embedding)[0][0]
+            similarity = self.rowwise(embeddings[:1], embeddings[1:])[0]
             
             # Convert to percentage score
             return float(similarity * 100)
@@ -98,49 +122,11 @@ class MPNetResumeScorer:
             logging.error(e)
             raise e
     
-    async def get_detailed_score(self, resume_data: Dict, job_data: Dict) -> Dict:
+    async def get_detailed_score(self, resume_data: Dict | ResumeTextView, job_data: Dict) -> Dict:
         """Get detailed scoring breakdown"""
-        logging.info("In MPNet")
-        try:
-            overall_score = await self.calculate_similarity_score(resume_data, job_data)
-
-            # Section-wise scoring
-            sections_score = {}
-
-            # Skills matching
-            if resume_data.get('skills') and resume_data['skills'].get('technical'):
-                skills_text = f"Skills: {', '.join(resume_data['skills']['technical'])}"
-                job_req_text = f"Requirements: {job_data['requirements']}"
-
-                skills_emb = self.model.encode([skills_text])
-                req_emb = self.model.encode([job_req_text])
-                sections_score['skills_match'] = float(cosine_similarity(skills_emb, req_emb)[0][0] * 100)
-
-            # Experience matching
-            if resume_data.get('work_experience'):
-                exp_texts = []
-                for exp in resume_data['work_experience']:
-                    if exp.get('responsibilities'):
-                        exp_texts.extend(exp['responsibilities'])
-
-                if exp_texts:
-                    exp_text = " | ".join(exp_texts)
-                    resp_text = job_data['responsibilities']
-
-                    exp_emb = self.model.encode([exp_text])
-                    resp_emb = self.model.encode([resp_text])
-                    sections_score['experience_match'] = float(cosine_similarity(exp_emb, resp_emb)[0][0] * 100)
-            logging.info("Out MPNet")
-            return {
-                'overall_score': overall_score,
-                'sections_breakdown': sections_score,
-                'match_level': 'High' if overall_score > 75 else 'Medium' if overall_score > 50 else 'Low',
-                'model_used': 'all-mpnet-base-v2'
-            }
-        except Exception as e:
-            if not isinstance(e, CustomException):
-                e = CustomException(e, sys)
-            logging.error(e)
-            raise e
+        result = (await self.get_detailed_score_batch([resume_data], job_data))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
 
 __all__ = ["MPNetResumeScorer"]
\ No newline at end of file
@@ -0,0 +1,115 @@
+from typing import Dict, List, Mapping, Set
+from .view import ResumeTextView
+from ..skills import SkillTaxonomy, popcount
+from ... import logging
+import numpy as np
+import re
+
+# text between two skills of a must-have item, 'or', '/' and '|' make them alternatives and commas continue a list
+ALTERNATIVE = re.compile(r"\bor\b|/|\|")
+LIST = re.compile(r"[\s,]*")
+
+
+def must_have_groups(skills: SkillTaxonomy, item: str) -> List[Set[str]]:
+    """skill groups of a must-have item, a group is met by any of its skills and every group is required,
+    skills listed as alternatives ('Python or Java', 'AWS, GCP or Azure', 'Python/Java') form one group,
+    any other skill is required on its own ('Python and Docker', 'Python, Docker')"""
+    text = skills.normalize(item)
+    # runs of skills joined by commas or alternatives, [skill ids of every span, alternative]
+    runs = []
+    end = 0
+    for start, stop, skill_ids in skills.spans(item):
+        gap = text[end:start]
+        if runs and ALTERNATIVE.search(gap):
+            runs[-1][1] = True
+            runs[-1][0].append(skill_ids)
+        elif runs and LIST.fullmatch(gap):
+            runs[-1][0].append(skill_ids)
+        else:
+            runs.append([[skill_ids], False])
+        end = stop
+    groups = []
+    for spans, alternative in runs:
+        groups.extend([set().union(*spans)] if alternative else spans)
+    return groups
+
+
+def declared_skills(resume_data: Mapping) -> List[str]:
+    """Skills the resume declares: technical skills, technologies used in every position and keywords"""
+    declared = list((resume_data.get('skills') or {}).get('technical') or [])
+    for exp in resume_data.get('work_experience') or []:
+        declared.extend(exp.get('technologies_used') or [])
+    declared.extend(resume_data.get('keywords') or [])
+    return declared
+
+
+class MustHaveFilter:
+    """rejects resumes missing a must-have skill of the job before any model runs, the declared skills of every
+    resume are a bitset over the skill taxonomy and the whole batch is checked with one AND and popcount per group
+
+    every must-have item is split into groups of skills (see must_have_groups), a group is met by any of its skills
+    and a resume passes when every group is met
+
+    must-have items without a taxonomy skill can not be checked, they are logged and ignored so no resume is
+    rejected for a skill the taxonomy does not know
+
+    usage:
+            prefilter = MustHaveFilter(skills, job_data.get('must_have_skills'))
+            passed, missing = prefilter.check(views)
+            result = prefilter.rejection(missing[i])
+    """
+    def __init__(self, skills: SkillTaxonomy, must_have: List[str] | None = None) -> None:
+        self.skills = skills
+        self.groups: List[Set[str]] = []
+        self.unknown = []
+        for name in must_have or []:
+            groups = must_have_groups(skills, name)
+            if not groups:
+                self.unknown.append(name)
+            self.groups.extend(group for group in groups if group not in self.groups)
+        if self.unknown:
+            logging.warning(f"must-have skills outside the skill taxonomy are not checked: {self.unknown}")
+        # one bitset row per group
+        self.bits = np.stack([skills.bitset(group) for group in self.groups]) if self.groups else np.zeros((0, skills.words), dtype=np.uint64)
+
+    def __bool__(self) -> bool:
+        return bool(self.groups)
+
+    def names(self) -> List[str]:
+        "display name of every group, alternatives joined with 'or'"
+        return [" or ".join(self.skills.names(group)) for group in self.groups]
+
+    def bitsets(self, views: List[ResumeTextView]) -> np.ndarray:
+        "declared skills of every resume, one uint64 bitset row per resume"
+        bits = np.zeros((len(views), self.skills.words), dtype=np.uint64)
+        for row, view in enumerate(views):
+            bits[row] = self.skills.bitset(self.skills.extract(" | ".join(declared_skills(view.data))))
+        return bits
+
+    def check(self, views: List[ResumeTextView]) -> tuple[np.ndarray, np.ndarray]:
+        """returns whether every resume meets all groups and, per resume, which groups it misses
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: passed of shape (resumes,), missed groups of shape (resumes, groups)
+        """
+        bits = self.bitsets(views)
+        missing = popcount(bits[:, None, :] & self.bits[None, :, :]) == 0
+        return ~missing.any(axis=1), missing
+
+    def rejection(self, missing: np.ndarray) -> Dict:
+        """result of a resume rejected by the filter, lists the groups it misses"""
+        names = [name for name, missed in zip(self.names(), missing) if missed]
+        coverage = (len(self.groups) - len(names)) / len(self.groups) * 100
+        return {
+            'overall_score': 0.0,
+            'score_breakdown': {
+                'must_have_coverage': coverage
+            },
+            'missing_skills': names,
+            'match_quality': 'Rejected',
+            'model_used': 'must-have-skills-filter',
+            'recommendation': f"Missing must-have skills: {', '.join(names)}"
+        }
+
+
+__all__ = ["MustHaveFilter"]
@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+import sys, threading
+
+
+# cascade order, a tier only runs for resumes that passed the threshold of the tier before it
+TIERS = ("MINILM", "MPNET", "ROBERTA")
+
+# score of the previous tier a resume must exceed to enter the tier
+DEFAULT_THRESHOLDS = {"MPNET": 30.0, "ROBERTA": 50.0}
+
+
+@dataclass
+class ScoringProfile:
+    """tiers the cascade may run and the latency budget of the scoring stage in ms, 0 means no budget
+
+    usage:
+            profile = ScoringProfile.resolve(ScoringConfig.PROFILES, "balanced")
+            profile = ScoringProfile.resolve(ScoringConfig.PROFILES, "thorough", budget_ms=800)
+    """
+    name:str = field(default="thorough")
+    tiers:List[str] = field(default_factory=lambda: list(TIERS))
+    budget_ms:float = field(default=0)
+
+    def __post_init__(self):
+        if not self.tiers or list(self.tiers) != list(TIERS[:len(self.tiers)]):
+            raise ValueError(f"\'tiers\' of profile \'{self.name}\' must be a prefix of {TIERS}, got {self.tiers}")
+        if self.budget_ms < 0:
+            raise ValueError(f"\'budget_ms\' of profile \'{self.name}\' must not be negative, got {self.budget_ms}")
+
+    @classmethod
+    def resolve(cls, profiles:Dict[str, Dict], name:str, budget_ms:float | None = None) -> "ScoringProfile":
+        """builds the named profile from config, an explicit budget replaces the budget of the profile
+
+        Args:
+            profiles (Dict[str, Dict]): profiles from config, name -> {TIERS, BUDGET_MS}
+            name (str): fast, balanced, thorough or any other configured profile
+            budget_ms (float | None, optional): latency budget of the request. Defaults to None.
+        """
+        if name not in profiles:
+            raise ValueError(f"unknown scoring profile \'{name}\', available profiles: {list(profiles)}")
+        profile = profiles[name]
+        return cls(
+            name=name,
+            tiers=list(profile["TIERS"]),
+            budget_ms=profile.get("BUDGET_MS", 0) if budget_ms is None else budget_ms
+        )
+
+
+class TierCosts:
+    """running estimate of the latency of every tier in ms per resume, exponentially weighted
+    over the batches scored so far and seeded with the latencies claimed for each tier"""
+    DEFAULTS = {"MINILM": 100.0, "MPNET": 300.0, "ROBERTA": 800.0}
+
+    def __init__(self, alpha:float = 0.2, defaults:Dict[str, float] | None = None) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError(f"\'alpha\' must be in (0, 1], got {alpha}")
+        self.__alpha = alpha
+        self.__ms_per_resume = dict(defaults or self.DEFAULTS)
+        self.__batches = {tier: 0 for tier in self.__ms_per_resume}
+        self.__lock = threading.Lock()
+
+    def estimate(self, tier:str, count:int) -> float:
+        "expected ms to score count resumes with tier"
+        with self.__lock:
+            return self.__ms_per_resume[tier] * count
+
+    def capacity(self, tier:str, ms:float) -> int:
+        "number of resumes tier is expected to score within ms"
+        with self.__lock:
+            return max(int(ms // self.__ms_per_resume[tier]), 0) if self.__ms_per_resume[tier] > 0 else sys.maxsize
+
+    def observe(self, tier:str, count:int, seconds:float) -> None:
+        "records a batch of count resumes scored by tier in seconds, the first measurement replaces the seed"
+        if count < 1:
+            return
+        ms = seconds * 1000 / count
+        with self.__lock:
+            if self.__batches[tier]:
+                ms = self.__alpha * ms + (1 - self.__alpha) * self.__ms_per_resume[tier]
+            self.__ms_per_resume[tier] = ms
+            self.__batches[tier] += 1
+
+    def report(self) -> Dict:
+        "returns estimated ms per resume and number of measured batches of every tier"
+        with self.__lock:
+            return {tier: {"ms_per_resume": self.__ms_per_resume[tier], "batches": self.__batches[tier]} for tier in self.__ms_per_resume}
+
+
+__all__ = ["ScoringProfile", "TierCosts", "TIERS", "DEFAULT_THRESHOLDS"]
@@ -0,0 +1,86 @@
+from typing import Dict, List, Tuple
+from .mpnet import MPNetResumeScorer
+from .minilm import MiniLMResumeScorer
+from .roberta import RoBERTaHybridScorer
+from .view import ResumeTextView
+from ..inference import ModelRegistry
+from ... import logging
+import numpy as np
+
+
+class ResumeRetriever:
+    """embeds resumes into the vector index of the registry and returns the resumes closest to a job description,
+    resumes are embedded with the texts of the scorer of INDEX_MODEL so embeddings already in its store are reused,
+    resumes and job descriptions share one embedding space so either can be searched with the other
+
+    usage:
+            retriever = ResumeRetriever(registry)
+            await retriever.add({"resume.pdf": resume_data})
+            hits = await retriever.search(job_data, k=20)       # [(id, name, similarity), ...]
+    """
+    def __init__(self, registry:ModelRegistry, key:str | None = None) -> None:
+        "key is the model embedding resumes and jobs, INDEX_MODEL when None"
+        self.index = registry.index
+        key = key or registry.config.INDEX_MODEL
+        encoder = registry.encoder(key)
+        # resume text of the view, its section name in the embedding store and job text of every model
+        if key == "MINILM":
+            scorer = MiniLMResumeScorer(encoder=encoder, skills=registry.skills)
+            self.__texts = (lambda view: " | ".join(view.sections), "retrieval", lambda job: " | ".join(scorer.create_job_sections(job)))
+        elif key == "MPNET":
+            scorer = MPNetResumeScorer(encoder=encoder, skills=registry.skills)
+            self.__texts = (lambda view: view.text, "overall", scorer.extract_job_text)
+        elif key == "ROBERTA":
+            scorer = RoBERTaHybridScorer(encoder=encoder, tfidf=registry.tfidf, skills=registry.skills)
+            self.__texts = (lambda view: view.comprehensive, "comprehensive", scorer.create_comprehensive_job_text)
+        else:
+            raise ValueError(f"no resume text defined for model \'{key}\'")
+        self.__scorer = scorer
+
+    async def add(self, resumes:Dict[str, Dict | ResumeTextView]) -> int:
+        """indexes resumes not indexed yet, resume data is stored as payload
+
+        Args:
+            resumes (Dict[str, Dict | ResumeTextView]): resume data or views with respect to file names
+
+        Returns:
+            int: number of resumes added
+        """
+        if self.index is None:
+            raise ValueError("vector index is disabled, enable INFERENCE.INDEX in config")
+        ids, names, views = [], [], []
+        for name, resume in resumes.items():
+            view = ResumeTextView.of(resume)
+            if view.hash not in self.index and view.hash not in ids:
+                ids.append(view.hash)
+                names.append(name)
+                views.append(view)
+        if not ids:
+            return 0
+        added = self.index.add(ids, names, await self.embed_resumes(views), [view.to_dict() for view in views])
+        logging.info(f"{added} resumes added to vector index, {len(self.index)} indexed")
+        return added
+
+    async def embed_resumes(self, resumes:List[Dict | ResumeTextView]) -> np.ndarray:
+        "embeddings of the resumes, one row per resume"
+        resume_text, section, _ = self.__texts
+        texts = [resume_text(ResumeTextView.of(resume)) for resume in resumes]
+        return await self.__scorer.encode(texts, [section] * len(texts))
+
+    async def embed_job(self, job_data:Dict) -> np.ndarray:
+        "embedding of the job description"
+        _, _, job_text = self.__texts
+        return (await self.__scorer.encode_job([job_text(job_data)]))[0]
+
+    async def search(self, job_data:Dict, k:int = 10) -> List[Tuple[str, str, float]]:
+        """returns up to k indexed resumes most similar to the job description
+
+        Returns:
+            List[Tuple[str, str, float]]: (id, file name, cosine similarity) by decreasing similarity
+        """
+        if self.index is None:
+            raise ValueError("vector index is disabled, enable INFERENCE.INDEX in config")
+        return self.index.search(await self.embed_job(job_data), k)
+
+
+__all__ = ["ResumeRetriever"]
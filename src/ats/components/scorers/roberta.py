@@ -1,114 +1,43 @@
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
-from typing import Dict, Set
+from typing import Dict, List, Set
+from .base import BaseScorer
+from .batch import ResumeBatch
+from .view import ResumeTextView, comprehensive_text
+from ..skills import SkillTaxonomy
+from ..inference import Encoder, RemoteEncoder, TfidfModel
 from ... import logging
 from ...exception import CustomException
+import asyncio
 import sys
-import re
 
-class RoBERTaHybridScorer:
-    def __init__(self):
-        # High-quality 1024-dimensional model
-        self.semantic_model = SentenceTransformer('sentence-transformers/all-roberta-large-v1')
-        self.tfidf_vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 3))
+# Weighted hybrid score, columns are summed in this order
+HYBRID_WEIGHTS = {
+    'semantic': 0.4,      # 40% - semantic understanding
+    'keyword': 0.3,       # 30% - keyword matching
+    'tfidf': 0.2,         # 20% - term frequency importance
+    'experience': 0.1     # 10% - experience level fit
+}
+
+class RoBERTaHybridScorer(BaseScorer):
+    def __init__(self, model: SentenceTransformer | None = None, encoder: Encoder | RemoteEncoder | None = None, tfidf: TfidfModel | None = None, skills: SkillTaxonomy | None = None):
+        # High-quality 1024-dimensional model, shared encoder or model is used when provided
+        super().__init__(encoder or Encoder("ROBERTA", model or SentenceTransformer('sentence-transformers/all-roberta-large-v1')), skills)
+        self.semantic_model = self.model
+        # corpus tf-idf shared across requests when provided, otherwise document frequencies cover this scorer's texts only
+        self.tfidf = tfidf or TfidfModel()
         
     def extract_keywords(self, text: str) -> Set[str]:
-        """Extract important keywords and phrases"""
+        """Extract canonical skill ids using the skill taxonomy"""
         try:
-            # Technical terms pattern
-            tech_pattern = r'\b(?:python|javascript|react|docker|kubernetes|aws|azure|gcp|ml|ai|api|sql|nosql|git|ci/cd|devops|microservices|fastapi|django|flask|pandas|numpy|tensorflow|pytorch|scikit|machine learning|deep learning|data science|backend|frontend|full.stack|senior|junior|lead|architect|engineer|developer|analyst|manager)\b'
-
-            keywords = set()
-
-            # Extract technical keywords
-            tech_matches = re.findall(tech_pattern, text.lower())
-            keywords.update(tech_matches)
-
-            # Extract skill-related phrases
-            skill_phrases = re.findall(r'\b(?:\w+(?:\s+\w+){0,2})\s+(?:experience|skills?|expertise|proficiency|knowledge|familiar)\b', text.lower())
-            keywords.update(skill_phrases)
-
-            return keywords
+            return self.extract_skills(text)
         except Exception as e:
             e = CustomException(e, sys)
             logging.error(e)
             raise e
     
-    def calculate_keyword_overlap(self, resume_text: str, job_text: str) -> float:
-        """Calculate keyword-based matching score"""
-        try:
-            resume_keywords = self.extract_keywords(resume_text)
-            job_keywords = self.extract_keywords(job_text)
-
-            if not job_keywords:
-                return 0.0
-
-            overlap = resume_keywords.intersection(job_keywords)
-            overlap_score = len(overlap) / len(job_keywords) if job_keywords else 0
-
-            return overlap_score * 100
-        except Exception as e:
-            if not isinstance(e, CustomException):
-                e = CustomException(e, sys)
-            logging.error(e)
-            raise e
-    
     def create_comprehensive_text(self, resume_data: Dict) -> str:
         """Create comprehensive text representation"""
-        try:
-            sections = []
-
-            # Professional identity
-            if resume_data.get('professional_summary'):
-                prof = resume_data['professional_summary']
-                if prof.get('headline'):
-                    sections.append(f"Professional role: {prof['headline']}")
-                if prof.get('summary'):
-                    sections.append(f"Professional summary: {prof['summary']}")
-                if prof.get('total_experience_years'):
-                    sections.append(f"Years of experience: {prof['total_experience_years']}")
-
-            # Detailed work experience
-            if resume_data.get('work_experience'):
-                for exp in resume_data['work_experience']:
-                    exp_parts = []
-                    if exp.get('title') and exp.get('company'):
-                        exp_parts.append(f"Worked as {exp['title']} at {exp['company']}")
-
-                    if exp.get('responsibilities'):
-                        exp_parts.append(f"Key responsibilities included: {' | '.join(exp['responsibilities'])}")
-
-                    if exp.get('achievements'):
-                        exp_parts.append(f"Key achievements: {' | '.join(exp['achievements'])}")
-
-                    if exp.get('technologies_used'):
-                        exp_parts.append(f"Technologies and tools used: {', '.join(exp['technologies_used'])}")
-
-                    if exp_parts:
-                        sections.append(' '.join(exp_parts))
-
-            # Comprehensive skills
-            if resume_data.get('skills'):
-                skills = resume_data['skills']
-                if skills.get('technical'):
-                    sections.append(f"Technical skills and expertise: {', '.join(skills['technical'])}")
-                if skills.get('soft'):
-                    sections.append(f"Soft skills and capabilities: {', '.join(skills['soft'])}")
-                if skills.get('certifications'):
-                    sections.append(f"Professional certifications: {', '.join(skills['certifications'])}")
-
-            # Educational background
-            if resume_data.get('education'):
-                for edu in resume_data['education']:
-                    if edu.get('degree') and edu.get('institution'):
-                        sections.append(f"Educational background: {edu['degree']} from {edu['institution']}")
-
-            return ' | '.join(sections)
-        except Exception as e:
-            e = CustomException(e, sys)
-            logging.error(e)
-            raise e
+        return comprehensive_text(resume_data)
         
     def create_comprehensive_job_text(self, job_data: Dict) -> str:
         """Create comprehensive job description text"""
@@ -130,83 +59,90 @@ class RoBERTaHybridScorer:
             logging.error(e)
             raise e
     
-    async def calculate_hybrid_score(self, resume_data: Dict, job_data: Dict) -> Dict:
-        """Advanced hybrid scoring combining semantic and keyword matching"""
+    def job_texts(self, job_data: Dict) -> List[str]:
+        return [self.create_comprehensive_job_text(job_data)]
+
+    def combine_scores(self, semantic_score: float, keyword_score: float, tfidf_similarity: float, experience_score: float, hybrid_score: float) -> Dict:
+        """Breakdown of the weighted hybrid score, the hybrid score is computed for the whole batch by ResumeBatch.weighted"""
+        return {
+            'overall_score': hybrid_score,
+            'score_breakdown': {
+                'semantic_similarity': semantic_score,
+                'keyword_overlap': keyword_score,
+                'tfidf_similarity': tfidf_similarity,
+                'experience_match': experience_score
+            },
+            'match_quality': 'Excellent' if hybrid_score > 80 else 'Good' if hybrid_score > 60 else 'Fair' if hybrid_score > 40 else 'Poor',
+            'model_used': 'all-roberta-large-v1-hybrid',
+            'recommendation': self._generate_recommendation(hybrid_score, {
+                'semantic_similarity': semantic_score,
+                'keyword_overlap': keyword_score,
+                'tfidf_similarity': tfidf_similarity,
+                'experience_match': experience_score
+            })
+        }
+    
+    async def calculate_hybrid_score_batch(self, resumes: List[Dict | ResumeTextView], job_data: Dict) -> List[Dict | Exception]:
+        """Hybrid scoring of every resume with one RoBERTa forward pass and one similarity op,
+        keyword, experience and hybrid scores of all resumes are computed column-wise on a ResumeBatch,
+        a resume that cannot be scored gets its exception in place of a result"""
         logging.info("In RoBERTa")
         try:
-            resume_text = self.create_comprehensive_text(resume_data)
-            job_text = self.create_comprehensive_job_text(job_data)
-
-            # 1. Semantic similarity using RoBERTa
-            resume_embedding = self.semantic_model.encode([resume_text])
-            job_embedding = self.semantic_model.encode([job_text])
-            semantic_score = float(cosine_similarity(resume_embedding, job_embedding)[0][0] * 100)
-
-            # 2. Keyword overlap score
-            keyword_score = self.calculate_keyword_overlap(resume_text, job_text)
-
-            # 3. TF-IDF based similarity (for term frequency importance)
-            try:
-                tfidf_matrix = self.tfidf_vectorizer.fit_transform([resume_text, job_text])
-                tfidf_similarity = float(cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0] * 100)
-            except:
-                tfidf_similarity = 0.0
-
-            # 4. Experience level matching
-            experience_score = 0.0
-            if resume_data.get('professional_summary', {}).get('total_experience_years'):
-                resume_exp = resume_data['professional_summary']['total_experience_years']
-                job_level = job_data['experience_level'].lower()
-
-                if job_level == 'entry' and resume_exp <= 2:
-                    experience_score = 100.0
-                elif job_level == 'junior' and 1 <= resume_exp <= 3:
-                    experience_score = 100.0
-                elif job_level == 'mid' and 3 <= resume_exp <= 6:
-                    experience_score = 100.0
-                elif job_level == 'senior' and resume_exp >= 5:
-                    experience_score = 100.0
-                else:
-                    # Partial scoring for close matches
-                    experience_score = max(0, 100 - abs(resume_exp - 5) * 10)  # Assume 5 years as baseline
-
-            # Weighted hybrid score
-            weights = {
-                'semantic': 0.4,      # 40% - semantic understanding
-                'keyword': 0.3,       # 30% - keyword matching
-                'tfidf': 0.2,         # 20% - term frequency importance
-                'experience': 0.1     # 10% - experience level fit
-            }
-
-            hybrid_score = (
-                semantic_score * weights['semantic'] +
-                keyword_score * weights['keyword'] +
-                tfidf_similarity * weights['tfidf'] +
-                experience_score * weights['experience']
-            )
+            job_text = self.job_texts(job_data)[0]
+
+            results: List[Dict | Exception | None] = [None] * len(resumes)
+            texts, views = {}, {}
+            for i, resume_data in enumerate(resumes):
+                try:
+                    views[i] = ResumeTextView.of(resume_data)
+                    texts[i] = views[i].comprehensive
+                except Exception as e:
+                    results[i] = e
+
+            if texts:
+                # 1. Semantic similarity using RoBERTa
+                resume_embeddings, job_embeddings = await asyncio.gather(self.encode(list(texts.values()), ["comprehensive"] * len(texts)), self.encode_job([job_text]))
+                semantic_scores = self.rowwise(resume_embeddings, job_embeddings) * 100
+
+                # 3. TF-IDF based similarity (for term frequency importance), all resumes in one sparse product
+                try:
+                    tfidf_scores = self.tfidf.similarity(list(texts.values()), job_text) * 100
+                except Exception as e:
+                    logging.error(str(CustomException(e, sys)))
+                    tfidf_scores = [0.0] * len(texts)
+
+                batch = ResumeBatch.of([views[i] for i in texts], self.skills)
+                batch.columns['semantic'] = semantic_scores
+                batch.columns['tfidf'] = tfidf_scores
+                # 2. Keyword overlap score, job skills against the skill bitset of every resume
+                batch.columns['keyword'] = batch.keyword_scores(self.skills.bitset(self.extract_keywords(job_text)))
+                # 4. Experience level matching
+                batch.columns['experience'] = batch.experience_scores(job_data['experience_level'])
+                hybrid_scores = batch.weighted(HYBRID_WEIGHTS)
+
+                for row, i in enumerate(texts):
+                    if row in batch.errors:
+                        results[i] = batch.errors[row]
+                        continue
+                    columns = batch.columns
+                    results[i] = self.combine_scores(
+                        float(columns['semantic'][row]), float(columns['keyword'][row]), float(columns['tfidf'][row]), float(columns['experience'][row]),
+                        hybrid_score=float(hybrid_scores[row])
+                    )
             logging.info("Out RoBERTa")
-            return {
-                'overall_score': hybrid_score,
-                'score_breakdown': {
-                    'semantic_similarity': semantic_score,
-                    'keyword_overlap': keyword_score,
-                    'tfidf_similarity': tfidf_similarity,
-                    'experience_match': experience_score
-                },
-                'match_quality': 'Excellent' if hybrid_score > 80 else 'Good' if hybrid_score > 60 else 'Fair' if hybrid_score > 40 else 'Poor',
-                'model_used': 'all-roberta-large-v1-hybrid',
-                'recommendation': self._generate_recommendation(hybrid_score, {
-                    'semantic_similarity': semantic_score,
-                    'keyword_overlap': keyword_score,
-                    'tfidf_similarity': tfidf_similarity,
-                    'experience_match': experience_score
-                })
-            }
+            return results
         except Exception as e:
             if not isinstance(e, CustomException):
                 e = CustomException(e, sys)
             logging.error(e)
             raise e
+    
+    async def calculate_hybrid_score(self, resume_data: Dict | ResumeTextView, job_data: Dict) -> Dict:
+        """Advanced hybrid scoring combining semantic and keyword matching"""
+        result = (await self.calculate_hybrid_score_batch([resume_data], job_data))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
         
     def _generate_recommendation(self, overall_score: float, breakdown: Dict) -> str:
         """Generate actionable recommendations"""
@@ -0,0 +1,251 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
+from pydantic import BaseModel
+from .cache import ScoreCache
+from ... import logging
+from ...exception import CustomException
+import sys
+
+
+def resume_sections(resume_data: Dict) -> List[str]:
+    """Focused sections of MiniLM: technical skills, titles and technologies, profile"""
+    try:
+        sections = []
+
+        # Core skills section
+        if resume_data.get('skills'):
+            if resume_data.get('skills', {}).get('technical'):
+                sections.append(f"Technical expertise: {', '.join(resume_data['skills']['technical'])}")
+                logging.info("skills extracted")
+            else:
+                logging.info(f"skills = \'{resume_data.get("skills")}\'")
+
+        # Professional experience section
+        if resume_data.get('work_experience'):
+            exp_summary = []
+            for exp in resume_data['work_experience']:
+                if exp.get('title'):
+                    exp_summary.append(f"{exp['title']}")
+                if exp.get('technologies_used'):
+                    exp_summary.append(f"using {', '.join(exp['technologies_used'])}")
+            if exp_summary:
+                sections.append(f"Experience: {' '.join(exp_summary)}")
+                logging.info("work experience")
+
+        # Professional summary
+        if resume_data.get('professional_summary', {}).get('summary'):
+            sections.append(f"Profile: {resume_data['professional_summary']['summary']}")
+            logging.info("professional summary extracted")
+
+        return sections
+    except Exception as e:
+        e = CustomException(e, sys)
+        logging.error(e)
+        raise e
+
+
+def resume_text(resume_data: Dict) -> str:
+    """Whole resume text of MPNet"""
+    try:
+        text_parts = []
+
+        # Personal info
+        if resume_data.get('personal_info'):
+            if resume_data['personal_info'].get('name'):
+                text_parts.append(f"Name: {resume_data['personal_info']['name']}")
+
+        # Professional summary
+        if resume_data.get('professional_summary'):
+            prof_summary = resume_data['professional_summary']
+            if prof_summary.get('headline'):
+                text_parts.append(f"Professional Title: {prof_summary['headline']}")
+            if prof_summary.get('summary'):
+                text_parts.append(f"Summary: {prof_summary['summary']}")
+            if prof_summary.get('total_experience_years'):
+                text_parts.append(f"Experience: {prof_summary['total_experience_years']} years")
+
+        # Work experience
+        if resume_data.get('work_experience'):
+            for exp in resume_data['work_experience']:
+                if exp.get('title') and exp.get('company'):
+                    text_parts.append(f"Position: {exp['title']} at {exp['company']}")
+                if exp.get('responsibilities'):
+                    text_parts.extend([f"Responsibility: {resp}" for resp in exp['responsibilities']])
+                if exp.get('technologies_used'):
+                    text_parts.append(f"Technologies: {', '.join(exp['technologies_used'])}")
+
+        # Skills
+        if resume_data.get('skills'):
+            if resume_data['skills'].get('technical'):
+                text_parts.append(f"Technical Skills: {', '.join(resume_data['skills']['technical'])}")
+            if resume_data['skills'].get('certifications'):
+                text_parts.append(f"Certifications: {', '.join(resume_data['skills']['certifications'])}")
+
+        # Education
+        if resume_data.get('education'):
+            for edu in resume_data['education']:
+                if edu.get('degree') and edu.get('institution'):
+                    text_parts.append(f"Education: {edu['degree']} from {edu['institution']}")
+
+        return " | ".join(text_parts)
+    except Exception as e:
+        e = CustomException(e, sys)
+        logging.error(e)
+        raise e
+
+
+def section_texts(resume_data: Dict) -> Dict[str, str]:
+    """Texts for section-wise scoring of MPNet, keys: skills, experience"""
+    try:
+        texts = {}
+
+        # Skills matching
+        if resume_data.get('skills') and resume_data['skills'].get('technical'):
+            texts['skills'] = f"Skills: {', '.join(resume_data['skills']['technical'])}"
+
+        # Experience matching
+        if resume_data.get('work_experience'):
+            exp_texts = []
+            for exp in resume_data['work_experience']:
+                if exp.get('responsibilities'):
+                    exp_texts.extend(exp['responsibilities'])
+
+            if exp_texts:
+                texts['experience'] = " | ".join(exp_texts)
+
+        return texts
+    except Exception as e:
+        e = CustomException(e, sys)
+        logging.error(e)
+        raise e
+
+
+def comprehensive_text(resume_data: Dict) -> str:
+    """Comprehensive text representation of RoBERTa"""
+    try:
+        sections = []
+
+        # Professional identity
+        if resume_data.get('professional_summary'):
+            prof = resume_data['professional_summary']
+            if prof.get('headline'):
+                sections.append(f"Professional role: {prof['headline']}")
+            if prof.get('summary'):
+                sections.append(f"Professional summary: {prof['summary']}")
+            if prof.get('total_experience_years'):
+                sections.append(f"Years of experience: {prof['total_experience_years']}")
+
+        # Detailed work experience
+        if resume_data.get('work_experience'):
+            for exp in resume_data['work_experience']:
+                exp_parts = []
+                if exp.get('title') and exp.get('company'):
+                    exp_parts.append(f"Worked as {exp['title']} at {exp['company']}")
+
+                if exp.get('responsibilities'):
+                    exp_parts.append(f"Key responsibilities included: {' | '.join(exp['responsibilities'])}")
+
+                if exp.get('achievements'):
+                    exp_parts.append(f"Key achievements: {' | '.join(exp['achievements'])}")
+
+                if exp.get('technologies_used'):
+                    exp_parts.append(f"Technologies and tools used: {', '.join(exp['technologies_used'])}")
+
+                if exp_parts:
+                    sections.append(' '.join(exp_parts))
+
+        # Comprehensive skills
+        if resume_data.get('skills'):
+            skills = resume_data['skills']
+            if skills.get('technical'):
+                sections.append(f"Technical skills and expertise: {', '.join(skills['technical'])}")
+            if skills.get('soft'):
+                sections.append(f"Soft skills and capabilities: {', '.join(skills['soft'])}")
+            if skills.get('certifications'):
+                sections.append(f"Professional certifications: {', '.join(skills['certifications'])}")
+
+        # Educational background
+        if resume_data.get('education'):
+            for edu in resume_data['education']:
+                if edu.get('degree') and edu.get('institution'):
+                    sections.append(f"Educational background: {edu['degree']} from {edu['institution']}")
+
+        return ' | '.join(sections)
+    except Exception as e:
+        e = CustomException(e, sys)
+        logging.error(e)
+        raise e
+
+
+def freeze(value):
+    "read only copy of resume data, mappings become mapping proxies and lists tuples at every depth"
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    "plain dicts and lists of data read only by freeze"
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class ResumeTextView:
+    """every text the scoring tiers, the result cache and the vector index derive from a structured resume,
+    built once per resume and read by all of them instead of walking the resume data again
+
+    usage:
+            view = ResumeTextView.of(resume_schema)         # or resume data, a view is returned as is
+            view.sections, view.text, view.comprehensive, view.hash
+            payload = view.to_dict()                        # plain resume data, e.g. to persist it
+    """
+    # canonical hash of the resume data, resume key of the result cache and document id of the vector index
+    hash: str
+    # structured resume data, read only at every depth
+    data: Mapping
+    # MiniLM sections
+    sections: Tuple[str, ...]
+    # MPNet whole resume text and its named sections (skills, experience)
+    text: str
+    section_texts: Tuple[Tuple[str, str], ...]
+    # RoBERTa comprehensive text
+    comprehensive: str
+    # whitespace separated word counts of sections (all of them), text and comprehensive
+    words: Mapping[str, int]
+
+    @classmethod
+    def of(cls, resume: "BaseModel | Dict | ResumeTextView") -> "ResumeTextView":
+        "builds the view of a ResumeSchema or of resume data, walking the resume once for every text"
+        if isinstance(resume, cls):
+            return resume
+        data = resume.model_dump() if isinstance(resume, BaseModel) else resume
+        sections = tuple(resume_sections(data))
+        text = resume_text(data)
+        comprehensive = comprehensive_text(data)
+        return cls(
+            hash=ScoreCache.canonical_hash(data),
+            data=freeze(data),
+            sections=sections,
+            text=text,
+            section_texts=tuple(section_texts(data).items()),
+            comprehensive=comprehensive,
+            words=MappingProxyType({
+                "sections": sum(len(section.split()) for section in sections),
+                "text": len(text.split()),
+                "comprehensive": len(comprehensive.split())
+            })
+        )
+
+    def to_dict(self) -> Dict:
+        "copy of the resume data as plain dicts and lists"
+        return thaw(self.data)
+
+
+__all__ = ["ResumeTextView"]
@@ -1,7 +1,8 @@
-from .scorers import *
 from .. import logging
 from ..entity import Scoring
 from ..components.schema import *
+from .inference import ModelRegistry
+from .scorers import MiniLMResumeScorer, ResumeScorer, ResumeRetriever, ResumeTextView, ScoreCache, ScoringProfile, TierCosts
 from ..exception import CustomException
 from ..utils import awrite_json
 from typing import Dict
@@ -13,8 +14,18 @@ import sys
 
 
 class ScoringComponents:
-    def __init__(self, config:Scoring, resume_data:Dict[str, ResumeSchema], job_data:JobDescription, info:Dict[str, FileInfo]) -> None:
+    def __init__(self, config:Scoring, resume_data:Dict[str, ResumeTextView], job_data:JobDescription, info:Dict[str, FileInfo], registry:ModelRegistry | None = None, cache:ScoreCache | None = None, profile:ScoringProfile | None = None, costs:TierCosts | None = None) -> None:
+        """if registry is None, models will be loaded for this execution only
+        if cache is None and caching is enabled in config, only the on-disk tier of the result cache is shared across executions
+        if profile is None, the default profile of config is used
+        if costs is None, tier latencies are measured for this execution only"""
         self.__config = config
+        self.__registry = registry
+        self.__profile = profile or ScoringProfile.resolve(config.PROFILES, config.DEFAULT_PROFILE)
+        self.__costs = costs
+        if cache is None and config.CACHE_ENABLED:
+            cache = ScoreCache(config.CACHE_MAX_ENTRIES, config.CACHE_DIR_PATH)
+        self.__cache = cache
         self.__resume_data = resume_data
         self.__jd = job_data
         self.__info = info
@@ -24,22 +35,74 @@ class ScoringComponents:
         return self.__main().__await__()
     
     async def __score(self):
-        scoring_tasks = []
+        resumes = []
         scoring_True_files = []
+        scores = {}
         try:
-            scorer = ResumeScorer()
+            job_data = self.__jd.model_dump()
+            version = ResumeScorer.version(self.__registry, self.__config.THRESHOLDS)
+            job_hash = ScoreCache.canonical_hash(job_data)
+            keys = {}
+            indexed = {}
             for name in self.__info:
                 info = self.__info.get(name)
-                resume_data = self.__resume_data[name]
+                if info.status and info.skipped:
+                    # not structured, its raw text pre-score is its result
+                    scores[name] = MiniLMResumeScorer.skipped_result(info.prescore)
+                    continue
                 if info.status:
-                    scoring_tasks.append(asyncio.create_task(scorer.score(resume_data.model_dump(), self.__jd.model_dump())))
+                    # texts and hash of the resume built by the transformation, read by every tier, the result cache and the vector index
+                    try:
+                        resume = self.__resume_data[name]
+                    except Exception as e:
+                        scores[name] = e
+                        continue
+                    indexed[name] = resume
+                    # results of a resume already scored against this job by the same scorer version are reused
+                    if self.__cache:
+                        keys[name] = self.__cache.key(resume.hash, job_hash, version)
+                        cached = await self.__cache.get(keys[name])
+                        if cached is not None:
+                            info.cached = True
+                            scores[name] = cached
+                            self.__info[name] = info
+                            continue
+                    resumes.append(resume)
                     scoring_True_files.append(name)
-            # wait for scorings 
-            scores = await asyncio.gather(*scoring_tasks, return_exceptions=True)
+            logging.info(f"{len(scores)} cached scores, {len(resumes)} resumes to score with profile '{self.__profile.name}'")
+            scorer = None
+            if resumes:
+                # score all resumes together, each tier runs one batch for its survivors 
+                scorer = ResumeScorer(self.__registry, self.__config.THRESHOLDS, self.__costs)
+                try:
+                    results = await scorer.score_batch(resumes, job_data, self.__profile)
+                except Exception as e:
+                    results = [e] * len(resumes)
+                cache_tasks = []
+                for name, score in list(zip(scoring_True_files, results)):
+                    scores[name] = score
+                    # results cut short by the profile or budget are not cached, a cached result is the full cascade outcome
+                    if self.__cache and not isinstance(score, Exception) and not score["tiers_skipped"]:
+                        cache_tasks.append(asyncio.create_task(self.__cache.put(keys[name], score)))
+                await asyncio.gather(*cache_tasks)
+            # scored resumes and the job description join the tf-idf corpus afterwards, corpus failures do not fail scoring
+            if self.__registry and self.__registry.tfidf is not None and indexed:
+                try:
+                    scorer = scorer or ResumeScorer(self.__registry, self.__config.THRESHOLDS, self.__costs)
+                    added = await asyncio.to_thread(scorer.update_corpus, list(indexed.values()), job_data)
+                    logging.info(f"{added} documents added to tf-idf corpus, {self.__registry.tfidf.documents} counted")
+                except Exception as e:
+                    logging.error(str(CustomException(e, sys)))
+            # every resume joins the corpus searched by ranking, indexing failures do not fail scoring
+            if self.__registry and self.__registry.index is not None and indexed:
+                try:
+                    await ResumeRetriever(self.__registry).add(indexed)
+                except Exception as e:
+                    logging.error(str(CustomException(e, sys)))
             # update info and append scores to instance variable with respect to file name and create save tasks
             save_tasks = []
             save_True_files = []
-            for name, score in list(zip(scoring_True_files, scores)):
+            for name, score in scores.items():
                 info = self.__info.get(name)
                 if isinstance(score, Exception):
                     info.status = False
@@ -72,7 +135,9 @@ class ScoringComponents:
         """returns a dict for calculated scores with recommendation, key = file name, value = dict of scores and other info
         """
         logging.info("In Scoring")
-        if self.__resume_data and self.__jd:
+        # resumes skipped by the pre-score have no structured data but still get their pre-score as result
+        skipped = any(info.status and info.skipped for info in self.__info.values())
+        if self.__jd and (self.__resume_data or skipped):
             # get scores and persist it to disk 
             await self.__score()
             # save info 
@@ -0,0 +1,3 @@
+# update __all__
+
+from .taxonomy import *
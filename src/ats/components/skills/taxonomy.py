@@ -0,0 +1,148 @@
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+from ...utils import get_hash
+from ... import logging
+import numpy as np
+import json, re
+
+
+# skill dictionary shipped with the package, skill id -> name, category and aliases matched in text
+TAXONOMY_PATH = Path(__file__).parent.joinpath("taxonomy.json")
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def popcount(bits:np.ndarray) -> np.ndarray:
+    "number of set bits of every bitset, the last axis holds its 64 bit words"
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+    return np.unpackbits(np.ascontiguousarray(bits).view(np.uint8), axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+class SkillTaxonomy:
+    """dictionary of canonical skills and their aliases compiled into an Aho-Corasick automaton,
+    every alias of every skill is found in one pass over the text whatever the size of the dictionary,
+    matches are only kept on word boundaries so 'java' is not found inside 'javascript', and only the leftmost-longest
+    of overlapping matches is kept so the 'js' of 'node.js' is not found as javascript
+
+    usage:
+            skills = SkillTaxonomy.default()
+            skills.extract("5 years of Python, k8s and CI/CD")    # {"python", "kubernetes", "ci_cd"}
+            skills.bitset({"python", "kubernetes"})               # one bit per skill id, compared with AND and popcount
+    """
+    def __init__(self, skills:Dict[str, Dict]) -> None:
+        """
+        Args:
+            skills (Dict[str, Dict]): skill id -> {"name": str, "category": str, "aliases": List[str]}, aliases are matched case insensitive
+        """
+        self.skills = skills
+        self.version = get_hash(json.dumps(skills, sort_keys=True))[:16]
+        # bit of every skill id in bitsets, 64 skills per uint64 word
+        self.bits = {skill_id: bit for bit, skill_id in enumerate(skills)}
+        self.words = max((len(skills) + 63) // 64, 1)
+        # goto transitions, failure links and (alias length, skill id) outputs of every state
+        self.__goto:List[Dict[str, int]] = [{}]
+        self.__fail:List[int] = [0]
+        self.__out:List[List[Tuple[int, str]]] = [[]]
+        for skill_id, skill in skills.items():
+            for alias in skill["aliases"]:
+                self.__add(self.normalize(alias), skill_id)
+        self.__link()
+        logging.info(f"compiled skill taxonomy of {len(skills)} skills into {len(self.__goto)} states")
+
+    @staticmethod
+    def normalize(text:str) -> str:
+        return WHITESPACE.sub(" ", text.lower())
+
+    def __add(self, alias:str, skill_id:str) -> None:
+        if not alias:
+            return
+        state = 0
+        for char in alias:
+            if char not in self.__goto[state]:
+                self.__goto.append({})
+                self.__fail.append(0)
+                self.__out.append([])
+                self.__goto[state][char] = len(self.__goto) - 1
+            state = self.__goto[state][char]
+        self.__out[state].append((len(alias), skill_id))
+
+    def __link(self) -> None:
+        "breadth first failure links, outputs of the failure state are inherited so matches ending together are reported together"
+        queue = deque(self.__goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.__goto[state].items():
+                queue.append(child)
+                fail = self.__fail[state]
+                while fail and char not in self.__goto[fail]:
+                    fail = self.__fail[fail]
+                self.__fail[child] = self.__goto[fail].get(char, 0)
+                self.__out[child] = self.__out[child] + self.__out[self.__fail[child]]
+
+    def extract(self, text:str) -> Set[str]:
+        """returns ids of every skill with an alias in the text, an alias nested in or overlapping a longer match
+        starting at or before it is not reported"""
+        return {skill_id for _, _, skill_ids in self.spans(text) for skill_id in skill_ids}
+
+    def spans(self, text:str) -> List[Tuple[int, int, Set[str]]]:
+        """leftmost-longest matches as (start, end, skill ids) in text order, offsets are into the normalized text
+        and skills sharing a span are reported together"""
+        text = self.normalize(text)
+        matches = []
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in self.__goto[state]:
+                state = self.__fail[state]
+            state = self.__goto[state].get(char, 0)
+            for length, skill_id in self.__out[state]:
+                start = end - length
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    matches.append((start, end, skill_id))
+        # leftmost-longest, skills sharing the chosen span are all kept
+        spans = []
+        for start, end, skill_id in sorted(matches, key=lambda match: (match[0], -match[1])):
+            if not spans or start >= spans[-1][1]:
+                spans.append((start, end, {skill_id}))
+            elif (start, end) == spans[-1][:2]:
+                spans[-1][2].add(skill_id)
+        return spans
+
+    def bitset(self, skill_ids:Set[str]) -> np.ndarray:
+        "bitset of the skill ids as uint64 words, ids outside the taxonomy are ignored"
+        bits = np.zeros(self.words, dtype=np.uint64)
+        for skill_id in skill_ids:
+            if skill_id in self.bits:
+                bit = self.bits[skill_id]
+                bits[bit >> 6] |= np.uint64(1 << (bit & 63))
+        return bits
+
+    def names(self, skill_ids:Set[str]) -> List[str]:
+        "display names of the skill ids, sorted"
+        return sorted(self.skills[skill_id]["name"] for skill_id in skill_ids)
+
+    def report(self) -> Dict:
+        "returns dictionary size and version"
+        return {
+            "version": self.version,
+            "skills": len(self.skills),
+            "aliases": sum(len(skill["aliases"]) for skill in self.skills.values()),
+            "states": len(self.__goto)
+        }
+
+    @classmethod
+    def load(cls, path:Path = TAXONOMY_PATH) -> "SkillTaxonomy":
+        "builds the taxonomy from a json file of {\"skills\": {skill id: {name, category, aliases}}}"
+        with open(path, encoding="utf-8") as file:
+            return cls(json.load(file)["skills"])
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def default() -> "SkillTaxonomy":
+        "taxonomy shipped with the package, compiled once per process"
+        return SkillTaxonomy.load()
+
+
+__all__ = ["SkillTaxonomy", "TAXONOMY_PATH", "popcount"]
@@ -8,11 +8,13 @@ import os
 
 
 
-constants = load_constants(["DataIngestion", "DataTransformation", "JobDescription", "Scoring"])
+constants = load_constants(["DataIngestion", "DataTransformation", "JobDescription", "Scoring", "Inference", "Runtime"])
 ingestion = constants["DataIngestion"]
 transformation = constants["DataTransformation"]
 jd = constants["JobDescription"]
 scoring = constants["Scoring"]
+inference = constants["Inference"]
+runtime = constants["Runtime"]
 
 
 DataIngestionConfig = DataIngestion(
@@ -67,6 +69,8 @@ DataTransformationConfig = DataTransformation(
         transformation.DATA_ROOT_DIR_NAME, 
         transformation.TRANSFORMATION_ROOT_DIR_NAME, 
         transformation.OUTPUT_DIR_NAME)),
+    PRESCORE_ENABLED = transformation.PRESCORE_ENABLED,
+    PRESCORE_SKIP_BELOW = transformation.PRESCORE_SKIP_BELOW
 )
 
 JobDescriptionConfig = JobDescription(
@@ -75,7 +79,14 @@ JobDescriptionConfig = JobDescription(
     JD_ROOT_DIR_PATH = Path(os.path.join(
         jd.ROOT_DIR_NAME,
         jd.JD_ROOT_DIR_NAME
-    ))
+    )),
+    CATALOG_ENABLED = jd.CATALOG_ENABLED,
+    CATALOG_DIR_PATH = Path(os.path.join(
+        jd.ROOT_DIR_NAME,
+        jd.JD_ROOT_DIR_NAME,
+        jd.CATALOG_DIR_NAME
+    )),
+    CATALOG_TOP_N = jd.CATALOG_TOP_N
 )
 
 ScoringConfig = Scoring(
@@ -94,8 +105,114 @@ ScoringConfig = Scoring(
         scoring.ROOT_DIR_NAME,
         scoring.SCORES_ROOT_DIR_NAME,
         scoring.OUTPUT_DIR_NAME
-    ))
+    )),
+    CACHE_ENABLED = scoring.CACHE_ENABLED,
+    CACHE_MAX_ENTRIES = scoring.CACHE_MAX_ENTRIES,
+    CACHE_DIR_PATH = Path(os.path.join(
+        scoring.ROOT_DIR_NAME,
+        scoring.SCORES_ROOT_DIR_NAME,
+        scoring.CACHE_DIR_NAME
+    )),
+    THRESHOLDS = scoring.THRESHOLDS,
+    DEFAULT_PROFILE = scoring.DEFAULT_PROFILE,
+    PROFILES = scoring.PROFILES
+)
+InferenceConfig = Inference(
+    TIME_STAMP = inference.TIME_STAMP,
+    ROOT_DIR_PATH = Path(inference.ROOT_DIR_NAME),
+    INFERENCE_ROOT_DIR_PATH = Path(os.path.join(
+        inference.ROOT_DIR_NAME,
+        inference.INFERENCE_ROOT_DIR_NAME
+    )),
+    MODELS = inference.MODELS,
+    BACKENDS = inference.BACKENDS,
+    ONNX_DIR_PATH = Path(os.path.join(
+        inference.ROOT_DIR_NAME,
+        inference.INFERENCE_ROOT_DIR_NAME,
+        inference.ONNX_DIR_NAME
+    )),
+    ONNX_QUANTIZATION = inference.ONNX_QUANTIZATION,
+    EXECUTOR_WORKERS = inference.EXECUTOR_WORKERS,
+    EXECUTOR_MAX_QUEUE = inference.EXECUTOR_MAX_QUEUE,
+    POOL_ENABLED = inference.POOL_ENABLED,
+    POOL_WORKERS = inference.POOL_WORKERS,
+    POOL_BUFFER_MB = inference.POOL_BUFFER_MB,
+    TUNING_ENABLED = inference.TUNING_ENABLED,
+    TUNING_ON_STARTUP = inference.TUNING_ON_STARTUP,
+    TUNING_FILE_PATH = Path(os.path.join(
+        inference.ROOT_DIR_NAME,
+        inference.INFERENCE_ROOT_DIR_NAME,
+        inference.TUNING_FILE_NAME
+    )),
+    TUNING_CANDIDATES = inference.TUNING_CANDIDATES,
+    TUNING_TOLERANCE = inference.TUNING_TOLERANCE,
+    TUNING_MIN_SECONDS = inference.TUNING_MIN_SECONDS,
+    MANAGER_ENABLED = inference.MANAGER_ENABLED,
+    MANAGER_BUDGET_MB = inference.MANAGER_BUDGET_MB,
+    MANAGER_META_FILE_PATH = Path(os.path.join(
+        inference.ROOT_DIR_NAME,
+        inference.INFERENCE_ROOT_DIR_NAME,
+        inference.MANAGER_META_FILE_NAME
+    )),
+    SIDECAR_ENABLED = inference.SIDECAR_ENABLED,
+    SIDECAR_SOCKET_PATH = Path(os.path.join(
+        inference.ROOT_DIR_NAME,
+        inference.INFERENCE_ROOT_DIR_NAME,
+        inference.SIDECAR_SOCKET_NAME
+    )),
+    SIDECAR_CONNECTIONS = inference.SIDECAR_CONNECTIONS,
+    SIDECAR_TIMEOUT_S = inference.SIDECAR_TIMEOUT_S,
+    BATCHING_ENABLED = inference.BATCHING_ENABLED,
+    BATCHING_WINDOW_MS = inference.BATCHING_WINDOW_MS,
+    BATCHING_MAX_BATCH_SIZE = inference.BATCHING_MAX_BATCH_SIZE,
+    CHUNKING_ENABLED = inference.CHUNKING_ENABLED,
+    CHUNKING_OVERLAP_TOKENS = inference.CHUNKING_OVERLAP_TOKENS,
+    CHUNKING_MAX_BATCH_TOKENS = inference.CHUNKING_MAX_BATCH_TOKENS,
+    CACHE_ENABLED = inference.CACHE_ENABLED,
+    CACHE_MAX_ENTRIES = inference.CACHE_MAX_ENTRIES,
+    CACHE_SPILL = inference.CACHE_SPILL,
+    CACHE_DIR_PATH = Path(os.path.join(
+        inference.ROOT_DIR_NAME,
+        inference.INFERENCE_ROOT_DIR_NAME,
+        inference.CACHE_DIR_NAME
+    )),
+    STORE_ENABLED = inference.STORE_ENABLED,
+    STORE_DIR_PATH = Path(os.path.join(
+        inference.ROOT_DIR_NAME,
+        inference.INFERENCE_ROOT_DIR_NAME,
+        inference.STORE_DIR_NAME
+    )),
+    STORE_DTYPE = inference.STORE_DTYPE,
+    TFIDF_ENABLED = inference.TFIDF_ENABLED,
+    TFIDF_DIR_PATH = Path(os.path.join(
+        inference.ROOT_DIR_NAME,
+        inference.INFERENCE_ROOT_DIR_NAME,
+        inference.TFIDF_DIR_NAME
+    )),
+    TFIDF_N_FEATURES = inference.TFIDF_N_FEATURES,
+    INDEX_ENABLED = inference.INDEX_ENABLED,
+    INDEX_MODEL = inference.INDEX_MODEL,
+    INDEX_DIR_PATH = Path(os.path.join(
+        inference.ROOT_DIR_NAME,
+        inference.INFERENCE_ROOT_DIR_NAME,
+        inference.INDEX_DIR_NAME
+    )),
+    INDEX_MODE = inference.INDEX_MODE,
+    INDEX_NLIST = inference.INDEX_NLIST,
+    INDEX_NPROBE = inference.INDEX_NPROBE,
+    INDEX_MIN_TRAIN = inference.INDEX_MIN_TRAIN
 )
+
+RuntimeConfig = Runtime(
+    TIME_STAMP = runtime.TIME_STAMP,
+    TORCH_INTRA_OP_THREADS = runtime.TORCH_INTRA_OP_THREADS,
+    TORCH_INTER_OP_THREADS = runtime.TORCH_INTER_OP_THREADS,
+    OMP_NUM_THREADS = runtime.OMP_NUM_THREADS,
+    MKL_NUM_THREADS = runtime.MKL_NUM_THREADS,
+    INFERENCE_CPUS = runtime.INFERENCE_CPUS,
+    DEFAULT_EXECUTOR_WORKERS = runtime.DEFAULT_EXECUTOR_WORKERS
+)
+
 CloudPushConfig = CloudPush(
     # format = {local/path/to/the/folder|file.txt: cloud/path/to/the/folder|file.txt, ...}
     # make sure to create all folders on cloud
@@ -109,4 +226,4 @@ CloudPushConfig = CloudPush(
     }
 )
 
-__all__ = ["DataIngestionConfig", "DataTransformationConfig", "JobDescriptionConfig", "ScoringConfig", "CloudPushConfig"]
\ No newline at end of file
+__all__ = ["DataIngestionConfig", "DataTransformationConfig", "JobDescriptionConfig", "ScoringConfig", "InferenceConfig", "RuntimeConfig", "CloudPushConfig"]
\ No newline at end of file
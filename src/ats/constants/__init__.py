@@ -7,14 +7,29 @@ from typing import Dict
 from .values import *
 
 
-async def get_config(path):
+def merge(config:Dict, override:Dict) -> Dict:
+    """recursively updates config with values of override"""
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(config.get(key), dict):
+            merge(config[key], value)
+        else:
+            config[key] = value
+    return config
+
+async def get_config(path, override_path=None):
     async with aiofiles.open(path) as f:
         content = await f.read()
     dict_content = await asyncio.get_event_loop().run_in_executor(None, yaml.safe_load, content)
+    if override_path and os.path.isfile(override_path):
+        async with aiofiles.open(override_path) as f:
+            content = await f.read()
+        merge(dict_content, await asyncio.get_event_loop().run_in_executor(None, yaml.safe_load, content) or {})
     return ConfigBox(dict_content)
 
 path = os.path.join("src", "ats", "config", "raw", "config.yaml")
-CONFIG = asyncio.run(get_config(path))
+# values written by tools, eg: tier thresholds by src.ats.tools.calibrate, take precedence over config.yaml 
+calibration_path = os.path.join("src", "ats", "config", "raw", "calibration.yaml")
+CONFIG = asyncio.run(get_config(path, calibration_path))
 
 def load_constants(name: str | list[str] | tuple[str]) -> Dict:
     """loads respective constants for the given name
@@ -22,7 +37,7 @@ def load_constants(name: str | list[str] | tuple[str]) -> Dict:
     Args:
         name (str | list[str] | tuple[str]): name of required object 
 
-        Note: Available names --> DataIngestion, DataTransformation, JobDescription, Scoring
+        Note: Available names --> DataIngestion, DataTransformation, JobDescription, Scoring, Inference, Runtime
 
     Returns:
         Dict: key = name of object used to load given in variable \'name\', 
@@ -37,4 +52,4 @@ def load_constants(name: str | list[str] | tuple[str]) -> Dict:
     return load(CONFIG, name)
 
 
-__all__ = ["load_constants"]
\ No newline at end of file
+__all__ = ["load_constants", "calibration_path"]
\ No newline at end of file
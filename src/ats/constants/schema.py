@@ -1,7 +1,8 @@
 # update __all__ 
 
-from pydantic import BaseModel, Field 
+from pydantic import BaseModel, Field, model_validator 
 from datetime import datetime
+from typing import Dict, List
 
 
 class Constants:
@@ -25,11 +26,16 @@ class DataTransformationConstants(BaseModel):
     STRUCTURED_DATA_DIR_NAME: str = Field(frozen=True)
     TRAIN_DATA_DIR_NAME: str = Field(frozen=True)
     OUTPUT_DIR_NAME: str = Field(frozen=True)
+    PRESCORE_ENABLED: bool = Field(frozen=True)
+    PRESCORE_SKIP_BELOW: float = Field(frozen=True)
 
 class JobDescriptionConstants(BaseModel):
     TIME_STAMP: datetime
     ROOT_DIR_NAME: str = Field(frozen=True) 
     JD_ROOT_DIR_NAME: str = Field(frozen=True) 
+    CATALOG_ENABLED: bool = Field(frozen=True)
+    CATALOG_DIR_NAME: str = Field(frozen=True)
+    CATALOG_TOP_N: int = Field(frozen=True)
 
 class ScoringConstants(BaseModel):
     TIME_STAMP: datetime
@@ -37,5 +43,77 @@ class ScoringConstants(BaseModel):
     SCORES_ROOT_DIR_NAME: str = Field(frozen=True)
     DATA_DIR_NAME: str = Field(frozen=True)
     OUTPUT_DIR_NAME: str = Field(frozen=True)
+    CACHE_ENABLED: bool = Field(frozen=True)
+    CACHE_MAX_ENTRIES: int = Field(frozen=True)
+    CACHE_DIR_NAME: str = Field(frozen=True)
+    THRESHOLDS: Dict[str, float] = Field(frozen=True)
+    DEFAULT_PROFILE: str = Field(frozen=True)
+    PROFILES: Dict[str, Dict] = Field(frozen=True)
 
-__all__ = ["DataIngestionConstants", "DataTransformationConstants", "Constants", "JobDescriptionConstants", "ScoringConstants"]
\ No newline at end of file
+class InferenceConstants(BaseModel):
+    TIME_STAMP: datetime
+    ROOT_DIR_NAME: str = Field(frozen=True)
+    INFERENCE_ROOT_DIR_NAME: str = Field(frozen=True)
+    MODELS: Dict[str, str] = Field(frozen=True)
+    BACKENDS: Dict[str, str] = Field(frozen=True)
+    ONNX_DIR_NAME: str = Field(frozen=True)
+    ONNX_QUANTIZATION: str = Field(frozen=True)
+    EXECUTOR_WORKERS: int = Field(frozen=True)
+    EXECUTOR_MAX_QUEUE: int = Field(frozen=True)
+    POOL_ENABLED: bool = Field(frozen=True)
+    POOL_WORKERS: int = Field(frozen=True)
+    POOL_BUFFER_MB: int = Field(frozen=True)
+    TUNING_ENABLED: bool = Field(frozen=True)
+    TUNING_ON_STARTUP: bool = Field(frozen=True)
+    TUNING_FILE_NAME: str = Field(frozen=True)
+    TUNING_CANDIDATES: List[int] = Field(frozen=True)
+    TUNING_TOLERANCE: float = Field(frozen=True)
+    TUNING_MIN_SECONDS: float = Field(frozen=True)
+    MANAGER_ENABLED: bool = Field(frozen=True)
+    MANAGER_BUDGET_MB: int = Field(frozen=True)
+    MANAGER_META_FILE_NAME: str = Field(frozen=True)
+    SIDECAR_ENABLED: bool = Field(frozen=True)
+    SIDECAR_SOCKET_NAME: str = Field(frozen=True)
+    SIDECAR_CONNECTIONS: int = Field(frozen=True)
+    SIDECAR_TIMEOUT_S: float = Field(frozen=True)
+    BATCHING_ENABLED: bool = Field(frozen=True)
+    BATCHING_WINDOW_MS: float = Field(frozen=True)
+    BATCHING_MAX_BATCH_SIZE: int = Field(frozen=True)
+    CHUNKING_ENABLED: bool = Field(frozen=True)
+    CHUNKING_OVERLAP_TOKENS: int = Field(frozen=True)
+    CHUNKING_MAX_BATCH_TOKENS: int = Field(frozen=True)
+    CACHE_ENABLED: bool = Field(frozen=True)
+    CACHE_MAX_ENTRIES: int = Field(frozen=True)
+    CACHE_SPILL: bool = Field(frozen=True)
+    CACHE_DIR_NAME: str = Field(frozen=True)
+    STORE_ENABLED: bool = Field(frozen=True)
+    STORE_DIR_NAME: str = Field(frozen=True)
+    STORE_DTYPE: str = Field(frozen=True)
+    TFIDF_ENABLED: bool = Field(frozen=True)
+    TFIDF_DIR_NAME: str = Field(frozen=True)
+    TFIDF_N_FEATURES: int = Field(frozen=True)
+    INDEX_ENABLED: bool = Field(frozen=True)
+    INDEX_MODEL: str = Field(frozen=True)
+    INDEX_DIR_NAME: str = Field(frozen=True)
+    INDEX_MODE: str = Field(frozen=True)
+    INDEX_NLIST: int = Field(frozen=True)
+    INDEX_NPROBE: int = Field(frozen=True)
+    INDEX_MIN_TRAIN: int = Field(frozen=True)
+
+    @model_validator(mode="after")
+    def check_pool_and_manager(self):
+        # the pool forks once the models are resident, managed models are not, every worker would load its own copy
+        if self.POOL_ENABLED and self.MANAGER_ENABLED:
+            raise ValueError("INFERENCE.POOL and INFERENCE.MANAGER can not be enabled together, pool workers would each load their own copy of the managed models")
+        return self
+
+class RuntimeConstants(BaseModel):
+    TIME_STAMP: datetime
+    TORCH_INTRA_OP_THREADS: int = Field(frozen=True)
+    TORCH_INTER_OP_THREADS: int = Field(frozen=True)
+    OMP_NUM_THREADS: int = Field(frozen=True)
+    MKL_NUM_THREADS: int = Field(frozen=True)
+    INFERENCE_CPUS: List[int] = Field(frozen=True)
+    DEFAULT_EXECUTOR_WORKERS: int = Field(frozen=True)
+
+__all__ = ["DataIngestionConstants", "DataTransformationConstants", "Constants", "JobDescriptionConstants", "ScoringConstants", "InferenceConstants", "RuntimeConstants"]
\ No newline at end of file
@@ -42,14 +42,19 @@ def __transform__(CONFIG:ConfigBox) -> Constants:
         PARSED_DATA_DIR_NAME = CONFIG.DATA.TRANSFORMATION.PARSED_DATA_DIR ,
         STRUCTURED_DATA_DIR_NAME = CONFIG.DATA.TRANSFORMATION.STRUCTURED_DATA_DIR ,
         TRAIN_DATA_DIR_NAME = CONFIG.STRUCTURED_TRAINING.ROOT_DIR,
-        OUTPUT_DIR_NAME = CONFIG.DATA.TRANSFORMATION.OUTPUT_DIR
+        OUTPUT_DIR_NAME = CONFIG.DATA.TRANSFORMATION.OUTPUT_DIR,
+        PRESCORE_ENABLED = CONFIG.DATA.TRANSFORMATION.PRESCORE.ENABLED,
+        PRESCORE_SKIP_BELOW = CONFIG.DATA.TRANSFORMATION.PRESCORE.SKIP_BELOW
     )
 
 def __jd__(CONFIG:ConfigBox) -> Constants:
     return JobDescriptionConstants(
         TIME_STAMP = datetime.now(),
         ROOT_DIR_NAME = CONFIG.ROOT_DIR,
-        JD_ROOT_DIR_NAME = CONFIG.JD.ROOT_DIR
+        JD_ROOT_DIR_NAME = CONFIG.JD.ROOT_DIR,
+        CATALOG_ENABLED = CONFIG.JD.CATALOG.ENABLED,
+        CATALOG_DIR_NAME = CONFIG.JD.CATALOG.DIR,
+        CATALOG_TOP_N = CONFIG.JD.CATALOG.TOP_N
     )
 
 def __scoring__(CONFIG:ConfigBox) -> Constants:
@@ -58,25 +63,100 @@ def __scoring__(CONFIG:ConfigBox) -> Constants:
         ROOT_DIR_NAME = CONFIG.ROOT_DIR,
         SCORES_ROOT_DIR_NAME = CONFIG.SCORINGS.ROOT_DIR,
         DATA_DIR_NAME = CONFIG.SCORINGS.DATA_DIR,
-        OUTPUT_DIR_NAME = CONFIG.SCORINGS.OUTPUT_DIR
+        OUTPUT_DIR_NAME = CONFIG.SCORINGS.OUTPUT_DIR,
+        CACHE_ENABLED = CONFIG.SCORINGS.CACHE.ENABLED,
+        CACHE_MAX_ENTRIES = CONFIG.SCORINGS.CACHE.MAX_ENTRIES,
+        CACHE_DIR_NAME = CONFIG.SCORINGS.CACHE.DIR,
+        THRESHOLDS = CONFIG.SCORINGS.THRESHOLDS.to_dict(),
+        DEFAULT_PROFILE = CONFIG.SCORINGS.DEFAULT_PROFILE,
+        PROFILES = CONFIG.SCORINGS.PROFILES.to_dict()
+    )
+
+def __inference__(CONFIG:ConfigBox) -> Constants:
+    return InferenceConstants(
+        TIME_STAMP = datetime.now(),
+        ROOT_DIR_NAME = CONFIG.ROOT_DIR,
+        INFERENCE_ROOT_DIR_NAME = CONFIG.INFERENCE.ROOT_DIR,
+        MODELS = CONFIG.INFERENCE.MODELS.to_dict(),
+        BACKENDS = CONFIG.INFERENCE.BACKENDS.to_dict(),
+        ONNX_DIR_NAME = CONFIG.INFERENCE.ONNX.DIR,
+        ONNX_QUANTIZATION = CONFIG.INFERENCE.ONNX.QUANTIZATION,
+        EXECUTOR_WORKERS = CONFIG.INFERENCE.EXECUTOR.WORKERS,
+        EXECUTOR_MAX_QUEUE = CONFIG.INFERENCE.EXECUTOR.MAX_QUEUE,
+        POOL_ENABLED = CONFIG.INFERENCE.POOL.ENABLED,
+        POOL_WORKERS = CONFIG.INFERENCE.POOL.WORKERS,
+        POOL_BUFFER_MB = CONFIG.INFERENCE.POOL.BUFFER_MB,
+        TUNING_ENABLED = CONFIG.INFERENCE.BATCH_TUNING.ENABLED,
+        TUNING_ON_STARTUP = CONFIG.INFERENCE.BATCH_TUNING.ON_STARTUP,
+        TUNING_FILE_NAME = CONFIG.INFERENCE.BATCH_TUNING.FILE,
+        TUNING_CANDIDATES = CONFIG.INFERENCE.BATCH_TUNING.CANDIDATES,
+        TUNING_TOLERANCE = CONFIG.INFERENCE.BATCH_TUNING.TOLERANCE,
+        TUNING_MIN_SECONDS = CONFIG.INFERENCE.BATCH_TUNING.MIN_SECONDS,
+        MANAGER_ENABLED = CONFIG.INFERENCE.MANAGER.ENABLED,
+        MANAGER_BUDGET_MB = CONFIG.INFERENCE.MANAGER.BUDGET_MB,
+        MANAGER_META_FILE_NAME = CONFIG.INFERENCE.MANAGER.META_FILE,
+        SIDECAR_ENABLED = CONFIG.INFERENCE.SIDECAR.ENABLED,
+        SIDECAR_SOCKET_NAME = CONFIG.INFERENCE.SIDECAR.SOCKET,
+        SIDECAR_CONNECTIONS = CONFIG.INFERENCE.SIDECAR.CONNECTIONS,
+        SIDECAR_TIMEOUT_S = CONFIG.INFERENCE.SIDECAR.TIMEOUT_S,
+        BATCHING_ENABLED = CONFIG.INFERENCE.BATCHING.ENABLED,
+        BATCHING_WINDOW_MS = CONFIG.INFERENCE.BATCHING.WINDOW_MS,
+        BATCHING_MAX_BATCH_SIZE = CONFIG.INFERENCE.BATCHING.MAX_BATCH_SIZE,
+        CHUNKING_ENABLED = CONFIG.INFERENCE.CHUNKING.ENABLED,
+        CHUNKING_OVERLAP_TOKENS = CONFIG.INFERENCE.CHUNKING.OVERLAP_TOKENS,
+        CHUNKING_MAX_BATCH_TOKENS = CONFIG.INFERENCE.CHUNKING.MAX_BATCH_TOKENS,
+        CACHE_ENABLED = CONFIG.INFERENCE.CACHE.ENABLED,
+        CACHE_MAX_ENTRIES = CONFIG.INFERENCE.CACHE.MAX_ENTRIES,
+        CACHE_SPILL = CONFIG.INFERENCE.CACHE.SPILL,
+        CACHE_DIR_NAME = CONFIG.INFERENCE.CACHE.DIR,
+        STORE_ENABLED = CONFIG.INFERENCE.STORE.ENABLED,
+        STORE_DIR_NAME = CONFIG.INFERENCE.STORE.DIR,
+        STORE_DTYPE = CONFIG.INFERENCE.STORE.DTYPE,
+        TFIDF_ENABLED = CONFIG.INFERENCE.TFIDF.ENABLED,
+        TFIDF_DIR_NAME = CONFIG.INFERENCE.TFIDF.DIR,
+        TFIDF_N_FEATURES = CONFIG.INFERENCE.TFIDF.N_FEATURES,
+        INDEX_ENABLED = CONFIG.INFERENCE.INDEX.ENABLED,
+        INDEX_MODEL = CONFIG.INFERENCE.INDEX.MODEL,
+        INDEX_DIR_NAME = CONFIG.INFERENCE.INDEX.DIR,
+        INDEX_MODE = CONFIG.INFERENCE.INDEX.MODE,
+        INDEX_NLIST = CONFIG.INFERENCE.INDEX.IVF.NLIST,
+        INDEX_NPROBE = CONFIG.INFERENCE.INDEX.IVF.NPROBE,
+        INDEX_MIN_TRAIN = CONFIG.INFERENCE.INDEX.IVF.MIN_TRAIN
+    )
+
+def __runtime__(CONFIG:ConfigBox) -> Constants:
+    return RuntimeConstants(
+        TIME_STAMP = datetime.now(),
+        TORCH_INTRA_OP_THREADS = CONFIG.RUNTIME.TORCH_INTRA_OP_THREADS,
+        TORCH_INTER_OP_THREADS = CONFIG.RUNTIME.TORCH_INTER_OP_THREADS,
+        OMP_NUM_THREADS = CONFIG.RUNTIME.OMP_NUM_THREADS,
+        MKL_NUM_THREADS = CONFIG.RUNTIME.MKL_NUM_THREADS,
+        INFERENCE_CPUS = list(CONFIG.RUNTIME.INFERENCE_CPUS or []),
+        DEFAULT_EXECUTOR_WORKERS = CONFIG.RUNTIME.DEFAULT_EXECUTOR_WORKERS
     )
 
 dataingestion = "DataIngestion"
 datatransformation = "DataTransformation"
 jobdescription = "JobDescription"
 scorings = "Scoring"
+inference = "Inference"
+runtime = "Runtime"
 
 avl_cons = [
     dataingestion, 
     datatransformation, 
     jobdescription,
-    scorings
+    scorings,
+    inference,
+    runtime
 ]
 process = {
     dataingestion:__ing__,
     datatransformation:__transform__,
     jobdescription:__jd__,
-    scorings:__scoring__
+    scorings:__scoring__,
+    inference:__inference__,
+    runtime:__runtime__
 } 
 
 def load(config:ConfigBox, name: str | List[str] | Tuple[str]) -> Dict: 
@@ -86,7 +166,7 @@ def load(config:ConfigBox, name: str | List[str] | Tuple[str]) -> Dict:
         config (ConfigBox): configuration for the object
         name (str | List[str] | Tuple[str]): name of required object  
 
-        Note: Available names --> DataIngestion, DataTransformation, JobDescription, Scoring
+        Note: Available names --> DataIngestion, DataTransformation, JobDescription, Scoring, Inference, Runtime
 
     Raises:
         CustomException: Error shows with file name, line no and error message
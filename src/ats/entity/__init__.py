@@ -3,6 +3,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 from pathlib import Path 
+from typing import Dict, List
 
 
 class DataIngestion(BaseModel):
@@ -23,11 +24,16 @@ class DataTransformation(BaseModel):
     STRUCTURED_DATA_DIR_PATH: Path
     TRAIN_DATA_DIR_PATH: Path
     OUTPUT_DIR_PATH: Path
+    PRESCORE_ENABLED: bool
+    PRESCORE_SKIP_BELOW: float
 
 class JobDescription(BaseModel):
     TIME_STAMP: datetime
     ROOT_DIR_PATH: Path
     JD_ROOT_DIR_PATH: Path
+    CATALOG_ENABLED: bool
+    CATALOG_DIR_PATH: Path
+    CATALOG_TOP_N: int
 
 class Scoring(BaseModel):
     TIME_STAMP: datetime
@@ -35,9 +41,74 @@ class Scoring(BaseModel):
     SCORES_ROOT_DIR_PATH: Path
     SCORING_DATA_DIR_PATH: Path
     OUTPUT_DIR_PATH: Path
+    CACHE_ENABLED: bool
+    CACHE_MAX_ENTRIES: int
+    CACHE_DIR_PATH: Path
+    THRESHOLDS: Dict[str, float]
+    DEFAULT_PROFILE: str
+    PROFILES: Dict[str, Dict]
+
+class Inference(BaseModel):
+    TIME_STAMP: datetime
+    ROOT_DIR_PATH: Path
+    INFERENCE_ROOT_DIR_PATH: Path
+    MODELS: Dict[str, str]
+    BACKENDS: Dict[str, str]
+    ONNX_DIR_PATH: Path
+    ONNX_QUANTIZATION: str
+    EXECUTOR_WORKERS: int
+    EXECUTOR_MAX_QUEUE: int
+    POOL_ENABLED: bool
+    POOL_WORKERS: int
+    POOL_BUFFER_MB: int
+    TUNING_ENABLED: bool
+    TUNING_ON_STARTUP: bool
+    TUNING_FILE_PATH: Path
+    TUNING_CANDIDATES: List[int]
+    TUNING_TOLERANCE: float
+    TUNING_MIN_SECONDS: float
+    MANAGER_ENABLED: bool
+    MANAGER_BUDGET_MB: int
+    MANAGER_META_FILE_PATH: Path
+    SIDECAR_ENABLED: bool
+    SIDECAR_SOCKET_PATH: Path
+    SIDECAR_CONNECTIONS: int
+    SIDECAR_TIMEOUT_S: float
+    BATCHING_ENABLED: bool
+    BATCHING_WINDOW_MS: float
+    BATCHING_MAX_BATCH_SIZE: int
+    CHUNKING_ENABLED: bool
+    CHUNKING_OVERLAP_TOKENS: int
+    CHUNKING_MAX_BATCH_TOKENS: int
+    CACHE_ENABLED: bool
+    CACHE_MAX_ENTRIES: int
+    CACHE_SPILL: bool
+    CACHE_DIR_PATH: Path
+    STORE_ENABLED: bool
+    STORE_DIR_PATH: Path
+    STORE_DTYPE: str
+    TFIDF_ENABLED: bool
+    TFIDF_DIR_PATH: Path
+    TFIDF_N_FEATURES: int
+    INDEX_ENABLED: bool
+    INDEX_MODEL: str
+    INDEX_DIR_PATH: Path
+    INDEX_MODE: str
+    INDEX_NLIST: int
+    INDEX_NPROBE: int
+    INDEX_MIN_TRAIN: int
+
+class Runtime(BaseModel):
+    TIME_STAMP: datetime
+    TORCH_INTRA_OP_THREADS: int
+    TORCH_INTER_OP_THREADS: int
+    OMP_NUM_THREADS: int
+    MKL_NUM_THREADS: int
+    INFERENCE_CPUS: List[int]
+    DEFAULT_EXECUTOR_WORKERS: int
 
 class CloudPush(BaseModel):
     FOLDERS: dict
     FILES: dict
 
-__all__ = ["DataIngestion", "DataTransformation", "JobDescription", "Scoring", "CloudPush"]
\ No newline at end of file
+__all__ = ["DataIngestion", "DataTransformation", "JobDescription", "Scoring", "Inference", "Runtime", "CloudPush"]
\ No newline at end of file
@@ -1,8 +1,9 @@
 # update __all__
 
 from fastapi import UploadFile 
-from typing import List, Dict
+from typing import Awaitable, List, Dict
 from ..components import * 
+from ..components.scorers import JobCatalog, ResumeTextView, ScoreCache, ScoringProfile, TierCosts
 from ..config import * 
 
 
@@ -24,16 +25,18 @@ class DataIngestionPipeline:
 class DataTransformationPipeline: 
     """pipeline for process of data transformation 
     """
-    async def run(self, info: Dict[str, FileInfo] = None) -> tuple[Dict[str, ResumeSchema], Dict[str, FileInfo]]: 
+    async def run(self, info: Dict[str, FileInfo] = None, job_data: JobDescription | Awaitable[JobDescription] = None, registry: ModelRegistry = None) -> tuple[Dict[str, ResumeTextView], Dict[str, FileInfo]]: 
         """runs data transformation pipeline and returns the output
 
         Args:
             info (Dict[str, FileInfo]): dict containing info of all files from previous excecution or \'None\', if None files will be loaded from disk, Defaults to None
+            job_data (JobDescription | Awaitable[JobDescription]): job description or a task extracting it, raw parsed texts are pre-scored against it when enabled in config, Defaults to None
+            registry (ModelRegistry): loaded models shared across requests, pre-scoring needs it, Defaults to None
 
         Returns:
-            tuple[Dict[str, ResumeSchema], Dict[str, FileInfo]]: dict containing structured output of resume data, updated dict containing info of all files from current excecution
+            tuple[Dict[str, ResumeTextView], Dict[str, FileInfo]]: dict containing text views of the structured resume data, updated dict containing info of all files from current excecution
         """
-        components = DataTransformationComponents(DataTransformationConfig, DataIngestionConfig, info) 
+        components = DataTransformationComponents(DataTransformationConfig, DataIngestionConfig, info, job_data=job_data, registry=registry) 
         return await components
 
 class JobDescriptionPipeline: 
@@ -54,18 +57,74 @@ class JobDescriptionPipeline:
 class ScoringPipeline:
     """pipeline for scoring of resumes based on job description
     """
-    async def run(self, resume_data: Dict[str, ResumeSchema], job_data: JobDescription, info: Dict[str, FileInfo]) -> tuple[Dict[str, FileInfo], Dict[str, Dict]]:
+    async def run(self, resume_data: Dict[str, ResumeTextView], job_data: JobDescription, info: Dict[str, FileInfo], registry: ModelRegistry = None, cache: ScoreCache = None, profile: ScoringProfile = None, costs: TierCosts = None) -> tuple[Dict[str, FileInfo], Dict[str, Dict]]:
         """runs scoring pipeline and returns files info and scorings
 
         Args:
-            resume_data (Dict[str, ResumeSchema]): resume data with respect to file names
+            resume_data (Dict[str, ResumeTextView]): text views of the resume data with respect to file names
             job_data (JobDescription): job description extracted from url
             info (Dict[str, FileInfo]): files info during execution
+            registry (ModelRegistry): loaded models shared across requests, if None models are loaded for this run only, Defaults to None
+            cache (ScoreCache): result cache shared across requests, if None a cache backed by disk only is used when enabled in config, Defaults to None
+            profile (ScoringProfile): tiers to run and latency budget, if None the default profile of config is used, Defaults to None
+            costs (TierCosts): measured tier latencies shared across requests, if None latencies are measured for this run only, Defaults to None
 
         Returns:
             tuple[Dict[str, FileInfo], Dict[str, Dict]]: tuple of files info and scorings dict
         """
-        components = ScoringComponents(ScoringConfig, resume_data, job_data, info) 
+        components = ScoringComponents(ScoringConfig, resume_data, job_data, info, registry, cache, profile, costs) 
+        return await components
+
+class RankingPipeline:
+    """pipeline for ranking every indexed resume against a job description
+    """
+    async def run(self, job_data: JobDescription, registry: ModelRegistry, k: int = 20, rerank: bool = True, costs: TierCosts = None) -> Dict:
+        """runs ranking pipeline and returns the top-k candidates
+
+        Args:
+            job_data (JobDescription): job description extracted from url
+            registry (ModelRegistry): loaded models and the vector index of scored resumes
+            k (int): number of candidates retrieved from the index, Defaults to 20
+            rerank (bool): score the candidates with RoBERTa for the final order, if False they are ordered by similarity, Defaults to True
+            costs (TierCosts): measured tier latencies shared across requests, Defaults to None
+
+        Returns:
+            Dict: candidates with their similarity and RoBERTa score, search and rerank time
+        """
+        components = RankingComponents(ScoringConfig, job_data, registry, k, rerank, costs) 
+        return await components
+
+class MatchingPipeline:
+    """pipeline for matching resumes against the open roles of the job catalog
+    """
+    async def run(self, resume_data: Dict[str, ResumeTextView], info: Dict[str, FileInfo], registry: ModelRegistry, catalog: JobCatalog, top_n: int = None, profile: ScoringProfile = None, costs: TierCosts = None) -> Dict[str, List[Dict]]:
+        """runs matching pipeline and returns the best matching jobs of every resume
+
+        Args:
+            resume_data (Dict[str, ResumeTextView]): text views of the resume data with respect to file names
+            info (Dict[str, FileInfo]): files info during execution
+            registry (ModelRegistry): loaded models shared across requests
+            catalog (JobCatalog): open roles with their precomputed embeddings
+            top_n (int): jobs the cascade runs for per resume, if None CATALOG.TOP_N of config is used, Defaults to None
+            profile (ScoringProfile): tiers to run and latency budget, if None the default profile of config is used, Defaults to None
+            costs (TierCosts): measured tier latencies shared across requests, Defaults to None
+
+        Returns:
+            Dict[str, List[Dict]]: matched jobs with their cascade results with respect to file names
+        """
+        components = MatchingComponents(ScoringConfig, resume_data, info, registry, catalog, top_n or JobDescriptionConfig.CATALOG_TOP_N, profile, costs) 
+        return await components
+
+class InferencePipeline:
+    """pipeline for loading models shared by all requests
+    """
+    async def run(self) -> ModelRegistry:
+        """loads all models from config and returns the registry owning them
+
+        Returns:
+            ModelRegistry: registry of loaded models
+        """
+        components = ModelRegistry(InferenceConfig, RuntimeConfig) 
         return await components
 
 class CloudPushPipeline:
@@ -75,4 +134,4 @@ class CloudPushPipeline:
         components = CloudPushComponents(CloudPushConfig) 
         return await components
 
-__all__ = ["DataIngestionPipeline", "DataTransformationPipeline", "JobDescriptionPipeline", "ScoringPipeline", "CloudPushPipeline"]
+__all__ = ["DataIngestionPipeline", "DataTransformationPipeline", "JobDescriptionPipeline", "ScoringPipeline", "RankingPipeline", "MatchingPipeline", "InferencePipeline", "CloudPushPipeline"]
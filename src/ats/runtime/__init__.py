@@ -0,0 +1,105 @@
+# update __all__
+# apply_thread_env must run before torch is imported (before importing pipeline/components)
+
+from ..entity import Runtime
+from .. import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+import asyncio, os, threading
+
+
+THREAD_ENV = ("OMP_NUM_THREADS", "MKL_NUM_THREADS")
+
+# effective settings of every inference worker thread, filled by configure_worker
+workers:Dict[str, Dict] = {}
+__lock = threading.Lock()
+
+
+def apply_thread_env(config:Runtime) -> Dict[str, str]:
+    """sets OpenMP/MKL thread counts in the environment, has no effect once torch has been imported
+
+    Returns:
+        Dict[str, str]: environment variables that have been set
+    """
+    applied = {}
+    for name in THREAD_ENV:
+        value = getattr(config, name)
+        if value > 0:
+            os.environ[name] = str(value)
+            applied[name] = str(value)
+    logging.info(f"thread environment: {applied}")
+    return applied
+
+
+def apply_torch_threads(config:Runtime) -> None:
+    "sets torch intra-op and inter-op thread counts of the process"
+    import torch
+    if config.TORCH_INTRA_OP_THREADS > 0:
+        torch.set_num_threads(config.TORCH_INTRA_OP_THREADS)
+    if config.TORCH_INTER_OP_THREADS > 0:
+        try:
+            torch.set_num_interop_threads(config.TORCH_INTER_OP_THREADS)
+        except RuntimeError as e:
+            # only allowed once and before any inter-op parallel work started
+            logging.warning(f"unable to set inter-op threads, {e}")
+    logging.info(f"torch threads: intra-op={torch.get_num_threads()}, inter-op={torch.get_num_interop_threads()}")
+
+
+def configure_worker(config:Runtime) -> None:
+    """initializer of inference worker threads, pins the calling thread to INFERENCE_CPUS
+    and sets its intra-op thread count (OpenMP thread counts are per calling thread)"""
+    name = threading.current_thread().name
+    settings = {}
+    try:
+        if config.INFERENCE_CPUS:
+            if hasattr(os, "sched_setaffinity"):
+                # pid 0 is the calling thread on linux
+                os.sched_setaffinity(0, config.INFERENCE_CPUS)
+            else:
+                logging.warning("cpu pinning is not supported on this platform")
+        if hasattr(os, "sched_getaffinity"):
+            settings["cpus"] = sorted(os.sched_getaffinity(0))
+        import torch
+        if config.TORCH_INTRA_OP_THREADS > 0:
+            torch.set_num_threads(config.TORCH_INTRA_OP_THREADS)
+        settings["torch_threads"] = torch.get_num_threads()
+    except Exception as e:
+        settings["error"] = str(e)
+        logging.error(f"unable to configure inference worker \'{name}\', {e}")
+    with __lock:
+        workers[name] = settings
+
+
+def configure_default_executor(config:Runtime, loop:asyncio.AbstractEventLoop | None = None) -> ThreadPoolExecutor | None:
+    "replaces the default executor of the loop, used by parsing and OCR, with one of DEFAULT_EXECUTOR_WORKERS threads"
+    if config.DEFAULT_EXECUTOR_WORKERS <= 0:
+        return None
+    executor = ThreadPoolExecutor(max_workers=config.DEFAULT_EXECUTOR_WORKERS, thread_name_prefix="default")
+    (loop or asyncio.get_running_loop()).set_default_executor(executor)
+    logging.info(f"default executor: {config.DEFAULT_EXECUTOR_WORKERS} workers")
+    return executor
+
+
+def diagnostics(config:Runtime) -> Dict:
+    "returns configured and effective thread counts and cpu sets"
+    report = {
+        "configured": config.model_dump(exclude={"TIME_STAMP"}),
+        "cpu_count": os.cpu_count(),
+        "process_cpus": sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None,
+        "env": {name: os.environ.get(name) for name in THREAD_ENV + ("TOKENIZERS_PARALLELISM",)},
+    }
+    try:
+        import torch
+        report["torch"] = {
+            "intra_op_threads": torch.get_num_threads(),
+            "inter_op_threads": torch.get_num_interop_threads(),
+            "parallel_info": torch.__config__.parallel_info()
+        }
+    except ImportError:
+        report["torch"] = None
+    with __lock:
+        report["inference_workers"] = dict(workers)
+    return report
+
+
+__all__ = ["apply_thread_env", "apply_torch_threads", "configure_worker", "configure_default_executor", "diagnostics"]
@@ -0,0 +1,68 @@
+# update __all__
+
+from ..components.parsers import PDFParser, DOCXParser, HTMLParser
+from ..components.schema import ResumeSchema, JobDescription
+from .. import logging
+from pathlib import Path
+from typing import Dict, List, Tuple
+import asyncio, json
+
+
+# structured resumes of resumes/1-3 and a matching job description, lets tools run without the LLM
+FIXTURES_DIR = Path(__file__).parent.joinpath("fixtures")
+
+PARSERS = {
+    ".pdf": PDFParser,
+    ".docx": DOCXParser,
+    ".html": HTMLParser
+}
+
+SAMPLE_JOB = (
+    "Job Title: Machine Learning Engineer | Experience Level: Mid | "
+    "Job Description: Build and deploy machine learning models and data pipelines for production systems | "
+    "Requirements: Python, PyTorch, scikit-learn, SQL, Docker, REST APIs, 3+ years of experience | "
+    "Responsibilities: train and evaluate models, serve them behind APIs, monitor model quality"
+)
+
+
+async def aload_corpus(corpus_dir:Path, suffixes:List[str] | None = None) -> Dict[str, str]:
+    """parses every supported file of the corpus directory into plain text, files that fail to parse are skipped
+
+    Args:
+        corpus_dir (Path): directory with resumes, eg: resumes/
+        suffixes (List[str] | None, optional): file types to parse. Defaults to every type with a parser.
+
+    Returns:
+        Dict[str, str]: file name -> parsed text
+    """
+    suffixes = suffixes or list(PARSERS)
+    paths = sorted(path for path in Path(corpus_dir).iterdir() if path.suffix.lower() in suffixes)
+    outputs = await asyncio.gather(*(PARSERS[path.suffix.lower()]().parse(path=path) for path in paths), return_exceptions=True)
+    corpus = {}
+    for path, output in zip(paths, outputs):
+        if isinstance(output, Exception) or not output or not output.strip():
+            logging.warning(f"skipping \'{path.name}\' from corpus, {output if isinstance(output, Exception) else 'no text'}")
+            continue
+        corpus[path.name] = output
+    return corpus
+
+
+def load_corpus(corpus_dir:Path, suffixes:List[str] | None = None) -> Dict[str, str]:
+    "blocking version of aload_corpus for command line tools"
+    return asyncio.run(aload_corpus(corpus_dir, suffixes))
+
+
+def load_fixtures(fixtures_dir:Path = FIXTURES_DIR) -> Tuple[Dict[str, ResumeSchema], JobDescription]:
+    """loads canned structured resumes and job description
+
+    Returns:
+        Tuple[Dict[str, ResumeSchema], JobDescription]: resumes by name of their source file and the job description
+    """
+    with open(fixtures_dir.joinpath("resumes.json"), encoding="utf-8") as file:
+        resumes = {name: ResumeSchema(**data) for name, data in json.load(file).items()}
+    with open(fixtures_dir.joinpath("job_description.json"), encoding="utf-8") as file:
+        job = JobDescription(**json.load(file))
+    return resumes, job
+
+
+__all__ = ["aload_corpus", "load_corpus", "load_fixtures", "FIXTURES_DIR", "SAMPLE_JOB"]
@@ -0,0 +1,180 @@
+"""benchmarks every scorer tier on the canned fixtures from resumes/, reports p50/p95/p99 latency and
+throughput for a sweep of batch sizes and thread counts along with peak resident memory per tier,
+and compares against a previous report to catch regressions
+
+usage:
+        python -m src.ats.tools.benchmark --batch-sizes 1 8 32 --threads 1 4 --runs 10
+        python -m src.ats.tools.benchmark --baseline artifacts/inference/benchmark.json --tolerance 0.2
+"""
+from ..config.builder import InferenceConfig
+from ..components.inference import Encoder, InferenceExecutor, load_model
+from ..components.scorers import MiniLMResumeScorer, MPNetResumeScorer, RoBERTaHybridScorer, SCORER_VERSION
+from ..utils import get_rss
+from . import load_fixtures
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+import argparse, asyncio, gc, json, os, platform, sys, threading, time
+import numpy as np
+
+
+# scorer class, batch method and the per resume latency claimed in scorers/__init__.py
+TIERS = {
+    "MINILM": (MiniLMResumeScorer, "calculate_section_scores_batch", 100),
+    "MPNET": (MPNetResumeScorer, "get_detailed_score_batch", 300),
+    "ROBERTA": (RoBERTaHybridScorer, "calculate_hybrid_score_batch", 800)
+}
+
+
+class RssSampler:
+    "samples resident memory of the process on a background thread and keeps the peak"
+    def __init__(self, interval:float = 0.01) -> None:
+        self.interval = interval
+        self.peak = get_rss()
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self.__sample, daemon=True)
+
+    def __sample(self) -> None:
+        while not self.__stop.wait(self.interval):
+            self.peak = max(self.peak, get_rss())
+
+    def __enter__(self) -> "RssSampler":
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.__stop.set()
+        self.__thread.join()
+        self.peak = max(self.peak, get_rss())
+
+
+def set_threads(threads:int) -> int | None:
+    "sets intra-op threads of the calling thread, returns the effective count or None without torch"
+    try:
+        import torch
+    except ImportError:
+        return None
+    torch.set_num_threads(threads)
+    return torch.get_num_threads()
+
+
+async def benchmark_tier(key:str, resumes:List[Dict], job:Dict, batch_sizes:List[int], threads:List[int], runs:int, warmup:int) -> Dict:
+    scorer_class, method_name, target_ms = TIERS[key]
+    name = InferenceConfig.MODELS[key]
+    backend = InferenceConfig.BACKENDS.get(key, "torch")
+    rss = get_rss()
+    sweeps = []
+    with RssSampler() as sampler:
+        start = time.perf_counter()
+        model = load_model(name, backend, InferenceConfig.ONNX_DIR_PATH, InferenceConfig.ONNX_QUANTIZATION)
+        load_seconds = time.perf_counter() - start
+        # a single worker, thread counts are set on the thread that runs the model
+        executor = InferenceExecutor(workers=1, max_queue=0)
+        encoder = Encoder(key, model, executor)
+        if InferenceConfig.CHUNKING_ENABLED:
+            encoder.enable_chunking(InferenceConfig.CHUNKING_OVERLAP_TOKENS, InferenceConfig.CHUNKING_MAX_BATCH_TOKENS)
+        method = getattr(scorer_class(encoder=encoder), method_name)
+        try:
+            for count in threads:
+                effective = await executor.run(set_threads, count)
+                for size in batch_sizes:
+                    batch = [resumes[i % len(resumes)] for i in range(size)]
+                    for _ in range(warmup):
+                        await method(batch, job)
+                    latencies = []
+                    for _ in range(runs):
+                        start = time.perf_counter()
+                        await method(batch, job)
+                        latencies.append(time.perf_counter() - start)
+                    latencies = np.asarray(latencies) * 1000
+                    sweeps.append({
+                        "threads": count,
+                        "effective_threads": effective,
+                        "batch_size": size,
+                        "mean_ms": float(latencies.mean()),
+                        "p50_ms": float(np.percentile(latencies, 50)),
+                        "p95_ms": float(np.percentile(latencies, 95)),
+                        "p99_ms": float(np.percentile(latencies, 99)),
+                        "p95_ms_per_resume": float(np.percentile(latencies, 95)) / size,
+                        "resumes_per_second": size / (float(latencies.mean()) / 1000)
+                    })
+        finally:
+            executor.shutdown()
+            del method, encoder, model
+            gc.collect()
+    return {
+        "name": name,
+        "backend": backend,
+        "target_ms": target_ms,
+        "load_seconds": load_seconds,
+        "peak_rss_bytes": sampler.peak,
+        "peak_rss_delta_bytes": max(sampler.peak - rss, 0),
+        "sweeps": sweeps
+    }
+
+
+def find_regressions(report:Dict, baseline:Dict, tolerance:float) -> List[Dict]:
+    "returns every sweep whose p95 grew by more than tolerance against the same tier, threads and batch size of the baseline"
+    regressions = []
+    for key, tier in report["tiers"].items():
+        previous = {(sweep["threads"], sweep["batch_size"]): sweep for sweep in baseline.get("tiers", {}).get(key, {}).get("sweeps", [])}
+        for sweep in tier["sweeps"]:
+            old = previous.get((sweep["threads"], sweep["batch_size"]))
+            if old and sweep["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+                regressions.append({
+                    "tier": key,
+                    "threads": sweep["threads"],
+                    "batch_size": sweep["batch_size"],
+                    "baseline_p95_ms": old["p95_ms"],
+                    "p95_ms": sweep["p95_ms"]
+                })
+    return regressions
+
+
+async def run(tiers:List[str], batch_sizes:List[int], threads:List[int], runs:int, warmup:int) -> Dict:
+    resumes, job = load_fixtures()
+    resumes = [resume.model_dump() for resume in resumes.values()]
+    job = job.model_dump()
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "host": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count()
+        },
+        "scorer_version": SCORER_VERSION,
+        "runs": runs,
+        "tiers": {}
+    }
+    # tiers run one after another so that peak memory is attributed to one model at a time
+    for key in tiers:
+        report["tiers"][key] = await benchmark_tier(key, resumes, job, batch_sizes, threads, runs, warmup)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="benchmark the scorer tiers on canned fixtures")
+    parser.add_argument("--tiers", nargs="+", default=list(TIERS), choices=list(TIERS), help="tiers to benchmark")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 32], help="resumes per call")
+    parser.add_argument("--threads", nargs="+", type=int, default=[os.cpu_count() or 1], help="intra-op thread counts")
+    parser.add_argument("--runs", type=int, default=10, help="measured calls per batch size and thread count")
+    parser.add_argument("--warmup", type=int, default=2, help="unmeasured calls before every measurement")
+    parser.add_argument("--output", type=Path, default=InferenceConfig.INFERENCE_ROOT_DIR_PATH.joinpath("benchmark.json"), help="where to write the report")
+    parser.add_argument("--baseline", type=Path, default=None, help="previous report to compare p95 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative p95 growth before a sweep counts as a regression")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    report = asyncio.run(run(args.tiers, args.batch_sizes, args.threads, args.runs, args.warmup))
+    if baseline:
+        report["regressions"] = find_regressions(report, baseline, args.tolerance)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=4))
+    print(json.dumps(report, indent=4))
+    if baseline and report["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
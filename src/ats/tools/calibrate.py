@@ -0,0 +1,178 @@
+"""calibrates the tier thresholds of the cascade (SCORINGS.THRESHOLDS) on recorded scores,
+every tier is run for a sample of the resumes scored under artifacts/scores/data and the thresholds
+with the most early exits, weighted by the measured cost of the skipped tiers, whose results agree
+with the full cascade for at least the target share of resumes are written to config/raw/calibration.yaml,
+which overrides config.yaml at startup
+
+a result agrees with the full cascade when its score falls in the same match quality band
+(Excellent > 80, Good > 60, Fair > 40, Poor) as the score of the last tier
+
+usage:
+        python -m src.ats.tools.calibrate --sample 200 --target 0.95
+        python -m src.ats.tools.calibrate --job artifacts/job/<timestamp>.json --dry-run
+"""
+from ..config.builder import DataTransformationConfig, InferenceConfig, JobDescriptionConfig, RuntimeConfig, ScoringConfig
+from ..constants import calibration_path
+from ..components.inference import ModelRegistry
+from ..components.schema import ResumeSchema, JobDescription
+from ..components.scorers import MiniLMResumeScorer, MPNetResumeScorer, RoBERTaHybridScorer, TierCosts, TIERS
+from .. import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+import argparse, asyncio, json, random, sys, time
+import numpy as np
+import yaml
+
+
+BANDS = (40, 60, 80)
+
+
+def load_scored(scores_dir:Path, structured_dir:Path) -> Dict[str, Dict]:
+    "returns structured resumes of every recorded score file, file name -> resume data"
+    resumes = {}
+    for path in sorted(scores_dir.glob("*.json")):
+        structured = structured_dir.joinpath(path.name)
+        if not structured.is_file():
+            logging.warning(f"skipping \'{path.name}\', structured resume not found at \'{structured.as_posix()}\'")
+            continue
+        with open(structured, encoding="utf-8") as file:
+            resumes[path.name] = ResumeSchema(**json.load(file)).model_dump()
+    return resumes
+
+
+def latest_job(jd_dir:Path) -> Path:
+    "returns the most recently extracted job description"
+    paths = sorted(jd_dir.glob("*.json"), key=lambda path: path.stat().st_mtime)
+    if not paths:
+        raise FileNotFoundError(f"no job description found in \'{jd_dir.as_posix()}\', pass one with --job")
+    return paths[-1]
+
+
+async def score_tiers(resumes:List[Dict], job:Dict) -> Tuple[np.ndarray, Dict[str, float]]:
+    """runs every tier for every resume
+
+    Returns:
+        Tuple[np.ndarray, Dict[str, float]]: overall scores of shape (resumes, tiers), nan where a tier failed, and measured ms per resume of every tier
+    """
+    registry = await ModelRegistry(InferenceConfig, RuntimeConfig)
+    costs = TierCosts(alpha=1)
+    try:
+        methods = {
+            "MINILM": MiniLMResumeScorer(encoder=registry.encoder("MINILM"), skills=registry.skills).calculate_section_scores_batch,
+            "MPNET": MPNetResumeScorer(encoder=registry.encoder("MPNET"), skills=registry.skills).get_detailed_score_batch,
+            "ROBERTA": RoBERTaHybridScorer(encoder=registry.encoder("ROBERTA"), tfidf=registry.tfidf, skills=registry.skills).calculate_hybrid_score_batch
+        }
+        scores = np.full((len(resumes), len(TIERS)), np.nan)
+        for n, tier in enumerate(TIERS):
+            start = time.perf_counter()
+            results = await methods[tier](resumes, job)
+            costs.observe(tier, len(resumes), time.perf_counter() - start)
+            for i, result in enumerate(results):
+                if isinstance(result, dict):
+                    scores[i, n] = result["overall_score"]
+    finally:
+        registry.close()
+    return scores, {tier: stats["ms_per_resume"] for tier, stats in costs.report().items()}
+
+
+def evaluate(scores:np.ndarray, costs:Dict[str, float], mpnet:float, roberta:float) -> Dict:
+    "agreement with the full cascade, early exits and expected ms per resume of the cascade at the given thresholds"
+    exit1 = scores[:, 0] <= mpnet
+    exit2 = ~exit1 & (scores[:, 1] <= roberta)
+    final = np.where(exit1, scores[:, 0], np.where(exit2, scores[:, 1], scores[:, 2]))
+    cost = costs["MINILM"] + (~exit1) * costs["MPNET"] + (~exit1 & ~exit2) * costs["ROBERTA"]
+    return {
+        "thresholds": {"MPNET": float(mpnet), "ROBERTA": float(roberta)},
+        "agreement": float(np.mean(np.digitize(final, BANDS, right=True) == np.digitize(scores[:, 2], BANDS, right=True))),
+        "exits": {"MINILM": float(exit1.mean()), "MPNET": float(exit2.mean())},
+        "ms_per_resume": float(cost.mean())
+    }
+
+
+def calibrate(scores:np.ndarray, costs:Dict[str, float], current:Dict[str, float], target:float, step:float = 1) -> Dict | None:
+    """searches both thresholds on a grid of 0-100, returns the cheapest thresholds reaching the target agreement,
+    ties go to the higher agreement and then to the thresholds closest to the current ones, None when no thresholds reach it"""
+    def rank(result:Dict) -> Tuple[float, float, float]:
+        distance = sum(abs(result["thresholds"][key] - current[key]) for key in current)
+        return result["ms_per_resume"], -result["agreement"], distance
+
+    best = None
+    candidates = np.arange(0, 100 + step, step)
+    for mpnet in candidates:
+        for roberta in candidates:
+            result = evaluate(scores, costs, mpnet, roberta)
+            if result["agreement"] < target:
+                continue
+            if best is None or rank(result) < rank(best):
+                best = result
+    return best
+
+
+def write_thresholds(path:Path, thresholds:Dict[str, float], comment:str) -> None:
+    "writes thresholds to the calibration override, other values of the override are kept"
+    path = Path(path)
+    override = {}
+    if path.is_file():
+        with open(path, encoding="utf-8") as file:
+            override = yaml.safe_load(file) or {}
+    override.setdefault("SCORINGS", {})["THRESHOLDS"] = thresholds
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(f"# {comment}\n")
+        yaml.safe_dump(override, file, sort_keys=False, indent=4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="calibrate cascade thresholds on recorded scores")
+    parser.add_argument("--scores-dir", type=Path, default=ScoringConfig.SCORING_DATA_DIR_PATH, help="per file score jsons written by scoring")
+    parser.add_argument("--structured-dir", type=Path, default=DataTransformationConfig.STRUCTURED_DATA_DIR_PATH, help="structured resumes of the scored files")
+    parser.add_argument("--job", type=Path, default=None, help="job description json, defaults to the latest one extracted")
+    parser.add_argument("--sample", type=int, default=200, help="resumes to run every tier on")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the sample")
+    parser.add_argument("--target", type=float, default=0.95, help="share of resumes that must agree with the full cascade")
+    parser.add_argument("--step", type=float, default=1, help="grid step of the threshold search")
+    parser.add_argument("--output", type=Path, default=Path(calibration_path), help="calibration override read at startup")
+    parser.add_argument("--report", type=Path, default=ScoringConfig.SCORES_ROOT_DIR_PATH.joinpath("calibration.json"), help="where to write the report")
+    parser.add_argument("--dry-run", action="store_true", help="report without writing thresholds")
+    args = parser.parse_args()
+
+    resumes = load_scored(args.scores_dir, args.structured_dir)
+    if not resumes:
+        sys.exit(f"no scored resumes found in \'{args.scores_dir.as_posix()}\'")
+    names = sorted(random.Random(args.seed).sample(sorted(resumes), min(args.sample, len(resumes))))
+    job_path = args.job or latest_job(JobDescriptionConfig.JD_ROOT_DIR_PATH)
+    with open(job_path, encoding="utf-8") as file:
+        job = JobDescription(**json.load(file)).model_dump()
+
+    scores, costs = asyncio.run(score_tiers([resumes[name] for name in names], job))
+    failed = np.isnan(scores).any(axis=1)
+    scores = scores[~failed]
+    if not len(scores):
+        sys.exit("every tier failed for every sampled resume")
+    current = evaluate(scores, costs, ScoringConfig.THRESHOLDS["MPNET"], ScoringConfig.THRESHOLDS["ROBERTA"])
+    recommended = calibrate(scores, costs, current["thresholds"], args.target, args.step)
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "job": Path(job_path).as_posix(),
+        "resumes": len(scores),
+        "failed": int(failed.sum()),
+        "target": args.target,
+        "ms_per_resume": costs,
+        "current": current,
+        "recommended": recommended
+    }
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(report, indent=4))
+    print(json.dumps(report, indent=4))
+    if recommended is None:
+        sys.exit(f"no thresholds reach an agreement of {args.target}, thresholds are left unchanged")
+    if not args.dry_run:
+        write_thresholds(args.output, recommended["thresholds"], (
+            f"written by src.ats.tools.calibrate on {report['timestamp']} from {len(scores)} resumes, "
+            f"agreement {recommended['agreement']:.3f} with the full cascade (target {args.target})"
+        ))
+        print(f"thresholds written to \'{Path(args.output).as_posix()}\', restart the app to apply them")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""compares the pytorch and the int8 ONNX Runtime backend of every scorer model on the resume corpus,
+reports single text latency, batch throughput and drift of embeddings and resume/job similarity scores
+so the backend of each tier (INFERENCE.BACKENDS in config.yaml) can be chosen
+
+usage:
+        python -m src.ats.tools.compare_backends --corpus resumes --models MINILM MPNET ROBERTA --runs 3
+"""
+from ..config.builder import InferenceConfig
+from ..components.inference import load_model
+from ..components.scorers import BaseScorer
+from . import load_corpus, SAMPLE_JOB
+from pathlib import Path
+from typing import Dict, List
+import argparse, json, time
+import numpy as np
+
+
+def measure(model, texts:List[str], job:str, runs:int, batch_size:int) -> tuple[Dict, np.ndarray, np.ndarray]:
+    "returns latency and throughput of the model along with resume and job embeddings"
+    model.encode(texts[:1])
+    single = []
+    for _ in range(runs):
+        for text in texts:
+            start = time.perf_counter()
+            model.encode([text])
+            single.append(time.perf_counter() - start)
+    batch = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        embeddings = model.encode(texts, batch_size=batch_size)
+        batch.append(time.perf_counter() - start)
+    stats = {
+        "p50_ms": float(np.percentile(single, 50) * 1000),
+        "p95_ms": float(np.percentile(single, 95) * 1000),
+        "texts_per_second": len(texts) / float(np.median(batch))
+    }
+    return stats, np.asarray(embeddings, dtype=np.float32), np.asarray(model.encode([job]), dtype=np.float32)
+
+
+def compare(key:str, texts:List[str], job:str, runs:int, batch_size:int) -> Dict:
+    name = InferenceConfig.MODELS[key]
+    report = {"name": name}
+    results = {}
+    for backend in ("torch", "onnx"):
+        start = time.perf_counter()
+        model = load_model(name, backend, InferenceConfig.ONNX_DIR_PATH, InferenceConfig.ONNX_QUANTIZATION)
+        load_seconds = time.perf_counter() - start
+        stats, embeddings, job_embedding = measure(model, texts, job, runs, batch_size)
+        report[backend] = {"load_seconds": load_seconds, **stats}
+        results[backend] = (embeddings, BaseScorer.rowwise(embeddings, job_embedding) * 100)
+        del model
+
+    (torch_embeddings, torch_scores), (onnx_embeddings, onnx_scores) = results["torch"], results["onnx"]
+    cosine = BaseScorer.rowwise(torch_embeddings, onnx_embeddings)
+    drift = np.abs(torch_scores - onnx_scores)
+    report["speedup"] = {
+        "latency": report["torch"]["p50_ms"] / report["onnx"]["p50_ms"] if report["onnx"]["p50_ms"] else 0.0,
+        "throughput": report["onnx"]["texts_per_second"] / report["torch"]["texts_per_second"] if report["torch"]["texts_per_second"] else 0.0
+    }
+    report["drift"] = {
+        "embedding_cosine_mean": float(cosine.mean()),
+        "embedding_cosine_min": float(cosine.min()),
+        "score_mean_abs": float(drift.mean()),
+        "score_max_abs": float(drift.max())
+    }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="compare pytorch and int8 ONNX Runtime backends of the scorer models")
+    parser.add_argument("--corpus", type=Path, default=Path("resumes"), help="directory with resumes to encode")
+    parser.add_argument("--job", type=Path, default=None, help="text file with the job description, defaults to a sample job")
+    parser.add_argument("--models", nargs="+", default=list(InferenceConfig.MODELS), help="model keys from config, eg: MINILM MPNET ROBERTA")
+    parser.add_argument("--runs", type=int, default=3, help="repetitions of every measurement")
+    parser.add_argument("--batch-size", type=int, default=32, help="batch size of the throughput measurement")
+    parser.add_argument("--output", type=Path, default=InferenceConfig.INFERENCE_ROOT_DIR_PATH.joinpath("backend_comparison.json"), help="where to write the report")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        raise SystemExit(f"no parsable resumes in \'{args.corpus}\'")
+    job = args.job.read_text(encoding="utf-8") if args.job else SAMPLE_JOB
+    texts = list(corpus.values())
+
+    report = {
+        "corpus": sorted(corpus),
+        "quantization": InferenceConfig.ONNX_QUANTIZATION,
+        "models": {key: compare(key, texts, job, args.runs, args.batch_size) for key in args.models}
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=4))
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""runs the model server, a local process owning the MiniLM/MPNet/RoBERTa models, their embedding caches and stores,
+api processes started with INFERENCE.SIDECAR.ENABLED encode through it over a unix domain socket instead of loading
+their own copy of the models, so uvicorn can run several workers with a single copy of the weights in memory
+
+start the server before the api, api workers wait up to INFERENCE.SIDECAR.TIMEOUT_S for it at startup
+
+usage:
+        python -m src.ats.tools.model_server
+        python -m src.ats.tools.model_server --socket /run/ats/models.sock
+"""
+import os
+os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+# OpenMP/MKL thread counts only take effect when set before torch is imported
+from ..config.builder import InferenceConfig, RuntimeConfig
+from ..runtime import apply_thread_env, apply_torch_threads, configure_default_executor
+apply_thread_env(RuntimeConfig)
+
+from ..components.inference import ModelRegistry, ModelServer
+from .. import logging
+from pathlib import Path
+import argparse, asyncio, signal
+
+
+async def serve(socket_path:Path) -> None:
+    apply_torch_threads(RuntimeConfig)
+    configure_default_executor(RuntimeConfig)
+    # the server loads the models itself, whatever the sidecar setting of the api is; the index stays with the api
+    config = InferenceConfig.model_copy(update={"SIDECAR_ENABLED": False, "INDEX_ENABLED": False})
+    registry = await ModelRegistry(config, RuntimeConfig)
+    server = ModelServer(registry, socket_path)
+    await server.start()
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    task = asyncio.create_task(server.serve_forever())
+    await stop.wait()
+    logging.info(f"stopping model server, {server.report()}")
+    task.cancel()
+    server.close()
+    registry.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="serve the encoders of the scoring models over a unix domain socket")
+    parser.add_argument("--socket", type=Path, default=InferenceConfig.SIDECAR_SOCKET_PATH, help="path of the unix domain socket")
+    args = parser.parse_args()
+    asyncio.run(serve(args.socket))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""tunes the encode batch size of every model on this host, throughput is measured for every candidate of
+INFERENCE.BATCH_TUNING.CANDIDATES on the inference worker thread with the thread settings of the api and the
+smallest batch size within TOLERANCE of the best throughput is kept in artifacts/inference/batch_sizes.json
+
+results are keyed by model, cpu and thread config, the api applies them at startup and measures models it has no
+result for unless the pool or the model manager is enabled, run this tool for those or after changing hardware
+
+usage:
+        python -m src.ats.tools.tune_batch
+        python -m src.ats.tools.tune_batch --force
+"""
+import os
+os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+# OpenMP/MKL thread counts only take effect when set before torch is imported
+from ..config.builder import InferenceConfig, RuntimeConfig
+from ..runtime import apply_thread_env, apply_torch_threads
+apply_thread_env(RuntimeConfig)
+
+from ..components.inference import ModelRegistry
+import argparse, asyncio, json
+
+
+async def run(force:bool) -> dict:
+    apply_torch_threads(RuntimeConfig)
+    # every model is loaded in this process, measured here and not at registry startup
+    config = InferenceConfig.model_copy(update={
+        "TUNING_ENABLED": True,
+        "TUNING_ON_STARTUP": False,
+        "POOL_ENABLED": False,
+        "MANAGER_ENABLED": False,
+        "SIDECAR_ENABLED": False,
+        "INDEX_ENABLED": False
+    })
+    registry = await ModelRegistry(config, RuntimeConfig)
+    try:
+        return await registry.tune(measure=True, force=force)
+    finally:
+        registry.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="tune the encode batch size of every model on this host")
+    parser.add_argument("--force", action="store_true", help="measure models already tuned for this host and thread config again")
+    args = parser.parse_args()
+    results = asyncio.run(run(args.force))
+    print(json.dumps({key: {"batch_size": result["batch_size"], "throughput": result["throughput"]} for key, result in results.items()}, indent=4))
+    print(f"batch sizes written to \'{InferenceConfig.TUNING_FILE_PATH.as_posix()}\', restart the app to apply them")
+
+
+if __name__ == "__main__":
+    main()
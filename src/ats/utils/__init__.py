@@ -1,6 +1,6 @@
 from pathlib import Path
 from src.ats.exception import CustomException
-import re, aiofiles, sys, json
+import re, aiofiles, sys, json, psutil, hashlib
 
 async def asave_file(content:str | bytes, path:Path) -> Path | Exception: 
     """saves content into file at given path
@@ -71,3 +71,13 @@ async def awrite_json(path:Path, data:dict):
     payload = json.dumps(data, ensure_ascii=False, indent=2)
     async with aiofiles.open(path, "w", encoding="utf-8", newline="\n") as f:
         await f.write(payload)
+
+def get_rss() -> int:
+    """returns resident set size of the current process in bytes"""
+    return psutil.Process().memory_info().rss
+
+def get_hash(content:str | bytes) -> str:
+    """returns sha256 hex digest of the content, strings are encoded as utf-8"""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+from src.ats.components.inference import Encoder, TfidfModel
+from src.ats.components.scorers import TIERS
+from src.ats.components.skills import SkillTaxonomy
+import hashlib, re
+import numpy as np
+import pytest
+
+
+class FakeTokenizer:
+    "whitespace tokenizer with the call signature of a fast huggingface tokenizer"
+    def __call__(self, texts, add_special_tokens=True, return_offsets_mapping=False, verbose=True):
+        ids, offsets = [], []
+        for text in texts:
+            words = list(re.finditer(r"\S+", text))
+            ids.append([int(hashlib.md5(word.group().encode()).hexdigest(), 16) % 1000 for word in words])
+            offsets.append([word.span() for word in words])
+        encoded = {"input_ids": ids}
+        if return_offsets_mapping:
+            encoded["offset_mapping"] = offsets
+        return encoded
+
+
+class FakeModel:
+    """stands in for a SentenceTransformer, every text is a hashed bag of its words,
+    records the texts of every forward pass"""
+    def __init__(self, dimension:int = 16, max_seq_length:int = 128) -> None:
+        self.dimension = dimension
+        self.max_seq_length = max_seq_length
+        self.tokenizer = FakeTokenizer()
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        self.calls.append(list(texts))
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                embeddings[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dimension] += 1.0
+        return embeddings
+
+
+class FakeRegistry:
+    "the parts of a ModelRegistry read by the scorers and the model server, one FakeModel per tier"
+    def __init__(self) -> None:
+        self.encoders = {key: Encoder(key, FakeModel()) for key in TIERS}
+        self.config = SimpleNamespace(MODELS={key: key for key in TIERS})
+        self.skills = SkillTaxonomy.default()
+        self.tfidf = TfidfModel(n_features=2**12)
+        self.index = None
+
+    def encoder(self, key:str) -> Encoder:
+        return self.encoders[key]
+
+
+@pytest.fixture
+def model() -> FakeModel:
+    return FakeModel()
+
+
+@pytest.fixture
+def registry() -> FakeRegistry:
+    return FakeRegistry()
+
+
+@pytest.fixture
+def job() -> dict:
+    return {
+        'job_title': "Backend Engineer",
+        'company_name': "Acme",
+        'experience_level': "Senior",
+        'job_description': "Build Python services on AWS",
+        'requirements': "Python, FastAPI, Docker, Kubernetes",
+        'responsibilities': "Design and run backend APIs",
+        'salary_range': None
+    }
+
+
+@pytest.fixture
+def resumes() -> list:
+    "structured resumes from a close to a distant match of the job fixture"
+    def resume(years, title, *technical):
+        return {
+            'personal_info': {'name': title},
+            'professional_summary': {'total_experience_years': years, 'summary': f"{title} working with {', '.join(technical)}"},
+            'skills': {'technical': list(technical)},
+            'work_experience': [{'title': title, 'company': "Acme", 'technologies_used': list(technical)}]
+        }
+
+    return [
+        resume(6, "Backend Engineer", "Python", "FastAPI", "Docker", "Kubernetes", "AWS"),
+        resume(4, "Python Developer", "Python", "Django", "Docker"),
+        resume(8, "Java Engineer", "Java", "Spring", "Kubernetes"),
+        resume(2, "Frontend Developer", "React", "TypeScript"),
+        resume(10, "Data Analyst", "Excel", "SQL"),
+        resume(3, "Pastry Chef", "Baking")
+    ]
@@ -0,0 +1,114 @@
+from src.ats.components.scorers.batch import ResumeBatch
+from src.ats.components.scorers.roberta import HYBRID_WEIGHTS
+from src.ats.components.scorers.view import ResumeTextView
+from src.ats.components.skills import SkillTaxonomy
+import numpy as np
+import pytest
+
+
+# per resume scoring of the RoBERTa tier before ResumeBatch, the columns must match it
+def experience_score(resume_data, job_level):
+    experience_score = 0.0
+    if resume_data.get('professional_summary', {}).get('total_experience_years'):
+        resume_exp = resume_data['professional_summary']['total_experience_years']
+        job_level = job_level.lower()
+        if job_level == 'entry' and resume_exp <= 2:
+            experience_score = 100.0
+        elif job_level == 'junior' and 1 <= resume_exp <= 3:
+            experience_score = 100.0
+        elif job_level == 'mid' and 3 <= resume_exp <= 6:
+            experience_score = 100.0
+        elif job_level == 'senior' and resume_exp >= 5:
+            experience_score = 100.0
+        else:
+            experience_score = max(0, 100 - abs(resume_exp - 5) * 10)
+    return experience_score
+
+
+def keyword_score(skills, resume_text, job_text):
+    job_keywords = skills.extract(job_text)
+    if not job_keywords:
+        return 0.0
+    return len(skills.extract(resume_text) & job_keywords) / len(job_keywords) * 100
+
+
+def hybrid_score(columns, weights):
+    return sum(columns[name] * weight for name, weight in weights.items())
+
+
+def resume(years, *technical):
+    return {
+        'professional_summary': {'total_experience_years': years, 'summary': "Software engineer"},
+        'skills': {'technical': list(technical)},
+        'work_experience': [{'title': "Engineer", 'company': "Acme", 'technologies_used': list(technical[:1])}]
+    }
+
+
+RESUMES = [
+    resume(0.5, "Python"),
+    resume(1, "Python", "Docker"),
+    resume(2, "Java", "Kubernetes"),
+    resume(3, "React", "TypeScript"),
+    resume(4.5, "Python", "FastAPI", "AWS"),
+    resume(5, "Go"),
+    resume(6, "Python", "Docker", "Kubernetes", "AWS"),
+    resume(12, "Excel"),
+    resume(None, "Python"),
+    resume(0, "Docker"),
+    {'skills': {'technical': ["Python"]}}
+]
+
+JOB_TEXT = "Backend engineer with Python, FastAPI, Docker, Kubernetes and AWS"
+
+
+@pytest.fixture(scope="module")
+def skills() -> SkillTaxonomy:
+    return SkillTaxonomy.default()
+
+
+@pytest.fixture(scope="module")
+def batch(skills) -> ResumeBatch:
+    return ResumeBatch.of([ResumeTextView.of(data) for data in RESUMES], skills)
+
+
+@pytest.mark.parametrize("job_level", ["Entry", "junior", "mid", "Senior", "lead"])
+def test_experience_scores_match_scalar_scores(batch, job_level):
+    expected = [experience_score(data, job_level) for data in RESUMES]
+    assert np.allclose(batch.experience_scores(job_level), expected)
+
+
+@pytest.mark.parametrize("job_text", [JOB_TEXT, "Frontend engineer, React and TypeScript", "Office manager"])
+def test_keyword_scores_match_scalar_scores(skills, batch, job_text):
+    expected = [keyword_score(skills, ResumeTextView.of(data).comprehensive, job_text) for data in RESUMES]
+    assert np.allclose(batch.keyword_scores(skills.bitset(skills.extract(job_text))), expected)
+
+
+@pytest.mark.parametrize("weights", [
+    HYBRID_WEIGHTS,
+    {'semantic': 0.25, 'keyword': 0.25, 'tfidf': 0.25, 'experience': 0.25},
+    {'semantic': 1.0, 'keyword': 0.0, 'tfidf': 0.0, 'experience': 0.0}
+])
+@pytest.mark.parametrize("job_level", ["entry", "mid", "senior"])
+def test_weighted_matches_scalar_hybrid_score(skills, weights, job_level):
+    batch = ResumeBatch.of([ResumeTextView.of(data) for data in RESUMES], skills)
+    rng = np.random.default_rng(0)
+    batch.columns['semantic'] = rng.uniform(0, 100, len(RESUMES))
+    batch.columns['tfidf'] = rng.uniform(0, 100, len(RESUMES))
+    batch.columns['keyword'] = batch.keyword_scores(skills.bitset(skills.extract(JOB_TEXT)))
+    batch.columns['experience'] = batch.experience_scores(job_level)
+    expected = [
+        hybrid_score({
+            'semantic': batch.columns['semantic'][row],
+            'keyword': keyword_score(skills, ResumeTextView.of(data).comprehensive, JOB_TEXT),
+            'tfidf': batch.columns['tfidf'][row],
+            'experience': experience_score(data, job_level)
+        }, weights)
+        for row, data in enumerate(RESUMES)
+    ]
+    assert np.allclose(batch.weighted(weights), expected)
+
+
+def test_unreadable_rows_keep_their_error(skills):
+    batch = ResumeBatch.of([ResumeTextView.of(resume("five", "Python"))], skills)
+    assert isinstance(batch.errors[0], TypeError)
+    assert np.isnan(batch.experience[0])
@@ -0,0 +1,67 @@
+from src.ats.components.inference.batcher import MicroBatcher
+import asyncio
+import numpy as np
+import pytest
+
+
+def batcher(model, window_ms=20, max_batch_size=128):
+    async def forward(texts):
+        return model.encode(texts)
+    return MicroBatcher("FAKE", forward, window_ms, max_batch_size)
+
+
+def test_concurrent_requests_are_coalesced_into_one_forward_pass(model):
+    batch = batcher(model)
+
+    async def main():
+        return await asyncio.gather(batch.encode(["python", "java"]), batch.encode(["java", "docker"]), batch.encode(["python"]))
+
+    results = asyncio.run(main())
+    # identical texts of concurrent requests are encoded once
+    assert model.calls == [["python", "java", "docker"]]
+    for texts, embeddings in zip([["python", "java"], ["java", "docker"], ["python"]], results):
+        assert np.array_equal(embeddings, model.encode(texts))
+    report = batch.report()
+    assert (report["flushes"], report["requests"], report["texts"], report["unique_texts"]) == ({"window": 1, "size": 0}, 3, 5, 3)
+
+
+def test_window_timer_flushes_a_lone_request(model):
+    batch = batcher(model, window_ms=50)
+
+    async def main():
+        start = asyncio.get_running_loop().time()
+        embeddings = await batch.encode(["python"])
+        return embeddings, asyncio.get_running_loop().time() - start
+
+    embeddings, elapsed = asyncio.run(main())
+    assert embeddings.shape == (1, model.dimension)
+    assert elapsed >= 0.045
+    assert batch.report()["flushes"] == {"window": 1, "size": 0}
+
+
+def test_max_batch_size_flushes_without_waiting_for_the_window(model):
+    batch = batcher(model, window_ms=10_000, max_batch_size=3)
+
+    async def main():
+        return await asyncio.wait_for(asyncio.gather(batch.encode(["a b"]), batch.encode(["c", "d"])), 1)
+
+    asyncio.run(main())
+    assert batch.report()["flushes"] == {"window": 0, "size": 1}
+
+
+def test_failed_forward_pass_fails_every_request_of_the_batch():
+    async def forward(texts):
+        raise RuntimeError("model failed")
+
+    batch = MicroBatcher("FAKE", forward, window_ms=10)
+
+    async def main():
+        return await asyncio.gather(batch.encode(["a"]), batch.encode(["b"]), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
+
+
+@pytest.mark.parametrize("window_ms, max_batch_size", [(-1, 8), (10, 0)])
+def test_invalid_settings_are_rejected(window_ms, max_batch_size):
+    with pytest.raises(ValueError):
+        MicroBatcher("FAKE", None, window_ms, max_batch_size)
@@ -0,0 +1,33 @@
+from src.ats.components.scorers import ResumeScorer, TIERS
+import asyncio
+import pytest
+
+
+def test_every_tier_runs_one_forward_pass_for_the_whole_batch(registry, job, resumes):
+    scorer = ResumeScorer(registry, {"MPNET": -1, "ROBERTA": -1})
+    results = asyncio.run(scorer.score_batch(resumes, job))
+    assert all(result["tiers_run"] == list(TIERS) for result in results)
+    for key in TIERS:
+        # one pass over the texts of every resume and one over the job texts
+        assert len(registry.encoder(key).model.calls) == 2
+
+
+def test_only_resumes_above_the_threshold_enter_the_next_tier(registry, job, resumes):
+    minilm = asyncio.run(ResumeScorer(registry, {"MPNET": 101}).score_batch(resumes, job))
+    scores = [result["overall_score"] for result in minilm]
+    assert all(result["tiers_run"] == ["MINILM"] for result in minilm)
+    threshold = sorted(scores)[2]
+    results = asyncio.run(ResumeScorer(registry, {"MPNET": threshold, "ROBERTA": -1}).score_batch(resumes, job))
+    for score, result in zip(scores, results):
+        if score > threshold:
+            assert result["tiers_run"] == list(TIERS)
+        else:
+            assert result["tiers_run"] == ["MINILM"]
+            assert result["overall_score"] == pytest.approx(score)
+
+
+def test_failed_resume_does_not_fail_the_batch(registry, job, resumes):
+    resumes[1]['professional_summary']['total_experience_years'] = "four"
+    results = asyncio.run(ResumeScorer(registry, {"MPNET": -1, "ROBERTA": -1}).score_batch(resumes, job))
+    assert isinstance(results[1], TypeError)
+    assert all(isinstance(result, dict) for i, result in enumerate(results) if i != 1)
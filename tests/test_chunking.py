@@ -0,0 +1,64 @@
+from src.ats.components.inference.chunking import TextChunker
+from conftest import FakeModel
+import numpy as np
+import pytest
+
+
+def words(count, start=0):
+    return " ".join(f"word{n}" for n in range(start, start + count))
+
+
+@pytest.fixture
+def model() -> FakeModel:
+    # windows of 10 tokens, 2 are left for the special tokens
+    return FakeModel(max_seq_length=12)
+
+
+def test_short_text_is_one_window(model):
+    chunker = TextChunker(model, overlap_tokens=2, max_batch_tokens=40)
+    windows, lengths, owners = chunker.split([words(5)])
+    assert (windows, lengths, owners) == ([words(5)], [5], [0])
+    assert np.allclose(chunker.encode([words(5)]), model.encode([words(5)]))
+
+
+def test_long_text_is_split_into_overlapping_windows(model):
+    chunker = TextChunker(model, overlap_tokens=2, max_batch_tokens=40)
+    windows, lengths, owners = chunker.split([words(25)])
+    assert windows == [words(10), words(10, 8), words(9, 16)]
+    assert lengths == [10, 10, 9]
+    assert owners == [0, 0, 0]
+
+
+def test_windows_are_pooled_by_their_token_counts(model):
+    chunker = TextChunker(model, overlap_tokens=2, max_batch_tokens=40)
+    texts = [words(25), words(3, 100)]
+    windows, lengths, _ = chunker.split(texts)
+    expected = np.average(model.encode(windows[:3]), axis=0, weights=lengths[:3])
+    pooled = chunker.encode(texts)
+    assert np.allclose(pooled[0], expected)
+    assert np.allclose(pooled[1], model.encode([texts[1]])[0])
+
+
+def test_buckets_stay_within_the_token_budget_and_batch_size(model):
+    chunker = TextChunker(model, overlap_tokens=2, max_batch_tokens=20, max_batch_size=3)
+    lengths = [10, 3, 9, 5, 2, 2, 2, 2]
+    buckets = chunker.buckets(lengths)
+    assert sorted(i for bucket in buckets for i in bucket) == list(range(len(lengths)))
+    for bucket in buckets:
+        assert max(lengths[i] for i in bucket) * len(bucket) <= 20
+        assert len(bucket) <= 3
+
+
+def test_every_bucket_is_one_forward_pass(model):
+    chunker = TextChunker(model, overlap_tokens=2, max_batch_tokens=20)
+    chunker.encode([words(25), words(4), words(2)])
+    windows, lengths, _ = chunker.split([words(25), words(4), words(2)])
+    assert len(model.calls) == len(chunker.buckets(lengths))
+    report = chunker.report()
+    assert (report["texts"], report["chunked_texts"], report["windows"]) == (3, 1, 5)
+
+
+@pytest.mark.parametrize("overlap_tokens, max_batch_tokens", [(10, 40), (2, 5)])
+def test_invalid_settings_are_rejected(model, overlap_tokens, max_batch_tokens):
+    with pytest.raises(ValueError):
+        TextChunker(model, overlap_tokens=overlap_tokens, max_batch_tokens=max_batch_tokens)
@@ -0,0 +1,41 @@
+from src.ats.components.inference.cache import EmbeddingCache
+import numpy as np
+import pytest
+
+
+def vector(value):
+    return np.full(4, value, dtype=np.float32)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put("model", "a", vector(1))
+    cache.put("model", "b", vector(2))
+    cache.get("model", "a")
+    cache.put("model", "c", vector(3))
+    assert cache.get("model", "b") is None
+    assert np.array_equal(cache.get("model", "a"), vector(1))
+    assert np.array_equal(cache.get("model", "c"), vector(3))
+    assert cache.report()["evictions"] == 1
+
+
+def test_entries_are_keyed_by_model():
+    cache = EmbeddingCache()
+    cache.put("minilm", "text", vector(1))
+    assert cache.get("mpnet", "text") is None
+
+
+def test_evicted_entries_spill_to_disk_and_are_promoted_back(tmp_path):
+    cache = EmbeddingCache(max_entries=1, spill_dir=tmp_path)
+    cache.put("model", "a", vector(1))
+    cache.put("model", "b", vector(2))
+    assert cache.report()["spills"] == 1
+    assert np.array_equal(cache.get("model", "a"), vector(1))
+    assert cache.report()["disk_hits"] == 1
+    # a new cache over the same directory finds spilled entries
+    assert np.array_equal(EmbeddingCache(max_entries=1, spill_dir=tmp_path).get("model", "a"), vector(1))
+
+
+def test_max_entries_must_be_positive():
+    with pytest.raises(ValueError):
+        EmbeddingCache(max_entries=0)
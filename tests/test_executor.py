@@ -0,0 +1,52 @@
+from src.ats.components.inference.executor import InferenceExecutor, LatencyStats
+import asyncio, threading
+import pytest
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor(workers=1, max_queue=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_calls_beyond_workers_and_queue_wait_for_a_slot(executor):
+    release = threading.Event()
+
+    async def main():
+        calls = [asyncio.create_task(executor.run(release.wait, label="blocked")) for _ in range(4)]
+        await asyncio.sleep(0.1)
+        # one call runs, one waits in the queue and the other two wait for a slot without being submitted
+        report = executor.report()
+        assert (report["running"], report["queue_depth"]) == (1, 1)
+        release.set()
+        return await asyncio.gather(*calls)
+
+    assert asyncio.run(main()) == [True] * 4
+    assert executor.report()["run"]["blocked"]["count"] == 4
+
+
+def test_failed_call_raises_and_is_counted(executor):
+    def fail():
+        raise ValueError("forward pass failed")
+
+    with pytest.raises(ValueError, match="forward pass failed"):
+        asyncio.run(executor.run(fail))
+    assert executor.report()["failed"] == 1
+    assert asyncio.run(executor.run(sum, [1, 2, 3])) == 6
+
+
+@pytest.mark.parametrize("workers, max_queue", [(0, 1), (1, -1)])
+def test_invalid_bounds_are_rejected(workers, max_queue):
+    with pytest.raises(ValueError):
+        InferenceExecutor(workers=workers, max_queue=max_queue)
+
+
+def test_latency_percentiles_cover_recent_observations():
+    stats = LatencyStats(window=4)
+    for seconds in (10, 1, 2, 3, 4):
+        stats.observe(seconds)
+    report = stats.report()
+    assert report["count"] == 5
+    assert report["max_ms"] == 10000
+    assert report["p50_ms"] == pytest.approx(2500)
@@ -0,0 +1,75 @@
+from src.ats.components.inference import VectorIndex
+import numpy as np
+import pytest
+
+
+def clustered(clusters:int = 8, size:int = 50, dimension:int = 16, seed:int = 0):
+    "unit vectors drawn around well separated centres"
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dimension))
+    vectors = np.repeat(centres, size, axis=0) + rng.normal(scale=0.1, size=(clusters * size, dimension))
+    return vectors.astype(np.float32)
+
+
+def index_of(path, vectors, **kwargs) -> VectorIndex:
+    index = VectorIndex(path, "fake/model", vectors.shape[1], **kwargs)
+    ids = [f"doc{i}" for i in range(len(vectors))]
+    index.add(ids, [f"resume{i}.pdf" for i in range(len(vectors))], vectors, [{'row': i} for i in range(len(vectors))])
+    return index
+
+
+def brute_force(vectors, query, k):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [f"doc{i}" for i in np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:k]]
+
+
+def test_exact_search_returns_the_true_top_k(tmp_path):
+    vectors = clustered()
+    index = index_of(tmp_path, vectors)
+    queries = vectors[[3, 120, 333]] + 0.05
+    for query, hits in zip(queries, index.search_batch(queries, k=10)):
+        assert [doc_id for doc_id, _, _ in hits] == brute_force(vectors, query, 10)
+        assert all(a[2] >= b[2] for a, b in zip(hits, hits[1:]))
+    assert index.payload(index.search(vectors[7], k=1)[0][0]) == {'row': 7}
+
+
+def test_ivf_search_probing_every_list_matches_exact_search(tmp_path):
+    vectors = clustered()
+    exact = index_of(tmp_path.joinpath("exact"), vectors)
+    ivf = index_of(tmp_path.joinpath("ivf"), vectors, mode="ivf", nlist=8, nprobe=8, min_train=16)
+    queries = vectors[::37]
+    assert [[hit[0] for hit in hits] for hits in ivf.search_batch(queries, k=5)] == [[hit[0] for hit in hits] for hits in exact.search_batch(queries, k=5)]
+    assert ivf.report()["lists"] == 8
+
+
+def test_ivf_search_probing_the_closest_lists_recalls_the_top_k(tmp_path):
+    vectors = clustered()
+    ivf = index_of(tmp_path, vectors, mode="ivf", nlist=8, nprobe=2, min_train=16)
+    recall = []
+    for row in range(0, len(vectors), 25):
+        expected = set(brute_force(vectors, vectors[row], 10))
+        recall.append(len(expected & {hit[0] for hit in ivf.search(vectors[row], k=10)}) / 10)
+    assert np.mean(recall) >= 0.9
+
+
+def test_ivf_falls_back_to_exact_search_below_min_train(tmp_path):
+    vectors = clustered()
+    ivf = index_of(tmp_path, vectors, mode="ivf", nlist=8, nprobe=1, min_train=len(vectors) + 1)
+    assert [hit[0] for hit in ivf.search(vectors[0], k=10)] == brute_force(vectors, vectors[0], 10)
+    assert ivf.report()["trainings"] == 0
+
+
+def test_new_document_under_an_indexed_name_replaces_it_and_survives_a_reopen(tmp_path):
+    vectors = clustered(clusters=2, size=3)
+    index = index_of(tmp_path, vectors)
+    assert index.add(["doc0"], ["resume0.pdf"], vectors[:1], [{'row': 0}]) == 0
+    assert index.add(["new"], ["resume0.pdf"], -vectors[:1], [{'row': "new"}]) == 1
+    reopened = VectorIndex(tmp_path, "fake/model", vectors.shape[1])
+    assert len(reopened) == len(vectors)
+    assert "new" in reopened and ("doc0", "resume0.pdf") not in reopened.documents()
+    assert reopened.search(-vectors[0], k=1)[0][:2] == ("new", "resume0.pdf")
+
+
+def test_unknown_mode_raises(tmp_path):
+    with pytest.raises(ValueError):
+        VectorIndex(tmp_path, "fake/model", 16, mode="hnsw")
@@ -0,0 +1,46 @@
+from src.ats.components.inference.pool import InferencePool
+import asyncio, time
+import numpy as np
+import pytest
+
+
+def encode(texts):
+    # slow fake forward pass, every row is the number in its text
+    time.sleep(0.3)
+    return np.array([[float(text)] * 4 for text in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def pool():
+    pool = InferencePool({"FAKE": encode}, workers=1, buffer_bytes=2**16)
+    yield pool
+    pool.shutdown()
+
+
+def test_run_returns_embeddings_of_its_texts(pool):
+    embeddings = asyncio.run(pool.run("FAKE", ["1", "2"]))
+    assert np.array_equal(embeddings, [[1.0] * 4, [2.0] * 4])
+
+
+def test_cancelled_call_keeps_its_worker_until_the_worker_answers(pool):
+    async def main():
+        first = asyncio.create_task(pool.run("FAKE", ["1"]))
+        await asyncio.sleep(0.1)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # the only worker is still serving the cancelled call
+        assert pool.report()["busy"] == 1
+        return await pool.run("FAKE", ["2"])
+
+    assert np.array_equal(asyncio.run(main()), [[2.0] * 4])
+    assert pool.report()["processes"][0]["requests"] == 2
+
+
+def test_failed_forward_pass_raises_and_releases_the_worker(pool):
+    async def main():
+        with pytest.raises(RuntimeError, match="ValueError"):
+            await pool.run("FAKE", ["not a number"])
+        return await pool.run("FAKE", ["3"])
+
+    assert np.array_equal(asyncio.run(main()), [[3.0] * 4])
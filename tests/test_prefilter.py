@@ -0,0 +1,62 @@
+from src.ats.components.scorers.prefilter import MustHaveFilter, must_have_groups
+from src.ats.components.scorers.view import ResumeTextView
+from src.ats.components.skills import SkillTaxonomy
+import pytest
+
+
+@pytest.fixture(scope="module")
+def skills() -> SkillTaxonomy:
+    return SkillTaxonomy.default()
+
+
+def resume(*technical: str) -> ResumeTextView:
+    return ResumeTextView.of({'skills': {'technical': list(technical)}})
+
+
+@pytest.mark.parametrize("must_have, declared", [
+    (["Python or Java"], ["Java"]),
+    (["Python or Java"], ["Python"]),
+    (["Experience with AWS, GCP or Azure"], ["GCP"]),
+    (["React.js"], ["React", "TypeScript"]),
+    (["Python or Java", "Docker"], ["Java", "Docker"])
+])
+def test_must_have_item_is_met_by_any_of_its_skills(skills, must_have, declared):
+    passed, missing = MustHaveFilter(skills, must_have).check([resume(*declared)])
+    assert passed[0]
+    assert not missing[0].any()
+
+
+@pytest.mark.parametrize("item, expected", [
+    ("Python or Java", [{"python", "java"}]),
+    ("Python/Java", [{"python", "java"}]),
+    ("Experience with AWS, GCP or Azure", [{"aws", "gcp", "azure"}]),
+    ("Python and Docker", [{"python"}, {"docker"}]),
+    ("Python, Docker", [{"python"}, {"docker"}]),
+    ("Python and Java or Rust", [{"python"}, {"java", "rust"}]),
+    ("CI/CD", [{"ci_cd"}])
+])
+def test_must_have_item_groups_only_explicit_alternatives(skills, item, expected):
+    assert must_have_groups(skills, item) == expected
+
+
+def test_skills_joined_by_and_are_each_required(skills):
+    prefilter = MustHaveFilter(skills, ["Python and Docker"])
+    passed, missing = prefilter.check([resume("Python"), resume("Python", "Docker")])
+    assert passed.tolist() == [False, True]
+    assert prefilter.rejection(missing[0])['missing_skills'] == ["Docker"]
+
+
+def test_resume_missing_a_must_have_item_is_rejected(skills):
+    prefilter = MustHaveFilter(skills, ["Python or Java", "Docker", "Kubernetes"])
+    passed, missing = prefilter.check([resume("Python", "Docker"), resume("Go", "Docker", "Kubernetes")])
+    assert not passed.any()
+    assert prefilter.rejection(missing[0])['missing_skills'] == ["Kubernetes"]
+    result = prefilter.rejection(missing[1])
+    assert result['missing_skills'] == ["Java or Python"]
+    assert result['score_breakdown']['must_have_coverage'] == pytest.approx(200 / 3)
+
+
+def test_must_have_outside_the_taxonomy_is_not_checked(skills):
+    prefilter = MustHaveFilter(skills, ["Underwater basket weaving"])
+    assert not prefilter
+    assert prefilter.unknown == ["Underwater basket weaving"]
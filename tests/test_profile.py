@@ -0,0 +1,55 @@
+from src.ats.components.scorers import ResumeScorer, ScoringProfile, TierCosts, TIERS
+import asyncio
+import pytest
+
+
+PROFILES = {
+    "fast": {"TIERS": ["MINILM"], "BUDGET_MS": 0},
+    "balanced": {"TIERS": ["MINILM", "MPNET"], "BUDGET_MS": 500}
+}
+
+
+def test_profile_is_resolved_from_config():
+    profile = ScoringProfile.resolve(PROFILES, "balanced")
+    assert (profile.tiers, profile.budget_ms) == (["MINILM", "MPNET"], 500)
+    assert ScoringProfile.resolve(PROFILES, "balanced", budget_ms=0).budget_ms == 0
+    with pytest.raises(ValueError):
+        ScoringProfile.resolve(PROFILES, "thorough")
+
+
+@pytest.mark.parametrize("tiers, budget_ms", [(["MPNET"], 0), (["MINILM", "ROBERTA"], 0), ([], 0), (list(TIERS), -1)])
+def test_invalid_profile_raises(tiers, budget_ms):
+    with pytest.raises(ValueError):
+        ScoringProfile(name="invalid", tiers=tiers, budget_ms=budget_ms)
+
+
+def test_first_measurement_replaces_the_seed_and_later_ones_are_averaged():
+    costs = TierCosts(alpha=0.5, defaults={"MINILM": 100.0})
+    costs.observe("MINILM", 10, 0.2)
+    assert costs.report()["MINILM"] == {"ms_per_resume": pytest.approx(20.0), "batches": 1}
+    costs.observe("MINILM", 10, 0.4)
+    assert costs.report()["MINILM"]["ms_per_resume"] == pytest.approx(30.0)
+    assert costs.estimate("MINILM", 4) == pytest.approx(120.0)
+    assert costs.capacity("MINILM", 95) == 3
+
+
+def test_tiers_outside_the_profile_are_skipped(registry, job, resumes):
+    scorer = ResumeScorer(registry, {"MPNET": -1, "ROBERTA": -1})
+    results = asyncio.run(scorer.score_batch(resumes, job, ScoringProfile.resolve(PROFILES, "fast")))
+    assert all(result["tiers_run"] == ["MINILM"] and result["tiers_skipped"] == ["MPNET"] for result in results)
+    assert not registry.encoder("MPNET").model.calls
+
+
+def test_tier_only_runs_for_the_best_survivors_that_fit_the_budget(registry, job, resumes):
+    minilm = asyncio.run(ResumeScorer(registry, {"MPNET": 101}).score_batch(resumes, job))
+    best = sorted(range(len(resumes)), key=lambda i: minilm[i]["overall_score"], reverse=True)[:2]
+    # MPNET fits twice into the budget, ROBERTA never fits, a skipped resume leaves the cascade
+    costs = TierCosts(defaults={"MINILM": 0.0, "MPNET": 1000.0, "ROBERTA": 1e9})
+    scorer = ResumeScorer(registry, {"MPNET": -1, "ROBERTA": -1}, costs)
+    results = asyncio.run(scorer.score_batch(resumes, job, ScoringProfile(budget_ms=2900)))
+    for i, result in enumerate(results):
+        if i in best:
+            assert (result["tiers_run"], result["tiers_skipped"]) == (["MINILM", "MPNET"], ["ROBERTA"])
+        else:
+            assert (result["tiers_run"], result["tiers_skipped"]) == (["MINILM"], ["MPNET"])
+    assert not registry.encoder("ROBERTA").model.calls
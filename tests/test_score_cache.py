@@ -0,0 +1,43 @@
+from src.ats.components.scorers import ResumeScorer, ScoreCache
+import asyncio
+
+
+RESUME = {'skills': {'technical': ["Python"]}, 'personal_info': {'name': "Jane"}}
+JOB = {'job_title': "Engineer", 'requirements': "Python"}
+
+
+def test_key_does_not_depend_on_key_order():
+    reordered = {'personal_info': {'name': "Jane"}, 'skills': {'technical': ["Python"]}}
+    assert ScoreCache.key(RESUME, JOB, "v1") == ScoreCache.key(reordered, JOB, "v1")
+    # a string is taken as the precomputed hash
+    assert ScoreCache.key(ScoreCache.canonical_hash(RESUME), JOB, "v1") == ScoreCache.key(RESUME, JOB, "v1")
+
+
+def test_results_are_reused_from_disk_for_the_same_version_only(tmp_path):
+    async def main():
+        await ScoreCache(cache_dir=tmp_path).put(ScoreCache.key(RESUME, JOB, "v1"), {'overall_score': 42.0})
+        cache = ScoreCache(cache_dir=tmp_path)
+        return await cache.get(ScoreCache.key(RESUME, JOB, "v1")), await cache.get(ScoreCache.key(RESUME, JOB, "v2")), cache.report()
+
+    result, other_version, report = asyncio.run(main())
+    assert result == {'overall_score': 42.0}
+    assert other_version is None
+    assert (report["disk_hits"], report["misses"]) == (1, 1)
+
+
+def test_least_recently_used_result_is_evicted_from_memory():
+    async def main():
+        cache = ScoreCache(max_entries=1)
+        await cache.put(("a", "job", "v1"), {'overall_score': 1.0})
+        await cache.put(("b", "job", "v1"), {'overall_score': 2.0})
+        return await cache.get(("a", "job", "v1")), await cache.get(("b", "job", "v1"))
+
+    assert asyncio.run(main()) == (None, {'overall_score': 2.0})
+
+
+def test_scorer_version_changes_with_thresholds_and_tfidf_generation(registry):
+    version = ResumeScorer.version(registry, {"MPNET": 30, "ROBERTA": 50})
+    assert ResumeScorer.version(registry, {"MPNET": 30, "ROBERTA": 50}) == version
+    assert ResumeScorer.version(registry, {"MPNET": 35, "ROBERTA": 50}) != version
+    registry.tfidf.update(["python developer", "pastry chef"])
+    assert ResumeScorer.version(registry, {"MPNET": 30, "ROBERTA": 50}) != version
@@ -0,0 +1,64 @@
+from src.ats.components.inference import ModelServer, RemoteEncoder, SidecarClient
+from src.ats.components.inference.sidecar import pack_encode, read_frame, unpack_encode, write_frame
+import asyncio
+import numpy as np
+import pytest
+
+
+class Buffer:
+    "collects what write_frame writes"
+    def __init__(self) -> None:
+        self.data = b""
+
+    def write(self, data:bytes) -> None:
+        self.data += data
+
+    def writelines(self, parts) -> None:
+        for part in parts:
+            self.write(part)
+
+
+@pytest.mark.parametrize("texts, cache, sections", [
+    (["python developer", "", "résumé – 日本語"], False, None),
+    (["python developer", "senior"], True, ["skills", "summary"]),
+    ([], True, [])
+])
+def test_encode_request_round_trip(texts, cache, sections):
+    assert unpack_encode(pack_encode("MINILM", texts, cache, sections)) == ("MINILM", texts, cache, sections)
+
+
+def test_frames_are_read_back_whole():
+    async def main():
+        buffer = Buffer()
+        write_frame(buffer, b"\x00", b"first")
+        write_frame(buffer, b"second")
+        reader = asyncio.StreamReader()
+        reader.feed_data(buffer.data)
+        reader.feed_eof()
+        return await read_frame(reader), await read_frame(reader)
+
+    assert asyncio.run(main()) == (b"\x00first", b"second")
+
+
+def test_client_gets_the_embeddings_of_the_server_encoder(registry, tmp_path):
+    texts = ["python developer", "pastry chef", "kubernetes on aws"]
+
+    async def main():
+        server = ModelServer(registry, tmp_path.joinpath("models.sock"))
+        await server.start()
+        client = SidecarClient(server.socket_path)
+        try:
+            info = await client.info()
+            encoder = RemoteEncoder("MPNET", client, info["MPNET"]["model_id"], info["MPNET"]["dimension"])
+            remote = await asyncio.gather(encoder.encode(texts), encoder.encode(texts[:1]))
+            with pytest.raises(RuntimeError):
+                await client.encode("UNKNOWN", texts)
+            return info, remote, await registry.encoder("MPNET").encode(texts), server.report()
+        finally:
+            client.close()
+            server.close()
+
+    info, remote, local, report = asyncio.run(main())
+    assert info["MPNET"] == {"model_id": "MPNET", "dimension": 16}
+    assert np.allclose(remote[0], local) and np.allclose(remote[1], local[:1])
+    assert (report["requests"], report["errors"]) == (4, 1)
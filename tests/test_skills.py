@@ -0,0 +1,21 @@
+from src.ats.components.skills import SkillTaxonomy
+import pytest
+
+
+@pytest.fixture(scope="module")
+def skills() -> SkillTaxonomy:
+    return SkillTaxonomy.default()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Node.js", {"nodejs"}),
+    ("React.js", {"react"}),
+    ("Vue.js", {"vue"}),
+    ("next.js", {"nextjs"}),
+    ("next js", {"nextjs"}),
+    ("JS and TypeScript", {"javascript", "typescript"}),
+    ("Java 8 and JavaScript", {"java", "javascript"}),
+    ("5 years of Python, k8s and CI/CD", {"python", "kubernetes", "ci_cd"})
+])
+def test_extract_keeps_leftmost_longest_matches(skills, text, expected):
+    assert skills.extract(text) == expected
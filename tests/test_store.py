@@ -0,0 +1,54 @@
+from src.ats.components.inference.store import EmbeddingStore
+import numpy as np
+import pytest
+
+
+TEXTS = ["python developer", "pastry chef", "data engineer"]
+
+
+def embeddings(count, dimension=8):
+    return np.arange(count * dimension, dtype=np.float32).reshape(count, dimension)
+
+
+def test_stored_embeddings_are_read_back(tmp_path):
+    store = EmbeddingStore(tmp_path, "org/model", 8)
+    store.put(TEXTS, ["skills"] * 3, embeddings(3))
+    assert np.array_equal(store.get(TEXTS[1], "skills"), embeddings(3)[1])
+    assert store.get(TEXTS[1], "experience") is None
+
+
+def test_put_appends_only_new_texts(tmp_path):
+    store = EmbeddingStore(tmp_path, "org/model", 8)
+    store.put(TEXTS[:2], ["skills"] * 2, embeddings(2))
+    store.put(TEXTS, ["skills"] * 3, embeddings(3) + 100)
+    assert store.report()["entries"] == 3
+    # the first stored vector of a text is kept
+    assert np.array_equal(store.get(TEXTS[0], "skills"), embeddings(1)[0])
+    assert np.array_equal(store.get(TEXTS[2], "skills"), embeddings(3)[2] + 100)
+
+
+def test_reopened_store_keeps_its_entries(tmp_path):
+    EmbeddingStore(tmp_path, "org/model", 8).put(TEXTS, ["skills"] * 3, embeddings(3))
+    store = EmbeddingStore(tmp_path, "org/model", 8)
+    assert store.report()["entries"] == 3
+    assert np.array_equal(store.get(TEXTS[2], "skills"), embeddings(3)[2])
+
+
+def test_partial_row_of_an_interrupted_write_is_dropped(tmp_path):
+    store = EmbeddingStore(tmp_path, "org/model", 8)
+    store.put(TEXTS, ["skills"] * 3, embeddings(3))
+    with open(store.dir.joinpath("vectors.bin"), "ab") as file:
+        file.write(b"\0" * 5)
+    reopened = EmbeddingStore(tmp_path, "org/model", 8)
+    assert reopened.report()["bytes"] == 3 * 8 * 4
+    assert np.array_equal(reopened.get(TEXTS[0], "skills"), embeddings(1)[0])
+
+
+def test_store_of_other_settings_starts_empty(tmp_path):
+    EmbeddingStore(tmp_path, "org/model", 8).put(TEXTS, ["skills"] * 3, embeddings(3))
+    assert EmbeddingStore(tmp_path, "org/model", 8, dtype="float16").report()["entries"] == 0
+
+
+def test_unsupported_dtype_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        EmbeddingStore(tmp_path, "org/model", 8, dtype="int8")
@@ -0,0 +1,35 @@
+from src.ats.components.inference.tfidf import TfidfModel
+import numpy as np
+import pytest
+
+
+TEXTS = ["Python developer building REST APIs with FastAPI", "Pastry chef baking bread and cakes", "Data engineer with Python and Spark"]
+JOB = "Backend Python developer for REST APIs"
+
+
+@pytest.fixture
+def tfidf(tmp_path) -> TfidfModel:
+    return TfidfModel(tmp_path, n_features=2**12)
+
+
+def test_similarity_does_not_count_the_scored_texts(tfidf):
+    before = tfidf.similarity(TEXTS, JOB)
+    assert tfidf.documents == 0
+    assert np.allclose(tfidf.similarity(TEXTS, JOB), before)
+    assert before.argmax() == 0
+
+
+def test_update_counts_every_distinct_text_once(tfidf):
+    assert tfidf.update([*TEXTS, JOB]) == 4
+    assert tfidf.update([TEXTS[0], JOB]) == 0
+    assert tfidf.documents == 4
+
+
+def test_counted_documents_survive_reopening(tmp_path, tfidf):
+    tfidf.update(TEXTS)
+    expected = tfidf.similarity(TEXTS, JOB)
+    tfidf.flush()
+    reopened = TfidfModel(tmp_path, n_features=2**12)
+    assert reopened.documents == 3
+    assert reopened.generation == tfidf.generation
+    assert np.allclose(reopened.similarity(TEXTS, JOB), expected)
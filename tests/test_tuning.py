@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+from src.ats.components.inference import BatchTuner
+from src.ats.components.inference import tuning
+import pytest
+
+
+class TimedModel:
+    "model whose forward pass of a batch advances a fake clock by cost(batch size) seconds"
+    max_seq_length = 32
+
+    def __init__(self, cost) -> None:
+        self.cost = cost
+        self.now = 0.0
+        self.batch_sizes = []
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        self.batch_sizes.append(len(texts))
+        self.now += self.cost(len(texts))
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def timed(monkeypatch):
+    def timed(cost) -> TimedModel:
+        model = TimedModel(cost)
+        monkeypatch.setattr(tuning, "time", SimpleNamespace(perf_counter=model.perf_counter))
+        return model
+    return timed
+
+
+CANDIDATES = [1, 2, 4, 8, 16, 32, 64, 128]
+
+
+def test_knee_is_the_smallest_batch_size_of_the_saturated_throughput(timed, tmp_path):
+    # a forward pass costs the same up to 16 texts, throughput is flat beyond
+    model = timed(lambda size: max(size, 16))
+    result = BatchTuner(tmp_path.joinpath("batch_sizes.json"), CANDIDATES, min_seconds=50).tune(model, "fake/model")
+    assert result["batch_size"] == 16
+    # two stalled candidates end the measurement
+    assert list(result["throughput"]) == ["1", "2", "4", "8", "16", "32", "64"]
+    assert 128 not in model.batch_sizes
+
+
+def test_batch_size_within_tolerance_of_the_best_is_chosen(timed, tmp_path):
+    # 8 reaches 95% of the throughput of 16, larger batches get slower
+    throughput = {1: 10, 2: 20, 4: 40, 8: 95, 16: 100, 32: 90, 64: 80, 128: 70}
+    model = timed(lambda size: size / throughput[size])
+    assert BatchTuner(tmp_path.joinpath("strict.json"), CANDIDATES, tolerance=0.01, min_seconds=1).tune(model, "fake/model")["batch_size"] == 16
+    assert BatchTuner(tmp_path.joinpath("tolerant.json"), CANDIDATES, tolerance=0.1, min_seconds=1).tune(model, "fake/model")["batch_size"] == 8
+
+
+def test_tuned_batch_size_is_persisted_per_model(timed, tmp_path):
+    path = tmp_path.joinpath("batch_sizes.json")
+    BatchTuner(path, CANDIDATES, min_seconds=50).tune(timed(lambda size: max(size, 16)), "fake/model")
+    tuner = BatchTuner(path, CANDIDATES)
+    assert tuner.lookup("fake/model")["batch_size"] == 16
+    assert tuner.lookup("other/model") is None
+
+
+@pytest.mark.parametrize("candidates, tolerance", [([], 0.05), ([0, 8], 0.05), ([8], 1.0), ([8], -0.1)])
+def test_invalid_settings_raise(tmp_path, candidates, tolerance):
+    with pytest.raises(ValueError):
+        BatchTuner(tmp_path.joinpath("batch_sizes.json"), candidates, tolerance)
@@ -0,0 +1,36 @@
+from src.ats.components.scorers.cache import ScoreCache
+from src.ats.components.scorers.view import ResumeTextView
+import pytest
+
+
+RESUME = {
+    'personal_info': {'name': "Jane Doe"},
+    'professional_summary': {'total_experience_years': 6, 'summary': "Backend engineer"},
+    'skills': {'technical': ["Python", "Docker"], 'soft': ["Communication"]},
+    'work_experience': [{'title': "Engineer", 'company': "Acme", 'technologies_used': ["Python"]}]
+}
+
+
+@pytest.fixture
+def view() -> ResumeTextView:
+    return ResumeTextView.of(RESUME)
+
+
+def test_view_data_is_read_only_at_every_depth(view):
+    with pytest.raises(TypeError):
+        view.data['skills'] = {}
+    with pytest.raises(TypeError):
+        view.data['work_experience'][0]['title'] = "Manager"
+    with pytest.raises(AttributeError):
+        view.data['skills']['technical'].append("Java")
+
+
+def test_view_keeps_the_resume_data(view):
+    assert view.to_dict() == RESUME
+    assert view.hash == ScoreCache.canonical_hash(RESUME)
+    assert ResumeTextView.of(view) is view
+
+
+def test_view_counts_words(view):
+    assert view.words["text"] == len(view.text.split())
+    assert view.words["comprehensive"] == len(view.comprehensive.split())